@@ -0,0 +1,131 @@
+"""add normalized inventory names and unit conversion lookup
+
+Revision ID: 20261019_12
+Revises: 20260227_11
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_12"
+down_revision: Union[str, None] = "20260227_11"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_BACKFILL_BATCH_SIZE = 1000
+
+_UNIT_CONVERSIONS: tuple[tuple[str, str, str, float], ...] = (
+    ("each", "each", "count", 1.0),
+    ("fl oz", "floz", "volume", 29.5735),
+    ("floz", "floz", "volume", 29.5735),
+    ("fluid ounce", "floz", "volume", 29.5735),
+    ("fluid ounces", "floz", "volume", 29.5735),
+    ("g", "g", "mass", 1.0),
+    ("gal", "gal", "volume", 3785.41),
+    ("gallon", "gal", "volume", 3785.41),
+    ("gallons", "gal", "volume", 3785.41),
+    ("gram", "g", "mass", 1.0),
+    ("grams", "g", "mass", 1.0),
+    ("kg", "kg", "mass", 1000.0),
+    ("kgs", "kg", "mass", 1000.0),
+    ("kilogram", "kg", "mass", 1000.0),
+    ("kilograms", "kg", "mass", 1000.0),
+    ("l", "l", "volume", 1000.0),
+    ("lb", "lb", "mass", 453.592),
+    ("liter", "l", "volume", 1000.0),
+    ("liters", "l", "volume", 1000.0),
+    ("litre", "l", "volume", 1000.0),
+    ("litres", "l", "volume", 1000.0),
+    ("milliliter", "ml", "volume", 1.0),
+    ("milliliters", "ml", "volume", 1.0),
+    ("millilitre", "ml", "volume", 1.0),
+    ("millilitres", "ml", "volume", 1.0),
+    ("ml", "ml", "volume", 1.0),
+    ("ounce", "oz", "mass", 28.3495),
+    ("ounces", "oz", "mass", 28.3495),
+    ("oz", "oz", "mass", 28.3495),
+    ("pack", "pack", "count", 1.0),
+    ("packs", "pack", "count", 1.0),
+    ("pound", "lb", "mass", 453.592),
+    ("pounds", "lb", "mass", 453.592),
+    ("qt", "qt", "volume", 946.353),
+    ("quart", "qt", "volume", 946.353),
+    ("quarts", "qt", "volume", 946.353),
+    ("unit", "unit", "count", 1.0),
+)
+
+
+def _normalize_inventory_name(name: str) -> str:
+    # Frozen copy of app.models.inventory.normalize_inventory_name as of this revision, so the
+    # backfill does not change if the model's normalizer does.
+    return name.strip().lower()
+
+
+def upgrade() -> None:
+    op.add_column(
+        "inventory_items",
+        sa.Column("name_normalized", sa.String(length=120), nullable=False, server_default=""),
+    )
+    _backfill_normalized_names()
+    op.create_index(
+        "ix_inventory_items_owner_name_normalized",
+        "inventory_items",
+        ["owner_user_id", "name_normalized"],
+        unique=False,
+    )
+
+    unit_conversions = op.create_table(
+        "unit_conversions",
+        sa.Column("alias", sa.String(length=30), nullable=False),
+        sa.Column("canonical_unit", sa.String(length=20), nullable=False),
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("factor_to_base", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("alias"),
+    )
+    op.bulk_insert(
+        unit_conversions,
+        [
+            {"alias": alias, "canonical_unit": canonical_unit, "dimension": dimension, "factor_to_base": factor_to_base}
+            for alias, canonical_unit, dimension, factor_to_base in _UNIT_CONVERSIONS
+        ],
+    )
+
+
+def _backfill_normalized_names() -> None:
+    # Normalize in Python like the model does: SQL trim() only strips spaces and SQLite
+    # lower() only folds ASCII, so a SQL backfill would disagree with new rows.
+    bind = op.get_bind()
+    items = sa.table(
+        "inventory_items",
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("name_normalized", sa.String),
+    )
+    update = (
+        items.update()
+        .where(items.c.id == sa.bindparam("item_id"))
+        .values(name_normalized=sa.bindparam("normalized"))
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(items.c.id, items.c.name)
+            .where(items.c.id > last_id)
+            .order_by(items.c.id)
+            .limit(_BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(update, [{"item_id": item_id, "normalized": _normalize_inventory_name(name)} for item_id, name in rows])
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_table("unit_conversions")
+    op.drop_index("ix_inventory_items_owner_name_normalized", table_name="inventory_items")
+    op.drop_column("inventory_items", "name_normalized")
@@ -0,0 +1,67 @@
+"""add append-only inventory transaction ledger
+
+Revision ID: 20261019_13
+Revises: 20261019_12
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_13"
+down_revision: Union[str, None] = "20261019_12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_transactions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("inventory_item_id", sa.Integer(), nullable=False),
+        sa.Column("owner_user_id", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("quantity_delta", sa.Float(), nullable=False),
+        sa.Column("balance_after", sa.Float(), nullable=False),
+        sa.Column("batch_id", sa.Integer(), nullable=True),
+        sa.Column("note", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["inventory_item_id"], ["inventory_items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["owner_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["batch_id"], ["batches.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_inventory_transactions_id"), "inventory_transactions", ["id"], unique=False)
+    op.create_index(
+        op.f("ix_inventory_transactions_owner_user_id"),
+        "inventory_transactions",
+        ["owner_user_id"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_inventory_transactions_batch_id"), "inventory_transactions", ["batch_id"], unique=False)
+    op.create_index(
+        "ix_inventory_transactions_item_created_at",
+        "inventory_transactions",
+        ["inventory_item_id", "created_at"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        INSERT INTO inventory_transactions
+            (inventory_item_id, owner_user_id, kind, quantity_delta, balance_after, note, created_at)
+        SELECT id, owner_user_id, 'adjust', quantity, quantity, 'Opening balance', updated_at
+        FROM inventory_items
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_transactions_item_created_at", table_name="inventory_transactions")
+    op.drop_index(op.f("ix_inventory_transactions_batch_id"), table_name="inventory_transactions")
+    op.drop_index(op.f("ix_inventory_transactions_owner_user_id"), table_name="inventory_transactions")
+    op.drop_index(op.f("ix_inventory_transactions_id"), table_name="inventory_transactions")
+    op.drop_table("inventory_transactions")
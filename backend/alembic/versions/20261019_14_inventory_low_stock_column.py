@@ -0,0 +1,43 @@
+"""add generated low-stock flag with partial index
+
+Revision ID: 20261019_14
+Revises: 20261019_13
+Create Date: 2026-10-19 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_14"
+down_revision: Union[str, None] = "20261019_13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite can only add VIRTUAL generated columns with ALTER TABLE; it can still index them.
+    persisted = op.get_bind().dialect.name != "sqlite"
+    op.add_column(
+        "inventory_items",
+        sa.Column(
+            "is_low_stock",
+            sa.Boolean(),
+            sa.Computed("quantity <= low_stock_threshold", persisted=persisted),
+        ),
+    )
+    op.create_index(
+        "ix_inventory_items_owner_low_stock",
+        "inventory_items",
+        ["owner_user_id"],
+        unique=False,
+        postgresql_where=sa.text("is_low_stock IS true"),
+        sqlite_where=sa.text("is_low_stock IS 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_items_owner_low_stock", table_name="inventory_items")
+    op.drop_column("inventory_items", "is_low_stock")
@@ -0,0 +1,41 @@
+"""use exact imperial factors in unit conversion lookup
+
+Revision ID: 20261019_15
+Revises: 20261019_14
+Create Date: 2026-10-19 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_15"
+down_revision: Union[str, None] = "20261019_14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# canonical unit -> (previous factor, exact factor)
+_FACTORS: dict[str, tuple[float, float]] = {
+    "oz": (28.3495, 28.349523125),
+    "lb": (453.592, 453.59237),
+    "floz": (29.5735, 29.5735295625),
+    "qt": (946.353, 946.352946),
+    "gal": (3785.41, 3785.411784),
+}
+
+
+def _set_factors(use_exact: bool) -> None:
+    statement = sa.text("UPDATE unit_conversions SET factor_to_base = :factor WHERE canonical_unit = :canonical_unit")
+    for canonical_unit, (previous, exact) in _FACTORS.items():
+        op.execute(statement.bindparams(factor=exact if use_exact else previous, canonical_unit=canonical_unit))
+
+
+def upgrade() -> None:
+    _set_factors(use_exact=True)
+
+
+def downgrade() -> None:
+    _set_factors(use_exact=False)
@@ -0,0 +1,54 @@
+"""add inventory reservations for planned batches
+
+Revision ID: 20261019_16
+Revises: 20261019_15
+Create Date: 2026-10-19 13:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_16"
+down_revision: Union[str, None] = "20261019_15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inventory_reservations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("owner_user_id", sa.Integer(), nullable=True),
+        sa.Column("batch_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=120), nullable=False),
+        sa.Column("name_normalized", sa.String(length=120), nullable=False),
+        sa.Column("ingredient_type", sa.String(length=30), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("unit", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("released_at", sa.DateTime(), nullable=True),
+        sa.Column("release_reason", sa.String(length=20), nullable=True),
+        sa.ForeignKeyConstraint(["owner_user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["batch_id"], ["batches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_inventory_reservations_id"), "inventory_reservations", ["id"], unique=False)
+    op.create_index(op.f("ix_inventory_reservations_batch_id"), "inventory_reservations", ["batch_id"], unique=False)
+    op.create_index(
+        "ix_inventory_reservations_owner_active",
+        "inventory_reservations",
+        ["owner_user_id", "name_normalized"],
+        unique=False,
+        postgresql_where=sa.text("released_at IS NULL"),
+        sqlite_where=sa.text("released_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inventory_reservations_owner_active", table_name="inventory_reservations")
+    op.drop_index(op.f("ix_inventory_reservations_batch_id"), table_name="inventory_reservations")
+    op.drop_index(op.f("ix_inventory_reservations_id"), table_name="inventory_reservations")
+    op.drop_table("inventory_reservations")
@@ -0,0 +1,34 @@
+"""record the catalog source of imported recipes
+
+Revision ID: 20261019_17
+Revises: 20261019_16
+Create Date: 2026-10-19 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_17"
+down_revision: Union[str, None] = "20261019_16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("recipes", sa.Column("source_provider", sa.String(length=60), nullable=True))
+    op.add_column("recipes", sa.Column("source_external_id", sa.String(length=120), nullable=True))
+    op.create_index(
+        "ix_recipes_owner_source",
+        "recipes",
+        ["owner_user_id", "source_provider", "source_external_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_recipes_owner_source", table_name="recipes")
+    op.drop_column("recipes", "source_external_id")
+    op.drop_column("recipes", "source_provider")
@@ -0,0 +1,29 @@
+"""index batches by owner and brew date
+
+Revision ID: 20261019_18
+Revises: 20261019_17
+Create Date: 2026-10-19 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_18"
+down_revision: Union[str, None] = "20261019_17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_batches_owner_brewed_on",
+        "batches",
+        ["owner_user_id", "brewed_on", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_batches_owner_brewed_on", table_name="batches")
@@ -0,0 +1,53 @@
+"""keep inventory ledger rows when their item is deleted
+
+Revision ID: 20261019_19
+Revises: 20261019_18
+Create Date: 2026-10-19 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_19"
+down_revision: Union[str, None] = "20261019_18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FK_NAME = "fk_inventory_transactions_inventory_item_id_inventory_items"
+# 20261019_13 created the foreign key unnamed: Postgres named it itself, and SQLite batch mode
+# needs a naming convention to find it in the reflected table.
+_POSTGRES_DEFAULT_FK_NAME = "inventory_transactions_inventory_item_id_fkey"
+_NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _replace_item_foreign_key(*, existing_name: str, ondelete: str, nullable: bool) -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("inventory_transactions", naming_convention=_NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(_FK_NAME, type_="foreignkey")
+            batch_op.alter_column("inventory_item_id", existing_type=sa.Integer(), nullable=nullable)
+            batch_op.create_foreign_key(_FK_NAME, "inventory_items", ["inventory_item_id"], ["id"], ondelete=ondelete)
+        return
+
+    op.drop_constraint(existing_name, "inventory_transactions", type_="foreignkey")
+    op.alter_column("inventory_transactions", "inventory_item_id", existing_type=sa.Integer(), nullable=nullable)
+    op.create_foreign_key(
+        _FK_NAME,
+        "inventory_transactions",
+        "inventory_items",
+        ["inventory_item_id"],
+        ["id"],
+        ondelete=ondelete,
+    )
+
+
+def upgrade() -> None:
+    _replace_item_foreign_key(existing_name=_POSTGRES_DEFAULT_FK_NAME, ondelete="SET NULL", nullable=True)
+
+
+def downgrade() -> None:
+    # Rows of deleted items cannot point anywhere once the column is NOT NULL again.
+    op.execute("DELETE FROM inventory_transactions WHERE inventory_item_id IS NULL")
+    _replace_item_foreign_key(existing_name=_FK_NAME, ondelete="CASCADE", nullable=False)
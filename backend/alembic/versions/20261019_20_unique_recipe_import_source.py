@@ -0,0 +1,54 @@
+"""make recipe import sources unique per user
+
+Revision ID: 20261019_20
+Revises: 20261019_19
+Create Date: 2026-10-19 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_20"
+down_revision: Union[str, None] = "20261019_19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent imports may already have stored the same template twice. Keep the oldest
+    # copy as the imported one and turn the rest into plain recipes, so no recipe is lost.
+    op.execute(
+        """
+        UPDATE recipes
+        SET source_provider = NULL, source_external_id = NULL
+        WHERE source_provider IS NOT NULL
+          AND id NOT IN (
+            SELECT MIN(id)
+            FROM recipes
+            WHERE source_provider IS NOT NULL
+            GROUP BY owner_user_id, source_provider, source_external_id
+          )
+        """
+    )
+    op.drop_index("ix_recipes_owner_source", table_name="recipes")
+    op.create_index(
+        "uq_recipes_owner_source",
+        "recipes",
+        ["owner_user_id", "source_provider", "source_external_id"],
+        unique=True,
+        postgresql_where=sa.text("source_provider IS NOT NULL"),
+        sqlite_where=sa.text("source_provider IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_recipes_owner_source", table_name="recipes")
+    op.create_index(
+        "ix_recipes_owner_source",
+        "recipes",
+        ["owner_user_id", "source_provider", "source_external_id"],
+        unique=False,
+    )
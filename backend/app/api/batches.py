@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Body, Depends, HTTPException, status
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -9,7 +8,6 @@ from app.core.security import get_current_user
 from app.models.batch import Batch, FermentationReading
 from app.models.brew_step import BrewStep
 from app.models.equipment_profile import EquipmentProfile
-from app.models.inventory import InventoryItem
 from app.models.recipe import Recipe
 from app.models.user import User
 from app.models.water_profile import WaterProfile
@@ -18,6 +16,8 @@ from app.schemas.batch import (
     BrewPlanAppliedStepRead,
     BrewPlanApplyTimelineRead,
     BrewPlanApplyTimelineRequest,
+    BatchInventoryBulkConsumeRead,
+    BatchInventoryBulkConsumeRequest,
     BatchInventoryConsumeRead,
     BatchInventoryPreviewRead,
     BrewPlanMineralAdditionRead,
@@ -25,6 +25,10 @@ from app.schemas.batch import (
     BrewPlanDisplayUnitsRead,
     BrewPlanLocalizedRead,
     BrewPlanRequest,
+    BrewPlanSweepRange,
+    BrewPlanSweepRead,
+    BrewPlanSweepRequest,
+    BrewPlanWaterBlendOptionRead,
     BrewPlanWaterIonRead,
     BrewPlanWaterRead,
     BatchRead,
@@ -32,18 +36,33 @@ from app.schemas.batch import (
     FermentationReadingCreate,
     FermentationReadingRead,
     FermentationTrendRead,
+    InventoryProjectionRead,
     RecipeIngredientSnapshotRead,
 )
 from app.services.batch_snapshot import apply_recipe_snapshot, parse_snapshot_ingredients
 from app.services.bjcp_styles import resolve_bjcp_style
-from app.services.brew_plan import build_brew_day_plan
+from app.services.brew_plan import build_brew_day_plan, build_brew_plan_sweep, expand_sweep_range, sweep_range_size
+from app.services.hop_inventory import get_inventory_hop_pool
 from app.services.fermentation import build_fermentation_trend
-from app.services.inventory_consumption import build_inventory_preview, consume_inventory_for_batch
+from app.services.inventory_consumption import (
+    build_inventory_preview,
+    consume_inventory_for_batch,
+    consume_inventory_for_batches,
+)
+from app.services.inventory_reservations import (
+    RESERVING_BATCH_STATUS,
+    build_inventory_projection,
+    release_inventory_reservations,
+    reserve_inventory_for_batch,
+)
 from app.services.preferences import resolve_language, resolve_temperature_unit, resolve_unit_system, t, to_display_units
-from app.services.water_recommendation import build_water_recommendation
+from app.services.water_recommendation import get_cached_water_recommendation
 
 router = APIRouter(prefix="/batches", tags=["batches"])
 
+_MAX_SWEEP_AXIS_VALUES = 50
+_MAX_SWEEP_CELLS = 500
+
 
 def _get_user_batch_or_404(db: Session, batch_id: int, user_id: int) -> Batch:
     batch = (
@@ -73,6 +92,36 @@ def _get_user_recipe_or_404(db: Session, recipe_id: int, user_id: int) -> Recipe
     return recipe
 
 
+def _sweep_axis_values(axis: list[float] | BrewPlanSweepRange, *, label: str) -> list[float]:
+    if isinstance(axis, BrewPlanSweepRange):
+        if axis.stop < axis.start:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Sweep {label} range stop must not be below start.",
+            )
+        # Size the range arithmetically so an oversized request is rejected before anything is allocated.
+        if sweep_range_size(start=axis.start, stop=axis.stop, step=axis.step) > _MAX_SWEEP_AXIS_VALUES:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Sweep {label} axis exceeds {_MAX_SWEEP_AXIS_VALUES} values.",
+            )
+        values = expand_sweep_range(start=axis.start, stop=axis.stop, step=axis.step)
+    else:
+        values = list(dict.fromkeys(round(value, 4) for value in axis))
+
+    if any(value <= 0 for value in values):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Sweep {label} values must be positive.",
+        )
+    if len(values) > _MAX_SWEEP_AXIS_VALUES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Sweep {label} axis exceeds {_MAX_SWEEP_AXIS_VALUES} values.",
+        )
+    return values
+
+
 def _compose_brew_plan(
     *,
     db: Session,
@@ -104,24 +153,14 @@ def _compose_brew_plan(
 
     inventory_preview = build_inventory_preview(db, batch=batch, user_id=current_user.id)
     snapshot_ingredients = parse_snapshot_ingredients(batch)
-    inventory_hop_names = [
-        item.name
-        for item in (
-            db.query(InventoryItem)
-            .filter(
-                InventoryItem.owner_user_id == current_user.id,
-                func.lower(InventoryItem.ingredient_type) == "hop",
-            )
-            .all()
-        )
-    ]
+    inventory_hop_pool = get_inventory_hop_pool(db, current_user.id)
 
     core_plan = build_brew_day_plan(
         batch=batch,
         inventory_preview=inventory_preview,
         equipment=equipment,
         snapshot_ingredients=snapshot_ingredients,
-        inventory_hop_names=inventory_hop_names,
+        inventory_hop_pool=inventory_hop_pool,
         extra_available_hops=payload.available_hop_names,
         brew_start_at=payload.brew_start_at,
         language=language,
@@ -146,21 +185,35 @@ def _compose_brew_plan(
         if style is None:
             notes.append(t("water_style_unmapped", language))
         else:
-            water_plan = build_water_recommendation(
+            water_plan = get_cached_water_recommendation(
                 water_profile=water_profile,
                 style=style,
                 batch_volume_liters=batch.volume_liters,
                 language=language,
+                mode=payload.water_mode,
+                include_ro_blends=payload.water_include_ro_blends,
             )
             water_recommendation = BrewPlanWaterRead(
                 water_profile_id=water_profile.id,
                 water_profile_name=water_profile.name,
                 style_code=style.code,
                 style_name=style.name,
+                mode=water_plan.mode,
+                ro_dilution_fraction=water_plan.ro_dilution_fraction,
                 source_profile=BrewPlanWaterIonRead(**water_plan.source_profile.__dict__),
                 target_profile=BrewPlanWaterIonRead(**water_plan.target_profile.__dict__),
                 projected_profile=BrewPlanWaterIonRead(**water_plan.projected_profile.__dict__),
                 additions=[BrewPlanMineralAdditionRead(**row.__dict__) for row in water_plan.additions],
+                ro_blend_options=[
+                    BrewPlanWaterBlendOptionRead(
+                        ro_dilution_fraction=option.ro_dilution_fraction,
+                        projected_profile=BrewPlanWaterIonRead(**option.projected_profile.__dict__),
+                        additions=[BrewPlanMineralAdditionRead(**row.__dict__) for row in option.additions],
+                        distance_to_range=option.distance_to_range,
+                        salt_grams_per_liter=option.salt_grams_per_liter,
+                    )
+                    for option in water_plan.ro_blend_options
+                ],
                 notes=list(water_plan.notes),
             )
     else:
@@ -217,6 +270,29 @@ def create_batch(
     apply_recipe_snapshot(batch, recipe)
 
     db.add(batch)
+    db.flush()
+    if batch.status == RESERVING_BATCH_STATUS:
+        reserve_inventory_for_batch(db, batch)
+    db.commit()
+    db.refresh(batch)
+    return batch
+
+
+@router.post("/{batch_id}/cancel", response_model=BatchRead)
+def cancel_batch(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> Batch:
+    batch = _get_user_batch_or_404(db, batch_id=batch_id, user_id=current_user.id)
+    if batch.inventory_consumed_at is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Inventory already consumed for this batch.")
+    if batch.status == "cancelled":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Batch is already cancelled.")
+
+    batch.status = "cancelled"
+    db.add(batch)
+    release_inventory_reservations(db, batch_id=batch.id, reason="cancelled")
     db.commit()
     db.refresh(batch)
     return batch
@@ -290,6 +366,30 @@ def consume_batch_inventory(
     return result
 
 
+@router.get("/inventory/projection", response_model=InventoryProjectionRead)
+def get_inventory_projection(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryProjectionRead:
+    return build_inventory_projection(db, user_id=current_user.id)
+
+
+@router.post("/inventory/consume", response_model=BatchInventoryBulkConsumeRead)
+def consume_batches_inventory(
+    payload: BatchInventoryBulkConsumeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BatchInventoryBulkConsumeRead:
+    batch_ids = list(dict.fromkeys(payload.batch_ids))
+    batches = [_get_user_batch_or_404(db, batch_id=batch_id, user_id=current_user.id) for batch_id in batch_ids]
+    result = consume_inventory_for_batches(db, batches=batches, user_id=current_user.id)
+
+    if not result.consumed:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=result.model_dump(mode="json"))
+
+    return result
+
+
 @router.post("/{batch_id}/brew-plan", response_model=BrewPlanLocalizedRead)
 def generate_brew_plan(
     batch_id: int,
@@ -308,6 +408,67 @@ def generate_brew_plan(
     )
 
 
+@router.post("/{batch_id}/brew-plan/sweep", response_model=BrewPlanSweepRead)
+def sweep_brew_plan(
+    batch_id: int,
+    payload: BrewPlanSweepRequest = Body(default_factory=BrewPlanSweepRequest),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BrewPlanSweepRead:
+    batch = _get_user_batch_or_404(db, batch_id=batch_id, user_id=current_user.id)
+
+    efficiency_values = _sweep_axis_values(payload.efficiency_pct, label="efficiency")
+    if any(value > 100 for value in efficiency_values):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Sweep efficiency values must not exceed 100.",
+        )
+    volume_values = _sweep_axis_values(payload.batch_volume_liters, label="batch volume")
+
+    equipment_options: list[EquipmentProfile | None] = [None]
+    equipment_ids = list(dict.fromkeys(payload.equipment_profile_ids))
+    if equipment_ids:
+        equipment_by_id = {
+            equipment.id: equipment
+            for equipment in (
+                db.query(EquipmentProfile)
+                .filter(
+                    EquipmentProfile.id.in_(equipment_ids),
+                    EquipmentProfile.owner_user_id == current_user.id,
+                )
+                .all()
+            )
+        }
+        if len(equipment_by_id) != len(equipment_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Equipment profile not found")
+        equipment_options = [equipment_by_id[equipment_id] for equipment_id in equipment_ids]
+
+    cell_count = len(equipment_options) * max(len(efficiency_values), 1) * max(len(volume_values), 1)
+    if cell_count > _MAX_SWEEP_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Sweep grid exceeds {_MAX_SWEEP_CELLS} combinations.",
+        )
+
+    rows = build_brew_plan_sweep(
+        batch=batch,
+        inventory_preview=build_inventory_preview(db, batch=batch, user_id=current_user.id),
+        snapshot_ingredients=parse_snapshot_ingredients(batch),
+        equipment_options=equipment_options,
+        efficiency_pct_values=efficiency_values,
+        batch_volume_values=volume_values,
+    )
+
+    return BrewPlanSweepRead(
+        batch_id=batch.id,
+        batch_name=batch.name,
+        generated_at=datetime.utcnow(),
+        source_efficiency_pct=round(float(batch.recipe_efficiency_pct_snapshot or 70.0), 2),
+        row_count=len(rows),
+        rows=rows,
+    )
+
+
 @router.post("/{batch_id}/brew-plan/apply-timeline", response_model=BrewPlanApplyTimelineRead)
 def apply_brew_plan_to_timeline(
     batch_id: int,
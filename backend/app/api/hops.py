@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.security import get_current_user
+from app.models.user import User
+from app.schemas.hops import HopSimilarityRead
+from app.schemas.recipe import HopProfileRead, HopSubstitutionCandidateRead
+from app.services.hop_substitution import (
+    ANY_HOP_CANDIDATES,
+    get_hop_catalog,
+    recommend_hop_substitutions,
+)
+
+router = APIRouter(prefix="/hops", tags=["hops"])
+
+
+@router.get("/{hop_name}/similar", response_model=HopSimilarityRead)
+def list_similar_hops(
+    hop_name: str,
+    k: int = Query(default=10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+) -> HopSimilarityRead:
+    del current_user
+    try:
+        result = recommend_hop_substitutions(
+            target_hop_name=hop_name,
+            available_hop_names=ANY_HOP_CANDIDATES,
+            top_k=k,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hop not found in flavor catalog") from exc
+
+    return HopSimilarityRead(
+        hop=HopProfileRead(
+            name=result.target_hop.name,
+            alpha_acid_min_pct=result.target_hop.alpha_acid_min_pct,
+            alpha_acid_max_pct=result.target_hop.alpha_acid_max_pct,
+            flavor_descriptors=list(result.target_hop.flavor_descriptors),
+        ),
+        match_confidence=result.target_confidence,
+        k=k,
+        catalog_size=len(get_hop_catalog()),
+        similar=[
+            HopSubstitutionCandidateRead(
+                name=row.name,
+                alpha_acid_min_pct=row.alpha_acid_min_pct,
+                alpha_acid_max_pct=row.alpha_acid_max_pct,
+                flavor_similarity_score=row.flavor_similarity_score,
+                descriptor_overlap_score=row.descriptor_overlap_score,
+                similarity_score=row.similarity_score,
+                recommended_bittering_ratio=row.recommended_bittering_ratio,
+                shared_descriptors=list(row.shared_descriptors),
+            )
+            for row in result.substitutions
+        ],
+    )
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.http_caching import CachedCatalogResponses, cached_json_response
 from app.core.security import get_current_user
 from app.models.equipment_profile import EquipmentProfile
 from app.models.ingredient_profile import IngredientProfile
-from app.models.recipe import Recipe, RecipeIngredient
 from app.models.user import User
 from app.schemas.imports import (
     EquipmentImportResultRead,
@@ -19,21 +22,43 @@ from app.schemas.imports import (
     ExternalRecipeCatalogItemRead,
     ExternalRecipeCatalogResponse,
     IngredientImportResultRead,
+    RecipeBulkImportRead,
+    RecipeBulkImportRequest,
+    RecipeFileImportRead,
     RecipeImportResultRead,
 )
 from app.services.external_catalog import (
+    DEFAULT_CATALOG_PAGE_SIZE,
     ExternalEquipmentTemplate,
     ExternalIngredientTemplate,
     ExternalRecipeTemplate,
     get_equipment_template,
+    get_external_catalog_store,
     get_ingredient_template,
     get_recipe_template,
     list_equipment_templates,
     list_ingredient_templates,
     list_recipe_templates,
 )
+from app.services.recipe_file_import import (
+    RecipeFileError,
+    RecipeFileFormat,
+    RecipeFileImportProgress,
+    import_recipe_file,
+)
+from app.services.recipe_import import (
+    bulk_import_catalog_recipes,
+    insert_recipe_templates,
+)
 
 router = APIRouter(prefix="/imports", tags=["imports"])
+logger = logging.getLogger("brewpilot.imports")
+
+_RECIPE_FILE_FORMATS: dict[str, RecipeFileFormat] = {
+    "application/xml": "beerxml",
+    "text/xml": "beerxml",
+    "application/json": "beerjson",
+}
 
 
 def _to_recipe_catalog_item(template: ExternalRecipeTemplate) -> ExternalRecipeCatalogItemRead:
@@ -90,15 +115,94 @@ def _to_ingredient_catalog_item(template: ExternalIngredientTemplate) -> Externa
     )
 
 
+def _build_recipe_catalog(
+    provider: str | None = None,
+    search: str | None = None,
+    limit: int = DEFAULT_CATALOG_PAGE_SIZE,
+    offset: int = 0,
+) -> ExternalRecipeCatalogResponse:
+    page = list_recipe_templates(provider=provider, search=search, limit=limit, offset=offset)
+    items = [_to_recipe_catalog_item(template) for template in page.items]
+    return ExternalRecipeCatalogResponse(count=len(items), total=page.total, limit=limit, offset=offset, items=items)
+
+
+def _build_equipment_catalog(
+    provider: str | None = None,
+    search: str | None = None,
+    limit: int = DEFAULT_CATALOG_PAGE_SIZE,
+    offset: int = 0,
+) -> ExternalEquipmentCatalogResponse:
+    page = list_equipment_templates(provider=provider, search=search, limit=limit, offset=offset)
+    items = [_to_equipment_catalog_item(template) for template in page.items]
+    return ExternalEquipmentCatalogResponse(count=len(items), total=page.total, limit=limit, offset=offset, items=items)
+
+
+def _build_ingredient_catalog(
+    provider: str | None = None,
+    ingredient_type: str | None = None,
+    search: str | None = None,
+    limit: int = DEFAULT_CATALOG_PAGE_SIZE,
+    offset: int = 0,
+) -> ExternalIngredientCatalogResponse:
+    page = list_ingredient_templates(
+        provider=provider, ingredient_type=ingredient_type, search=search, limit=limit, offset=offset
+    )
+    items = [_to_ingredient_catalog_item(template) for template in page.items]
+    return ExternalIngredientCatalogResponse(count=len(items), total=page.total, limit=limit, offset=offset, items=items)
+
+
+# First pages of the unfiltered and per-provider (and per-type) listings are encoded on the
+# first catalog request, which is also when the store ingests its dumps; searches and later
+# pages on first use. Nothing here touches the store at import.
+_FIRST_PAGE = {"limit": DEFAULT_CATALOG_PAGE_SIZE, "offset": 0}
+
+
+def _recipe_catalog_first_pages() -> list[dict[str, str | int | None]]:
+    providers = get_external_catalog_store().recipe_providers()
+    return [_FIRST_PAGE, *({**_FIRST_PAGE, "provider": provider} for provider in providers)]
+
+
+def _equipment_catalog_first_pages() -> list[dict[str, str | int | None]]:
+    providers = get_external_catalog_store().equipment_providers()
+    return [_FIRST_PAGE, *({**_FIRST_PAGE, "provider": provider} for provider in providers)]
+
+
+def _ingredient_catalog_first_pages() -> list[dict[str, str | int | None]]:
+    return [
+        {**_FIRST_PAGE, "provider": provider, "ingredient_type": ingredient_type}
+        for provider, ingredient_type in {
+            (provider, ingredient_type)
+            for facet in get_external_catalog_store().ingredient_facets()
+            for provider in (None, facet[0])
+            for ingredient_type in (None, facet[1])
+        }
+    ]
+
+
+_RECIPE_CATALOG_RESPONSES = CachedCatalogResponses(
+    "http_recipe_catalog", _build_recipe_catalog, prebuilt=_recipe_catalog_first_pages
+)
+_EQUIPMENT_CATALOG_RESPONSES = CachedCatalogResponses(
+    "http_equipment_catalog", _build_equipment_catalog, prebuilt=_equipment_catalog_first_pages
+)
+_INGREDIENT_CATALOG_RESPONSES = CachedCatalogResponses(
+    "http_ingredient_catalog", _build_ingredient_catalog, prebuilt=_ingredient_catalog_first_pages
+)
+
+
 @router.get("/recipes/catalog", response_model=ExternalRecipeCatalogResponse)
 def list_recipe_catalog(
+    request: Request,
     provider: str | None = Query(default=None),
     search: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_CATALOG_PAGE_SIZE, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     _: User = Depends(get_current_user),
-) -> ExternalRecipeCatalogResponse:
-    templates = list_recipe_templates(provider=provider, search=search)
-    items = [_to_recipe_catalog_item(template) for template in templates]
-    return ExternalRecipeCatalogResponse(count=len(items), items=items)
+) -> Response:
+    return cached_json_response(
+        request,
+        _RECIPE_CATALOG_RESPONSES.get(provider=provider, search=search, limit=limit, offset=offset),
+    )
 
 
 @router.post("/recipes/import", response_model=RecipeImportResultRead, status_code=status.HTTP_201_CREATED)
@@ -111,51 +215,78 @@ def import_recipe_from_catalog(
     if template is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="External recipe not found")
 
-    recipe = Recipe(
-        owner_user_id=current_user.id,
-        name=template.name,
-        style=template.style,
-        target_og=template.target_og,
-        target_fg=template.target_fg,
-        target_ibu=template.target_ibu,
-        target_srm=template.target_srm,
-        efficiency_pct=template.efficiency_pct,
-        notes=template.notes,
-    )
-
-    for ingredient in template.ingredients:
-        recipe.ingredients.append(
-            RecipeIngredient(
-                name=ingredient.name,
-                ingredient_type=ingredient.ingredient_type,
-                amount=ingredient.amount,
-                unit=ingredient.unit,
-                stage=ingredient.stage,
-                minute_added=ingredient.minute_added,
-            )
-        )
-
-    db.add(recipe)
+    # The insert skips a template the user already has, even one a concurrent request just added.
+    (recipe_id,) = insert_recipe_templates(db, user_id=current_user.id, templates=[template])
+    if recipe_id is None:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Recipe already imported")
     db.commit()
-    db.refresh(recipe)
 
     return RecipeImportResultRead(
         provider=template.provider,
         external_id=template.external_id,
-        recipe_id=recipe.id,
-        recipe_name=recipe.name,
+        recipe_id=recipe_id,
+        recipe_name=template.name,
+    )
+
+
+@router.post("/recipes/bulk", response_model=RecipeBulkImportRead, status_code=status.HTTP_201_CREATED)
+def bulk_import_recipes_from_catalog(
+    payload: RecipeBulkImportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> RecipeBulkImportRead:
+    return bulk_import_catalog_recipes(
+        db,
+        user_id=current_user.id,
+        items=[(item.provider, item.external_id) for item in payload.items],
     )
 
 
+@router.post("/recipes/file", response_model=RecipeFileImportRead, status_code=status.HTTP_201_CREATED)
+async def import_recipe_file_upload(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> RecipeFileImportRead:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    file_format = _RECIPE_FILE_FORMATS.get(content_type)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload BeerXML as application/xml or BeerJSON as application/json",
+        )
+
+    request_id = getattr(request.state, "request_id", None)
+
+    def log_progress(progress: RecipeFileImportProgress) -> None:
+        logger.info(json.dumps({"event": "recipe_file_import_progress", "request_id": request_id, **progress.__dict__}))
+
+    try:
+        return await import_recipe_file(
+            request.stream(),
+            file_format=file_format,
+            db=db,
+            user_id=current_user.id,
+            on_progress=log_progress,
+        )
+    except RecipeFileError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+
 @router.get("/equipment/catalog", response_model=ExternalEquipmentCatalogResponse)
 def list_equipment_catalog(
+    request: Request,
     provider: str | None = Query(default=None),
     search: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_CATALOG_PAGE_SIZE, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     _: User = Depends(get_current_user),
-) -> ExternalEquipmentCatalogResponse:
-    templates = list_equipment_templates(provider=provider, search=search)
-    items = [_to_equipment_catalog_item(template) for template in templates]
-    return ExternalEquipmentCatalogResponse(count=len(items), items=items)
+) -> Response:
+    return cached_json_response(
+        request,
+        _EQUIPMENT_CATALOG_RESPONSES.get(provider=provider, search=search, limit=limit, offset=offset),
+    )
 
 
 @router.post("/equipment/import", response_model=EquipmentImportResultRead, status_code=status.HTTP_201_CREATED)
@@ -240,14 +371,20 @@ def get_imported_equipment_profile(
 
 @router.get("/ingredients/catalog", response_model=ExternalIngredientCatalogResponse)
 def list_ingredient_catalog(
+    request: Request,
     provider: str | None = Query(default=None),
     ingredient_type: str | None = Query(default=None),
     search: str | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_CATALOG_PAGE_SIZE, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     _: User = Depends(get_current_user),
-) -> ExternalIngredientCatalogResponse:
-    templates = list_ingredient_templates(provider=provider, ingredient_type=ingredient_type, search=search)
-    items = [_to_ingredient_catalog_item(template) for template in templates]
-    return ExternalIngredientCatalogResponse(count=len(items), items=items)
+) -> Response:
+    return cached_json_response(
+        request,
+        _INGREDIENT_CATALOG_RESPONSES.get(
+            provider=provider, ingredient_type=ingredient_type, search=search, limit=limit, offset=offset
+        ),
+    )
 
 
 @router.post("/ingredients/import", response_model=IngredientImportResultRead, status_code=status.HTTP_201_CREATED)
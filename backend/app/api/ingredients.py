@@ -5,7 +5,17 @@ from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.ingredient_profile import IngredientProfile
 from app.models.user import User
-from app.schemas.ingredients import IngredientProfileCreate, IngredientProfileRead, IngredientProfileUpdate
+from app.schemas.ingredients import (
+    IngredientMatchRead,
+    IngredientMatchResponse,
+    IngredientProfileCreate,
+    IngredientProfileRead,
+    IngredientProfileUpdate,
+)
+from app.services.ingredient_matching import (
+    DEFAULT_MIN_SCORE,
+    get_ingredient_name_index,
+)
 
 router = APIRouter(prefix="/ingredients", tags=["ingredients"])
 
@@ -75,6 +85,41 @@ def list_ingredient_profiles(
     return query.order_by(IngredientProfile.ingredient_type.asc(), IngredientProfile.name.asc()).all()
 
 
+@router.get("/match", response_model=IngredientMatchResponse)
+def match_ingredient_names(
+    name: str = Query(min_length=1, max_length=120),
+    ingredient_type: str | None = Query(default=None, max_length=30),
+    source: str | None = Query(default=None, pattern="^(inventory|profile)$"),
+    limit: int = Query(default=5, ge=1, le=25),
+    min_score: float = Query(default=DEFAULT_MIN_SCORE, ge=0, le=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> IngredientMatchResponse:
+    name_index = get_ingredient_name_index(db, current_user.id)
+    matches = name_index.lookup(
+        name,
+        ingredient_type=ingredient_type,
+        source=source,
+        limit=limit,
+        min_score=min_score,
+    )
+    return IngredientMatchResponse(
+        query=name,
+        count=len(matches),
+        matches=[
+            IngredientMatchRead(
+                source=match.entry.source,
+                id=match.entry.id,
+                name=match.entry.name,
+                ingredient_type=match.entry.ingredient_type,
+                unit=match.entry.unit,
+                score=match.score,
+            )
+            for match in matches
+        ],
+    )
+
+
 @router.get("/{ingredient_id}", response_model=IngredientProfileRead)
 def get_ingredient_profile(
     ingredient_id: int,
@@ -1,19 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+import codecs
+import json
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.inventory import InventoryItem
+from app.models.inventory_transaction import InventoryTransaction
 from app.models.user import User
 from app.schemas.inventory import (
+    InventoryAdjustRequest,
+    InventoryBalanceRead,
+    InventoryBulkImportRead,
     InventoryItemCreate,
     InventoryItemRead,
     InventoryItemUpdate,
+    InventoryRestockRequest,
+    InventoryTransactionRead,
     LowStockAlertResponse,
+    LowStockCountRead,
+)
+from app.services.inventory_bulk import (
+    InventoryCsvError,
+    bulk_upsert_inventory,
+    iter_inventory_csv_rows,
+)
+from app.services.inventory_ledger import (
+    apply_inventory_delta,
+    close_inventory_ledger,
+    inventory_balance_at,
+    record_inventory_transaction,
 )
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
+_MAX_BULK_ROWS = 20000
+
+
+def _get_user_inventory_item_or_404(db: Session, item_id: int, user_id: int) -> InventoryItem:
+    item = (
+        db.query(InventoryItem)
+        .filter(
+            InventoryItem.id == item_id,
+            InventoryItem.owner_user_id == user_id,
+        )
+        .first()
+    )
+    if not item:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory item not found")
+    return item
+
 
 def to_inventory_read(item: InventoryItem) -> InventoryItemRead:
     return InventoryItemRead(
@@ -24,7 +64,7 @@ def to_inventory_read(item: InventoryItem) -> InventoryItemRead:
         unit=item.unit,
         low_stock_threshold=item.low_stock_threshold,
         updated_at=item.updated_at,
-        is_low_stock=item.quantity <= item.low_stock_threshold,
+        is_low_stock=item.is_low_stock,
     )
 
 
@@ -54,27 +94,90 @@ def create_inventory_item(
         low_stock_threshold=payload.low_stock_threshold,
     )
     db.add(item)
+    db.flush()
+    record_inventory_transaction(db, item=item, kind="restock", quantity_delta=item.quantity, note="Initial stock")
     db.commit()
     db.refresh(item)
     return to_inventory_read(item)
 
 
+@router.post("/bulk", response_model=InventoryBulkImportRead)
+async def bulk_upsert_inventory_items(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryBulkImportRead:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "application/json":
+        rows = await _read_json_rows(request)
+    elif content_type in {"text/csv", "text/plain"}:
+        rows = await _read_csv_rows(request)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use application/json or text/csv for bulk inventory uploads",
+        )
+
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No inventory rows supplied")
+    if len(rows) > _MAX_BULK_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Bulk uploads are limited to {_MAX_BULK_ROWS} rows",
+        )
+
+    return await run_in_threadpool(bulk_upsert_inventory, db, user_id=current_user.id, rows=rows)
+
+
+async def _read_json_rows(request: Request) -> list[tuple[int, object]]:
+    try:
+        payload = json.loads(await request.body())
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid JSON body") from exc
+
+    items = payload.get("items") if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="JSON body must be a list of items or an object with an items list",
+        )
+    return list(enumerate(items, start=1))
+
+
+async def _read_csv_rows(request: Request) -> list[tuple[int, object]]:
+    # Decode the body as it arrives so it is never held as one bytes blob as well as text. The
+    # upload is still buffered: every row is parsed before validation, bounded by _MAX_BULK_ROWS.
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    lines: list[str] = []
+    pending = ""
+    try:
+        async for chunk in request.stream():
+            pending += decoder.decode(chunk)
+            *complete, pending = pending.split("\n")
+            lines.extend(f"{line}\n" for line in complete)
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="CSV body must be UTF-8") from exc
+    if pending:
+        lines.append(pending)
+
+    try:
+        return list(iter_inventory_csv_rows(lines))
+    except InventoryCsvError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+
 @router.get("", response_model=list[InventoryItemRead])
 def list_inventory_items(
     low_stock_only: bool = Query(default=False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[InventoryItemRead]:
-    items = (
-        db.query(InventoryItem)
-        .filter(InventoryItem.owner_user_id == current_user.id)
-        .order_by(InventoryItem.name.asc())
-        .all()
-    )
-
+    query = db.query(InventoryItem).filter(InventoryItem.owner_user_id == current_user.id)
     if low_stock_only:
-        items = [item for item in items if item.quantity <= item.low_stock_threshold]
+        query = query.filter(InventoryItem.is_low_stock.is_(True))
 
+    items = query.order_by(InventoryItem.name.asc()).all()
     return [to_inventory_read(item) for item in items]
 
 
@@ -85,14 +188,33 @@ def get_low_stock_alerts(
 ) -> LowStockAlertResponse:
     items = (
         db.query(InventoryItem)
-        .filter(InventoryItem.owner_user_id == current_user.id)
+        .filter(
+            InventoryItem.owner_user_id == current_user.id,
+            InventoryItem.is_low_stock.is_(True),
+        )
         .order_by(InventoryItem.name.asc())
         .all()
     )
-    low_stock_items = [to_inventory_read(item) for item in items if item.quantity <= item.low_stock_threshold]
+    low_stock_items = [to_inventory_read(item) for item in items]
     return LowStockAlertResponse(count=len(low_stock_items), items=low_stock_items)
 
 
+@router.get("/alerts/low-stock/count", response_model=LowStockCountRead)
+def get_low_stock_count(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> LowStockCountRead:
+    count = db.scalar(
+        select(func.count())
+        .select_from(InventoryItem)
+        .where(
+            InventoryItem.owner_user_id == current_user.id,
+            InventoryItem.is_low_stock.is_(True),
+        )
+    )
+    return LowStockCountRead(count=count or 0)
+
+
 @router.get("/{item_id}", response_model=InventoryItemRead)
 def get_inventory_item(
     item_id: int,
@@ -126,6 +248,7 @@ def update_inventory_item(
             InventoryItem.id == item_id,
             InventoryItem.owner_user_id == current_user.id,
         )
+        .with_for_update()
         .first()
     )
     if not item:
@@ -143,6 +266,7 @@ def update_inventory_item(
     if conflicting:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Inventory item already exists")
 
+    quantity_delta = payload.quantity - item.quantity
     item.name = payload.name
     item.ingredient_type = payload.ingredient_type
     item.quantity = payload.quantity
@@ -150,11 +274,126 @@ def update_inventory_item(
     item.low_stock_threshold = payload.low_stock_threshold
 
     db.add(item)
+    db.flush()
+    if quantity_delta != 0:
+        record_inventory_transaction(db, item=item, kind="adjust", quantity_delta=quantity_delta, note="Manual update")
     db.commit()
     db.refresh(item)
     return to_inventory_read(item)
 
 
+@router.get("/{item_id}/transactions", response_model=list[InventoryTransactionRead])
+def list_inventory_transactions(
+    item_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    before_id: int | None = Query(default=None, gt=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[InventoryTransactionRead]:
+    item = _get_user_inventory_item_or_404(db, item_id=item_id, user_id=current_user.id)
+    query = db.query(InventoryTransaction).filter(InventoryTransaction.inventory_item_id == item.id)
+    if before_id is not None:
+        query = query.filter(InventoryTransaction.id < before_id)
+
+    transactions = query.order_by(InventoryTransaction.id.desc()).limit(limit).all()
+    return [InventoryTransactionRead.model_validate(transaction) for transaction in transactions]
+
+
+@router.get("/{item_id}/balance", response_model=InventoryBalanceRead)
+def get_inventory_balance(
+    item_id: int,
+    at: datetime | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryBalanceRead:
+    item = _get_user_inventory_item_or_404(db, item_id=item_id, user_id=current_user.id)
+
+    at_naive_utc = datetime.utcnow() if at is None else at
+    if at_naive_utc.tzinfo is not None:
+        at_naive_utc = at_naive_utc.astimezone(timezone.utc).replace(tzinfo=None)
+
+    quantity, transaction_id = inventory_balance_at(db, inventory_item_id=item.id, at=at_naive_utc)
+    return InventoryBalanceRead(
+        inventory_item_id=item.id,
+        unit=item.unit,
+        at=at_naive_utc,
+        quantity=quantity,
+        transaction_id=transaction_id,
+    )
+
+
+@router.post("/{item_id}/restock", response_model=InventoryTransactionRead, status_code=status.HTTP_201_CREATED)
+def restock_inventory_item(
+    item_id: int,
+    payload: InventoryRestockRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryTransactionRead:
+    return _apply_inventory_transaction(
+        db,
+        item_id=item_id,
+        user_id=current_user.id,
+        kind="restock",
+        quantity_delta=payload.quantity,
+        note=payload.note,
+    )
+
+
+@router.post("/{item_id}/adjust", response_model=InventoryTransactionRead, status_code=status.HTTP_201_CREATED)
+def adjust_inventory_item(
+    item_id: int,
+    payload: InventoryAdjustRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> InventoryTransactionRead:
+    if payload.quantity_delta == 0:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="quantity_delta must be non-zero")
+
+    return _apply_inventory_transaction(
+        db,
+        item_id=item_id,
+        user_id=current_user.id,
+        kind="adjust",
+        quantity_delta=payload.quantity_delta,
+        note=payload.note,
+    )
+
+
+def _apply_inventory_transaction(
+    db: Session,
+    *,
+    item_id: int,
+    user_id: int,
+    kind: str,
+    quantity_delta: float,
+    note: str | None,
+) -> InventoryTransactionRead:
+    _get_user_inventory_item_or_404(db, item_id=item_id, user_id=user_id)
+    entry = apply_inventory_delta(
+        db,
+        inventory_item_id=item_id,
+        user_id=user_id,
+        kind=kind,
+        quantity_delta=quantity_delta,
+        note=note,
+    )
+    if entry is None:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Adjustment would make inventory negative")
+
+    db.commit()
+    return InventoryTransactionRead(
+        id=entry.transaction_id,
+        inventory_item_id=entry.inventory_item_id,
+        kind=kind,
+        quantity_delta=entry.quantity_delta,
+        balance_after=entry.balance_after,
+        batch_id=None,
+        note=note,
+        created_at=entry.created_at,
+    )
+
+
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_inventory_item(
     item_id: int,
@@ -172,6 +411,7 @@ def delete_inventory_item(
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inventory item not found")
 
+    close_inventory_ledger(db, item=item)
     db.delete(item)
     db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,24 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.equipment_profile import EquipmentProfile
-from app.models.inventory import InventoryItem
 from app.models.recipe import Recipe, RecipeIngredient
 from app.models.user import User
 from app.schemas.recipe import (
+    HopBlendCandidateRead,
+    HopBlendComponentRead,
+    HopNameResolutionRead,
     HopProfileRead,
     HopSubstitutionCandidateRead,
     RecipeCreate,
+    RecipeHopSubstitutionBatchRead,
+    RecipeHopSubstitutionBatchRequest,
     RecipeHopSubstitutionRead,
     RecipeHopSubstitutionRequest,
+    RecipeHopSubstitutionTargetRead,
     RecipeRead,
     RecipeScaleRead,
     RecipeScaleRequest,
 )
-from app.services.hop_substitution import normalize_hop_name, recommend_hop_substitutions, resolve_hop_profile
+from app.services.hop_inventory import get_inventory_hop_pool
+from app.services.hop_substitution import (
+    ANY_HOP_CANDIDATES,
+    HopBlendCandidate,
+    HopCandidatePool,
+    HopNameResolution,
+    HopProfile,
+    HopSubstitutionCandidate,
+    build_hop_candidate_pool,
+    merge_hop_candidate_pools,
+    normalize_hop_name,
+    recommend_hop_substitutions,
+    recommend_hop_substitutions_batch,
+    resolve_hop_profile,
+)
 from app.services.recipe_scaling import build_scaled_recipe
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
@@ -38,6 +56,107 @@ def _get_user_recipe_or_404(db: Session, recipe_id: int, user_id: int) -> Recipe
     return recipe
 
 
+def _recipe_hop_names_or_422(recipe: Recipe) -> list[str]:
+    recipe_hop_names = [
+        ingredient.name
+        for ingredient in recipe.ingredients
+        if ingredient.ingredient_type.strip().lower() == "hop"
+    ]
+    if not recipe_hop_names:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Recipe has no hop ingredients to substitute.",
+        )
+    return recipe_hop_names
+
+
+def _hop_in_recipe(hop_name: str, recipe_hop_names: list[str]) -> bool:
+    if normalize_hop_name(hop_name) in {normalize_hop_name(name) for name in recipe_hop_names}:
+        return True
+    target_profile = resolve_hop_profile(hop_name)
+    recipe_hop_profiles = {profile.name for profile in (resolve_hop_profile(name) for name in recipe_hop_names) if profile}
+    return target_profile is not None and target_profile.name in recipe_hop_profiles
+
+
+def _candidate_pool_for_request(
+    db: Session,
+    *,
+    payload: RecipeHopSubstitutionRequest | RecipeHopSubstitutionBatchRequest,
+    user_id: int,
+) -> tuple[HopCandidatePool | None, list[str]]:
+    """Resolve provided and inventory candidates once; None means search the whole catalog."""
+    if payload.candidate_scope == "any":
+        return None, ["catalog"]
+
+    source_parts: list[str] = []
+    candidate_pools: list[HopCandidatePool] = []
+    provided_names = [name for name in payload.available_hop_names if name.strip()]
+    if provided_names:
+        source_parts.append("provided")
+        candidate_pools.append(build_hop_candidate_pool(provided_names))
+
+    if payload.include_inventory_hops:
+        inventory_pool = get_inventory_hop_pool(db, user_id)
+        if inventory_pool.input_names:
+            source_parts.append("inventory")
+            candidate_pools.append(inventory_pool)
+
+    if not candidate_pools:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No candidate hops found. Provide available_hop_names or add hop inventory.",
+        )
+    return merge_hop_candidate_pools(*candidate_pools), source_parts
+
+
+def _to_hop_profile_read(hop: HopProfile) -> HopProfileRead:
+    return HopProfileRead(
+        name=hop.name,
+        alpha_acid_min_pct=hop.alpha_acid_min_pct,
+        alpha_acid_max_pct=hop.alpha_acid_max_pct,
+        flavor_descriptors=list(hop.flavor_descriptors),
+    )
+
+
+def _to_candidate_read(row: HopSubstitutionCandidate) -> HopSubstitutionCandidateRead:
+    return HopSubstitutionCandidateRead(
+        name=row.name,
+        alpha_acid_min_pct=row.alpha_acid_min_pct,
+        alpha_acid_max_pct=row.alpha_acid_max_pct,
+        flavor_similarity_score=row.flavor_similarity_score,
+        descriptor_overlap_score=row.descriptor_overlap_score,
+        similarity_score=row.similarity_score,
+        recommended_bittering_ratio=row.recommended_bittering_ratio,
+        shared_descriptors=list(row.shared_descriptors),
+    )
+
+
+def _to_blend_read(blend: HopBlendCandidate) -> HopBlendCandidateRead:
+    return HopBlendCandidateRead(
+        components=[
+            HopBlendComponentRead(name=component.name, proportion=component.proportion)
+            for component in blend.components
+        ],
+        blend_alpha_acid_pct=blend.blend_alpha_acid_pct,
+        flavor_similarity_score=blend.flavor_similarity_score,
+        descriptor_overlap_score=blend.descriptor_overlap_score,
+        similarity_score=blend.similarity_score,
+        recommended_bittering_ratio=blend.recommended_bittering_ratio,
+        shared_descriptors=list(blend.shared_descriptors),
+    )
+
+
+def _to_resolution_reads(resolutions: tuple[HopNameResolution, ...]) -> list[HopNameResolutionRead]:
+    return [
+        HopNameResolutionRead(
+            input_name=resolution.input_name,
+            resolved_name=resolution.hop_name,
+            confidence=resolution.confidence,
+        )
+        for resolution in resolutions
+    ]
+
+
 @router.post("", response_model=RecipeRead, status_code=201)
 def create_recipe(
     payload: RecipeCreate,
@@ -140,63 +259,22 @@ def recommend_recipe_hop_substitutions(
     current_user: User = Depends(get_current_user),
 ) -> RecipeHopSubstitutionRead:
     recipe = _get_user_recipe_or_404(db, recipe_id=recipe_id, user_id=current_user.id)
+    recipe_hop_names = _recipe_hop_names_or_422(recipe)
 
-    recipe_hop_names = [
-        ingredient.name
-        for ingredient in recipe.ingredients
-        if ingredient.ingredient_type.strip().lower() == "hop"
-    ]
-    if not recipe_hop_names:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Recipe has no hop ingredients to substitute.",
-        )
-
-    normalized_target = normalize_hop_name(payload.target_hop_name)
-    target_profile = resolve_hop_profile(payload.target_hop_name)
-    recipe_hop_profiles = {profile.name for profile in (resolve_hop_profile(name) for name in recipe_hop_names) if profile}
-    target_in_recipe = normalized_target in {normalize_hop_name(name) for name in recipe_hop_names}
-    if target_profile and target_profile.name in recipe_hop_profiles:
-        target_in_recipe = True
-
-    if not target_in_recipe:
+    if not _hop_in_recipe(payload.target_hop_name, recipe_hop_names):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Target hop is not present in this recipe.",
         )
 
-    candidate_names = [name for name in payload.available_hop_names if name.strip()]
-    source_parts: list[str] = []
-    if candidate_names:
-        source_parts.append("provided")
-
-    if payload.include_inventory_hops:
-        inventory_hop_names = [
-            item.name
-            for item in (
-                db.query(InventoryItem)
-                .filter(
-                    InventoryItem.owner_user_id == current_user.id,
-                    func.lower(InventoryItem.ingredient_type) == "hop",
-                )
-                .all()
-            )
-        ]
-        if inventory_hop_names:
-            source_parts.append("inventory")
-            candidate_names.extend(inventory_hop_names)
-
-    if not candidate_names:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="No candidate hops found. Provide available_hop_names or add hop inventory.",
-        )
+    candidate_pool, source_parts = _candidate_pool_for_request(db, payload=payload, user_id=current_user.id)
 
     try:
         result = recommend_hop_substitutions(
             target_hop_name=payload.target_hop_name,
-            available_hop_names=candidate_names,
+            available_hop_names=ANY_HOP_CANDIDATES if candidate_pool is None else candidate_pool,
             top_k=payload.top_k,
+            blend_max_hops=payload.blend_max_hops,
         )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
@@ -205,27 +283,94 @@ def recommend_recipe_hop_substitutions(
         recipe_id=recipe.id,
         recipe_name=recipe.name,
         target_hop_name=payload.target_hop_name,
-        target_hop_profile=HopProfileRead(
-            name=result.target_hop.name,
-            alpha_acid_min_pct=result.target_hop.alpha_acid_min_pct,
-            alpha_acid_max_pct=result.target_hop.alpha_acid_max_pct,
-            flavor_descriptors=list(result.target_hop.flavor_descriptors),
-        ),
+        target_hop_profile=_to_hop_profile_read(result.target_hop),
+        target_match_confidence=result.target_confidence,
         candidate_source="+".join(source_parts) if source_parts else "provided",
-        candidate_input_count=len(candidate_names),
+        candidate_input_count=len(candidate_pool.input_names) if candidate_pool else 0,
         recognized_candidate_count=result.recognized_candidate_count,
         unresolved_hop_names=list(result.unresolved_hop_names),
-        substitutions=[
-            HopSubstitutionCandidateRead(
-                name=row.name,
-                alpha_acid_min_pct=row.alpha_acid_min_pct,
-                alpha_acid_max_pct=row.alpha_acid_max_pct,
-                flavor_similarity_score=row.flavor_similarity_score,
-                descriptor_overlap_score=row.descriptor_overlap_score,
-                similarity_score=row.similarity_score,
-                recommended_bittering_ratio=row.recommended_bittering_ratio,
-                shared_descriptors=list(row.shared_descriptors),
+        resolved_hop_names=_to_resolution_reads(result.resolved_candidates),
+        substitutions=[_to_candidate_read(row) for row in result.substitutions],
+        blends=[_to_blend_read(blend) for blend in result.blends],
+    )
+
+
+@router.post("/{recipe_id}/hop-substitutions/batch", response_model=RecipeHopSubstitutionBatchRead)
+def recommend_recipe_hop_substitutions_batch(
+    recipe_id: int,
+    payload: RecipeHopSubstitutionBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> RecipeHopSubstitutionBatchRead:
+    recipe = _get_user_recipe_or_404(db, recipe_id=recipe_id, user_id=current_user.id)
+    recipe_hop_names = _recipe_hop_names_or_422(recipe)
+
+    requested_targets = payload.target_hop_names or recipe_hop_names
+    target_names: list[str] = []
+    seen_targets: set[str] = set()
+    for name in requested_targets:
+        normalized = normalize_hop_name(name)
+        if normalized and normalized not in seen_targets:
+            seen_targets.add(normalized)
+            target_names.append(name)
+
+    missing_targets = [name for name in target_names if not _hop_in_recipe(name, recipe_hop_names)]
+    if missing_targets:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Target hops not present in this recipe: {', '.join(missing_targets)}",
+        )
+
+    candidate_pool, source_parts = _candidate_pool_for_request(db, payload=payload, user_id=current_user.id)
+    if candidate_pool is None:
+        results = []
+        unresolved_targets = []
+        for name in target_names:
+            try:
+                results.append(
+                    recommend_hop_substitutions(
+                        target_hop_name=name,
+                        available_hop_names=ANY_HOP_CANDIDATES,
+                        top_k=payload.top_k,
+                        blend_max_hops=payload.blend_max_hops,
+                    )
+                )
+            except ValueError:
+                unresolved_targets.append(name)
+        recognized_candidate_count = results[0].recognized_candidate_count if results else 0
+        unresolved_hop_names: list[str] = []
+        resolved_hop_names: list[HopNameResolutionRead] = []
+    else:
+        batch = recommend_hop_substitutions_batch(
+            target_hop_names=target_names,
+            available_hop_names=candidate_pool,
+            top_k=payload.top_k,
+            blend_max_hops=payload.blend_max_hops,
+        )
+        results = list(batch.results)
+        unresolved_targets = list(batch.unresolved_target_names)
+        recognized_candidate_count = len(batch.pool.resolved)
+        unresolved_hop_names = list(batch.pool.unresolved_hop_names)
+        resolved_hop_names = _to_resolution_reads(batch.pool.resolved)
+
+    resolved_target_names = [name for name in target_names if name not in unresolved_targets]
+    return RecipeHopSubstitutionBatchRead(
+        recipe_id=recipe.id,
+        recipe_name=recipe.name,
+        candidate_source="+".join(source_parts) if source_parts else "provided",
+        candidate_input_count=len(candidate_pool.input_names) if candidate_pool else 0,
+        recognized_candidate_count=recognized_candidate_count,
+        unresolved_hop_names=unresolved_hop_names,
+        resolved_hop_names=resolved_hop_names,
+        unresolved_target_names=unresolved_targets,
+        targets=[
+            RecipeHopSubstitutionTargetRead(
+                target_hop_name=target_name,
+                target_hop_profile=_to_hop_profile_read(result.target_hop),
+                target_match_confidence=result.target_confidence,
+                substitutions=[_to_candidate_read(row) for row in result.substitutions],
+                blends=[_to_blend_read(blend) for blend in result.blends],
             )
-            for row in result.substitutions
+            for target_name, result in zip(resolved_target_names, results, strict=True)
         ],
     )
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.core.http_caching import CachedCatalogResponses, cached_json_response, encode_cached_json
 from app.core.security import get_current_user
 from app.models.user import User
-from app.schemas.styles import BJCPStyleListResponse, BJCPStyleRead, IonRangeRead
-from app.services.bjcp_styles import BJCPStyleProfile, list_bjcp_styles, resolve_bjcp_style
+from app.schemas.styles import (
+    BJCPStyleListResponse,
+    BJCPStyleRead,
+    BJCPStyleSuggestionRead,
+    BJCPStyleSuggestResponse,
+    IonRangeRead,
+)
+from app.services.bjcp_styles import BJCPStyleProfile, list_bjcp_styles, resolve_bjcp_style, search_bjcp_styles
 
 router = APIRouter(prefix="/styles", tags=["styles"])
 
@@ -48,23 +55,47 @@ def _to_style_read(style: BJCPStyleProfile) -> BJCPStyleRead:
     )
 
 
+def _build_style_list(search: str | None = None) -> BJCPStyleListResponse:
+    styles = [_to_style_read(style) for style in list_bjcp_styles(search=search)]
+    return BJCPStyleListResponse(count=len(styles), items=styles)
+
+
+_STYLE_LIST_RESPONSES = CachedCatalogResponses("http_bjcp_styles", _build_style_list)
+_STYLE_DETAIL_RESPONSES = {style.code: encode_cached_json(_to_style_read(style)) for style in list_bjcp_styles()}
+
+
 @router.get("/bjcp", response_model=BJCPStyleListResponse)
 def get_bjcp_styles(
+    request: Request,
     search: str | None = Query(default=None),
     current_user: User = Depends(get_current_user),
-) -> BJCPStyleListResponse:
+) -> Response:
     del current_user
-    styles = [_to_style_read(style) for style in list_bjcp_styles(search=search)]
-    return BJCPStyleListResponse(count=len(styles), items=styles)
+    return cached_json_response(request, _STYLE_LIST_RESPONSES.get(search=search))
+
+
+@router.get("/bjcp/suggest", response_model=BJCPStyleSuggestResponse)
+def suggest_bjcp_styles(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+) -> BJCPStyleSuggestResponse:
+    del current_user
+    items = [
+        BJCPStyleSuggestionRead(code=match.style.code, name=match.style.name, category=match.style.category, score=match.score)
+        for match in search_bjcp_styles(q, limit=limit)
+    ]
+    return BJCPStyleSuggestResponse(query=q, count=len(items), items=items)
 
 
 @router.get("/bjcp/{style_identifier}", response_model=BJCPStyleRead)
 def get_bjcp_style(
+    request: Request,
     style_identifier: str,
     current_user: User = Depends(get_current_user),
-) -> BJCPStyleRead:
+) -> Response:
     del current_user
     style = resolve_bjcp_style(style_identifier)
     if style is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BJCP style not found")
-    return _to_style_read(style)
+    return cached_json_response(request, _STYLE_DETAIL_RESPONSES[style.code])
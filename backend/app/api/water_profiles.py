@@ -8,15 +8,22 @@ from app.models.user import User
 from app.models.water_profile import WaterProfile
 from app.schemas.water import (
     MineralAdditionRead,
+    StyleWaterCompatibilityRead,
+    WaterBlendOptionRead,
     WaterIonSnapshotRead,
     WaterProfileCreate,
     WaterProfileRead,
     WaterProfileUpdate,
     WaterRecommendationRead,
     WaterRecommendationRequest,
+    WaterStyleCompatibilityRead,
 )
 from app.services.bjcp_styles import resolve_bjcp_style
-from app.services.water_recommendation import build_water_recommendation
+from app.services.water_compatibility import rank_styles_for_water
+from app.services.water_recommendation import (
+    get_cached_water_recommendation,
+    invalidate_water_recommendations,
+)
 
 router = APIRouter(prefix="/water-profiles", tags=["water"])
 
@@ -136,6 +143,7 @@ def update_water_profile(
     db.add(water_profile)
     db.commit()
     db.refresh(water_profile)
+    invalidate_water_recommendations(water_profile.id)
     return water_profile
 
 
@@ -148,6 +156,7 @@ def delete_water_profile(
     water_profile = _get_user_water_profile_or_404(db, water_profile_id=water_profile_id, user_id=current_user.id)
     db.delete(water_profile)
     db.commit()
+    invalidate_water_recommendations(water_profile_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -176,11 +185,15 @@ def recommend_water_adjustments(
     if style is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="BJCP style not found")
 
-    recommendation = build_water_recommendation(
+    recommendation = get_cached_water_recommendation(
         water_profile=water_profile,
         style=style,
         batch_volume_liters=payload.batch_volume_liters,
         language=current_user.preferred_language,
+        mode=payload.mode,
+        allow_acid=payload.allow_acid,
+        allow_dilution=payload.allow_dilution,
+        include_ro_blends=payload.include_ro_blends,
     )
 
     return WaterRecommendationRead(
@@ -189,9 +202,53 @@ def recommend_water_adjustments(
         style_code=style.code,
         style_name=style.name,
         batch_volume_liters=round(payload.batch_volume_liters, 2),
+        mode=recommendation.mode,
+        ro_dilution_fraction=recommendation.ro_dilution_fraction,
         source_profile=WaterIonSnapshotRead(**recommendation.source_profile.__dict__),
         target_profile=WaterIonSnapshotRead(**recommendation.target_profile.__dict__),
         projected_profile=WaterIonSnapshotRead(**recommendation.projected_profile.__dict__),
         additions=[MineralAdditionRead(**item.__dict__) for item in recommendation.additions],
+        ro_blend_options=[
+            WaterBlendOptionRead(
+                ro_dilution_fraction=option.ro_dilution_fraction,
+                projected_profile=WaterIonSnapshotRead(**option.projected_profile.__dict__),
+                additions=[MineralAdditionRead(**item.__dict__) for item in option.additions],
+                distance_to_range=option.distance_to_range,
+                salt_grams_per_liter=option.salt_grams_per_liter,
+            )
+            for option in recommendation.ro_blend_options
+        ],
         notes=list(recommendation.notes),
     )
+
+
+@router.get("/{water_profile_id}/style-compatibility", response_model=WaterStyleCompatibilityRead)
+def get_water_style_compatibility(
+    water_profile_id: int,
+    batch_volume_liters: float = Query(default=20.0, gt=0, le=300),
+    limit: int | None = Query(default=None, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> WaterStyleCompatibilityRead:
+    water_profile = _get_user_water_profile_or_404(db, water_profile_id=water_profile_id, user_id=current_user.id)
+    ranked = rank_styles_for_water(water_profile=water_profile, batch_volume_liters=batch_volume_liters)
+    if limit is not None:
+        ranked = ranked[:limit]
+
+    return WaterStyleCompatibilityRead(
+        water_profile_id=water_profile.id,
+        water_profile_name=water_profile.name,
+        batch_volume_liters=round(batch_volume_liters, 2),
+        count=len(ranked),
+        items=[
+            StyleWaterCompatibilityRead(
+                style_code=row.style_code,
+                style_name=row.style_name,
+                distance_to_range=row.distance_to_range,
+                ions_out_of_range=list(row.ions_out_of_range),
+                projected_distance_to_range=row.projected_distance_to_range,
+                additions=[MineralAdditionRead(**item.__dict__) for item in row.additions],
+            )
+            for row in ranked
+        ],
+    )
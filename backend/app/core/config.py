@@ -18,6 +18,13 @@ class Settings(BaseSettings):
     ai_llm_model: str | None = None
     ai_llm_timeout_seconds: int = 20
 
+    hop_catalog_path: str | None = None
+    hop_catalog_index_path: str | None = None
+
+    catalog_cache_max_age_seconds: int = 86400
+    external_catalog_store_path: str | None = None
+    external_catalog_dump_paths: list[str] = []
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from threading import Lock
+
+from fastapi import Request, status
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.services.cache import LRUCache
+from app.services.observability import observability_tracker
+
+CatalogParams = Mapping[str, str | int | None]
+
+
+@dataclass(frozen=True)
+class CachedJSON:
+    body: bytes
+    etag: str
+
+
+def encode_cached_json(payload: BaseModel) -> CachedJSON:
+    body = payload.model_dump_json().encode("utf-8")
+    return CachedJSON(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches.
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def cached_json_response(request: Request, cached: CachedJSON) -> Response:
+    """Serve pre-encoded JSON with its ETag, or an empty 304 when the client already has it.
+
+    Every catalog route requires a bearer token, so responses are `private`: only the client's
+    own cache may reuse them, never a shared proxy or CDN that would skip the auth check.
+    """
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"private, max-age={settings.catalog_cache_max_age_seconds}",
+        "Vary": "Authorization",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+class CachedCatalogResponses:
+    """Encoded responses for one catalog endpoint, keyed by its query parameters.
+
+    The parameter combinations given up front are encoded on the first request and kept for
+    the life of the process. ``prebuilt`` may be a callable, so listing them (which can mean
+    loading the catalog) also waits for that request rather than running at import. Anything
+    else, such as a free-text search, is encoded on first use into a bounded LRU.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[..., BaseModel],
+        *,
+        prebuilt: Iterable[CatalogParams] | Callable[[], Iterable[CatalogParams]] = ({},),
+        maxsize: int = 256,
+    ) -> None:
+        self._build = build
+        self._prebuilt_params = prebuilt
+        self._prebuilt: dict[tuple[tuple[str, str | int | None], ...], CachedJSON] | None = None
+        self._prebuilt_lock = Lock()
+        self._on_demand: LRUCache[tuple[tuple[str, str | int | None], ...], CachedJSON] = LRUCache(maxsize=maxsize)
+        observability_tracker.register_cache(name, self._on_demand)
+
+    @staticmethod
+    def _key(params: CatalogParams) -> tuple[tuple[str, str | int | None], ...]:
+        return tuple(sorted((name, value) for name, value in params.items() if value is not None))
+
+    def _prebuilt_responses(self) -> dict[tuple[tuple[str, str | int | None], ...], CachedJSON]:
+        if self._prebuilt is None:
+            with self._prebuilt_lock:
+                if self._prebuilt is None:
+                    params_list = self._prebuilt_params
+                    if callable(params_list):
+                        params_list = params_list()
+                    self._prebuilt = {
+                        self._key(params): encode_cached_json(self._build(**params)) for params in params_list
+                    }
+        return self._prebuilt
+
+    def get(self, **params: str | int | None) -> CachedJSON:
+        key = self._key(params)
+        prebuilt = self._prebuilt_responses().get(key)
+        if prebuilt is not None:
+            return prebuilt
+        return self._on_demand.get_or_build(key, lambda: encode_cached_json(self._build(**params)))
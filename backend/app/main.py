@@ -7,6 +7,7 @@ from app.api.auth import router as auth_router
 from app.api.batches import router as batch_router
 from app.api.equipment import router as equipment_router
 from app.api.health import router as health_router
+from app.api.hops import router as hops_router
 from app.api.imports import router as imports_router
 from app.api.ingredients import router as ingredients_router
 from app.api.inventory import router as inventory_router
@@ -33,6 +34,7 @@ def create_app() -> FastAPI:
     app.include_router(auth_router, prefix=settings.api_prefix)
     app.include_router(recipe_router, prefix=settings.api_prefix)
     app.include_router(styles_router, prefix=settings.api_prefix)
+    app.include_router(hops_router, prefix=settings.api_prefix)
     app.include_router(batch_router, prefix=settings.api_prefix)
     app.include_router(analytics_router, prefix=settings.api_prefix)
     app.include_router(ai_router, prefix=settings.api_prefix)
@@ -3,7 +3,10 @@ from app.models.brew_step import BrewStep
 from app.models.equipment_profile import EquipmentProfile
 from app.models.ingredient_profile import IngredientProfile
 from app.models.inventory import InventoryItem
+from app.models.inventory_reservation import InventoryReservation
+from app.models.inventory_transaction import InventoryTransaction
 from app.models.recipe import Recipe, RecipeIngredient
+from app.models.unit_conversion import UnitConversion
 from app.models.user import User
 from app.models.water_profile import WaterProfile
 
@@ -14,8 +17,11 @@ __all__ = [
     "FermentationReading",
     "IngredientProfile",
     "InventoryItem",
+    "InventoryReservation",
+    "InventoryTransaction",
     "Recipe",
     "RecipeIngredient",
+    "UnitConversion",
     "User",
     "WaterProfile",
 ]
@@ -3,25 +3,57 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Float, ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Boolean, Computed, DateTime, Float, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.core.database import Base
 
 if TYPE_CHECKING:
+    from app.models.inventory_transaction import InventoryTransaction
     from app.models.user import User
 
 
 class InventoryItem(Base):
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        UniqueConstraint("owner_user_id", "name", name="uq_inventory_items_owner_name"),
+        Index("ix_inventory_items_owner_name_normalized", "owner_user_id", "name_normalized"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     owner_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String(120), nullable=False)
+    name_normalized: Mapped[str] = mapped_column(String(120), nullable=False, default="")
     ingredient_type: Mapped[str] = mapped_column(String(30), nullable=False)
     quantity: Mapped[float] = mapped_column(Float, nullable=False)
     unit: Mapped[str] = mapped_column(String(20), nullable=False)
     low_stock_threshold: Mapped[float] = mapped_column(Float, default=0.0)
+    is_low_stock: Mapped[bool] = mapped_column(Boolean, Computed("quantity <= low_stock_threshold", persisted=True))
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     owner: Mapped[User] = relationship(back_populates="inventory_items")
+    # The ledger outlives its item: the database sets inventory_item_id to NULL on delete, so
+    # the ORM never loads or deletes an item's history.
+    transactions: Mapped[list[InventoryTransaction]] = relationship(
+        back_populates="inventory_item",
+        passive_deletes=True,
+        order_by="InventoryTransaction.id",
+    )
+
+    @validates("name")
+    def _sync_name_normalized(self, _: str, value: str) -> str:
+        self.name_normalized = normalize_inventory_name(value)
+        return value
+
+
+# Partial index over low-stock rows only, so alert counts never touch healthy stock.
+Index(
+    "ix_inventory_items_owner_low_stock",
+    InventoryItem.owner_user_id,
+    postgresql_where=InventoryItem.is_low_stock.is_(True),
+    sqlite_where=InventoryItem.is_low_stock.is_(True),
+)
+
+
+def normalize_inventory_name(name: str) -> str:
+    return name.strip().lower()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class InventoryReservation(Base):
+    __tablename__ = "inventory_reservations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    owner_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    batch_id: Mapped[int] = mapped_column(ForeignKey("batches.id", ondelete="CASCADE"), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(120), nullable=False)
+    name_normalized: Mapped[str] = mapped_column(String(120), nullable=False)
+    ingredient_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    unit: Mapped[str] = mapped_column(String(20), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    released_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    release_reason: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+
+# Only active reservations are ever netted against stock, so index just those.
+Index(
+    "ix_inventory_reservations_owner_active",
+    InventoryReservation.owner_user_id,
+    InventoryReservation.name_normalized,
+    postgresql_where=InventoryReservation.released_at.is_(None),
+    sqlite_where=InventoryReservation.released_at.is_(None),
+)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -14,7 +14,6 @@ if TYPE_CHECKING:
 
 class Recipe(Base):
     __tablename__ = "recipes"
-
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     owner_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String(140), nullable=False)
@@ -25,6 +24,9 @@ class Recipe(Base):
     target_srm: Mapped[float] = mapped_column(Float, nullable=False)
     efficiency_pct: Mapped[float] = mapped_column(Float, default=70.0)
     notes: Mapped[str] = mapped_column(Text, default="")
+    # Set when the recipe was imported from an external catalog template.
+    source_provider: Mapped[str | None] = mapped_column(String(60), nullable=True)
+    source_external_id: Mapped[str | None] = mapped_column(String(120), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     owner: Mapped[User] = relationship(back_populates="recipes")
@@ -34,6 +36,20 @@ class Recipe(Base):
     )
 
 
+# One recipe per user and catalog template, so concurrent imports of the same template
+# conflict in the database instead of each inserting a copy. Hand-written recipes have no
+# source and are not constrained.
+Index(
+    "uq_recipes_owner_source",
+    Recipe.owner_user_id,
+    Recipe.source_provider,
+    Recipe.source_external_id,
+    unique=True,
+    postgresql_where=Recipe.source_provider.isnot(None),
+    sqlite_where=Recipe.source_provider.isnot(None),
+)
+
+
 class RecipeIngredient(Base):
     __tablename__ = "recipe_ingredients"
 
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from sqlalchemy import Float, String, event, insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.schema import Table
+
+from app.core.database import Base
+from app.services.units import conversion_rows
+
+
+class UnitConversion(Base):
+    __tablename__ = "unit_conversions"
+
+    alias: Mapped[str] = mapped_column(String(30), primary_key=True)
+    canonical_unit: Mapped[str] = mapped_column(String(20), nullable=False)
+    dimension: Mapped[str] = mapped_column(String(20), nullable=False)
+    factor_to_base: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+@event.listens_for(UnitConversion.__table__, "after_create")
+def _seed_unit_conversions(target: Table, connection: Connection, **_: object) -> None:
+    connection.execute(insert(target), conversion_rows())
@@ -103,6 +103,9 @@ class BatchInventoryRequirementRead(BaseModel):
     enough_stock: bool
     inventory_item_id: int | None
     inventory_unit: str | None
+    reserved_amount: float = 0.0
+    matched_name: str | None = None
+    match_score: float | None = None
 
 
 class BatchInventoryPreviewRead(BaseModel):
@@ -131,9 +134,57 @@ class BatchInventoryConsumeRead(BaseModel):
     detail: str
 
 
+class BatchInventoryBulkConsumeRequest(BaseModel):
+    batch_ids: list[int] = Field(min_length=1, max_length=50)
+
+
+class BatchInventoryBulkConsumeRead(BaseModel):
+    consumed: bool
+    consumed_at: datetime | None
+    batch_count: int
+    failed_batch_id: int | None = None
+    results: list[BatchInventoryConsumeRead] = Field(default_factory=list)
+    detail: str
+
+
+class InventoryProjectionShortageRead(BaseModel):
+    name: str
+    ingredient_type: str
+    unit: str
+    required_amount: float
+    available_amount: float
+    shortage_amount: float
+
+
+class InventoryProjectionBatchRead(BaseModel):
+    batch_id: int
+    batch_name: str
+    brewed_on: date
+    can_brew: bool
+    shortages: list[InventoryProjectionShortageRead] = Field(default_factory=list)
+
+
+class InventoryProjectionIngredientRead(BaseModel):
+    name: str
+    unit: str
+    first_short_on: date
+    first_short_batch_id: int
+    total_shortage_amount: float
+
+
+class InventoryProjectionRead(BaseModel):
+    generated_at: datetime
+    batch_count: int
+    short_batch_count: int
+    batches: list[InventoryProjectionBatchRead] = Field(default_factory=list)
+    ingredients: list[InventoryProjectionIngredientRead] = Field(default_factory=list)
+
+
 class BrewPlanRequest(BaseModel):
     equipment_profile_id: int | None = Field(default=None, gt=0)
     water_profile_id: int | None = Field(default=None, gt=0)
+    water_mode: Literal["greedy", "optimize"] = "greedy"
+    water_include_ro_blends: bool = False
     style_code: str | None = Field(default=None, min_length=1, max_length=20)
     available_hop_names: list[str] = Field(default_factory=list, max_length=50)
     brew_start_at: datetime | None = None
@@ -229,15 +280,26 @@ class BrewPlanMineralAdditionRead(BaseModel):
     reason: str
 
 
+class BrewPlanWaterBlendOptionRead(BaseModel):
+    ro_dilution_fraction: float
+    projected_profile: BrewPlanWaterIonRead
+    additions: list[BrewPlanMineralAdditionRead] = Field(default_factory=list)
+    distance_to_range: float
+    salt_grams_per_liter: float
+
+
 class BrewPlanWaterRead(BaseModel):
     water_profile_id: int
     water_profile_name: str
     style_code: str
     style_name: str
+    mode: str = "greedy"
+    ro_dilution_fraction: float = 0.0
     source_profile: BrewPlanWaterIonRead
     target_profile: BrewPlanWaterIonRead
     projected_profile: BrewPlanWaterIonRead
     additions: list[BrewPlanMineralAdditionRead] = Field(default_factory=list)
+    ro_blend_options: list[BrewPlanWaterBlendOptionRead] = Field(default_factory=list)
     notes: list[str] = Field(default_factory=list)
 
 
@@ -285,6 +347,47 @@ class BrewPlanLocalizedRead(BrewPlanRead):
     display: BrewPlanDisplayRead
 
 
+class BrewPlanSweepRange(BaseModel):
+    start: float = Field(gt=0, allow_inf_nan=False)
+    stop: float = Field(gt=0, allow_inf_nan=False)
+    # Values are rounded to 4 decimals, so a finer step would only produce duplicates.
+    step: float = Field(ge=0.0001, allow_inf_nan=False)
+
+
+class BrewPlanSweepRequest(BaseModel):
+    equipment_profile_ids: list[int] = Field(default_factory=list, max_length=10)
+    efficiency_pct: list[float] | BrewPlanSweepRange = Field(default_factory=list)
+    batch_volume_liters: list[float] | BrewPlanSweepRange = Field(default_factory=list)
+
+
+class BrewPlanSweepRowRead(BaseModel):
+    equipment_profile_id: int | None
+    equipment_name: str | None
+    target_efficiency_pct: float
+    batch_volume_liters: float
+    grain_bill_kg: float
+    estimated_og: float
+    estimated_fg: float
+    estimated_abv: float
+    fermentable_inventory_coverage_pct: float
+    mash_water_liters: float
+    sparge_water_liters: float
+    total_water_liters: float
+    pre_boil_volume_liters: float
+    total_brew_minutes: int
+    mash_water_capped: bool
+    exceeds_boil_kettle: bool
+
+
+class BrewPlanSweepRead(BaseModel):
+    batch_id: int
+    batch_name: str
+    generated_at: datetime
+    source_efficiency_pct: float
+    row_count: int
+    rows: list[BrewPlanSweepRowRead] = Field(default_factory=list)
+
+
 class BrewPlanApplyTimelineRequest(BrewPlanRequest):
     replace_existing_pending_steps: bool = True
     include_shopping_step: bool = True
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+from app.schemas.recipe import HopProfileRead, HopSubstitutionCandidateRead
+
+
+class HopSimilarityRead(BaseModel):
+    hop: HopProfileRead
+    match_confidence: float
+    k: int
+    catalog_size: int
+    similar: list[HopSubstitutionCandidateRead] = Field(default_factory=list)
@@ -35,9 +35,45 @@ class ExternalRecipeCatalogItemRead(BaseModel):
 
 class ExternalRecipeCatalogResponse(BaseModel):
     count: int
+    total: int
+    limit: int
+    offset: int = 0
     items: list[ExternalRecipeCatalogItemRead] = Field(default_factory=list)
 
 
+class RecipeBulkImportRequest(BaseModel):
+    items: list[ExternalImportRequest] = Field(min_length=1, max_length=500)
+
+
+class RecipeBulkImportRead(BaseModel):
+    requested: int
+    imported_count: int
+    skipped_count: int
+    not_found_count: int
+    # Keyed by "provider:external_id".
+    imported: dict[str, int] = Field(default_factory=dict)
+    skipped: dict[str, int] = Field(default_factory=dict)
+    not_found: list[str] = Field(default_factory=list)
+
+
+class RecipeFileRecordErrorRead(BaseModel):
+    record: int
+    name: str | None = None
+    error: str
+
+
+class RecipeFileImportRead(BaseModel):
+    format: str
+    bytes_read: int
+    records_parsed: int
+    imported_count: int
+    batches_committed: int
+    error_count: int
+    # The first 200 new recipe ids, in file order.
+    recipe_ids: list[int] = Field(default_factory=list)
+    errors: list[RecipeFileRecordErrorRead] = Field(default_factory=list)
+
+
 class RecipeImportResultRead(BaseModel):
     provider: str
     external_id: str
@@ -60,6 +96,9 @@ class ExternalEquipmentCatalogItemRead(BaseModel):
 
 class ExternalEquipmentCatalogResponse(BaseModel):
     count: int
+    total: int
+    limit: int
+    offset: int = 0
     items: list[ExternalEquipmentCatalogItemRead] = Field(default_factory=list)
 
 
@@ -98,6 +137,9 @@ class ExternalIngredientCatalogItemRead(BaseModel):
 
 class ExternalIngredientCatalogResponse(BaseModel):
     count: int
+    total: int
+    limit: int
+    offset: int = 0
     items: list[ExternalIngredientCatalogItemRead] = Field(default_factory=list)
 
 
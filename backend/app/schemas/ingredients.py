@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -26,3 +27,18 @@ class IngredientProfileRead(IngredientProfileBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class IngredientMatchRead(BaseModel):
+    source: Literal["inventory", "profile"]
+    id: int
+    name: str
+    ingredient_type: str
+    unit: str
+    score: float
+
+
+class IngredientMatchResponse(BaseModel):
+    query: str
+    count: int
+    matches: list[IngredientMatchRead] = Field(default_factory=list)
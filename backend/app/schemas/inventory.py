@@ -34,3 +34,52 @@ class InventoryItemRead(InventoryItemBase):
 class LowStockAlertResponse(BaseModel):
     count: int
     items: list[InventoryItemRead]
+
+
+class LowStockCountRead(BaseModel):
+    count: int
+
+
+class InventoryTransactionRead(BaseModel):
+    id: int
+    inventory_item_id: int | None
+    kind: str
+    quantity_delta: float
+    balance_after: float
+    batch_id: int | None
+    note: str | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryRestockRequest(BaseModel):
+    quantity: float = Field(gt=0)
+    note: str | None = Field(default=None, max_length=255)
+
+
+class InventoryAdjustRequest(BaseModel):
+    quantity_delta: float
+    note: str | None = Field(default=None, max_length=255)
+
+
+class InventoryBalanceRead(BaseModel):
+    inventory_item_id: int
+    unit: str
+    at: datetime
+    quantity: float
+    transaction_id: int | None
+
+
+class InventoryBulkRowErrorRead(BaseModel):
+    row: int
+    name: str | None = None
+    errors: list[str] = Field(default_factory=list)
+
+
+class InventoryBulkImportRead(BaseModel):
+    received: int
+    created: int
+    updated: int
+    error_count: int
+    errors: list[InventoryBulkRowErrorRead] = Field(default_factory=list)
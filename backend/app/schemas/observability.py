@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RouteMetricsRead(BaseModel):
@@ -14,6 +14,15 @@ class RouteMetricsRead(BaseModel):
     server_errors: int
 
 
+class CacheMetricsRead(BaseModel):
+    name: str
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    hit_rate: float
+
+
 class ObservabilityMetricsResponse(BaseModel):
     generated_at: datetime
     uptime_seconds: int
@@ -21,3 +30,4 @@ class ObservabilityMetricsResponse(BaseModel):
     total_client_errors: int
     total_server_errors: int
     routes: list[RouteMetricsRead]
+    caches: list[CacheMetricsRead] = Field(default_factory=list)
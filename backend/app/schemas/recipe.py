@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -39,6 +40,8 @@ class RecipeCreate(RecipeBase):
 
 class RecipeRead(RecipeBase):
     id: int
+    source_provider: str | None = None
+    source_external_id: str | None = None
     created_at: datetime
     ingredients: list[RecipeIngredientRead] = Field(default_factory=list)
 
@@ -83,7 +86,18 @@ class RecipeHopSubstitutionRequest(BaseModel):
     target_hop_name: str = Field(min_length=1, max_length=120)
     available_hop_names: list[str] = Field(default_factory=list, max_length=50)
     include_inventory_hops: bool = True
+    candidate_scope: Literal["available", "any"] = "available"
     top_k: int = Field(default=5, ge=1, le=10)
+    blend_max_hops: int = Field(default=1, ge=1, le=3)
+
+
+class RecipeHopSubstitutionBatchRequest(BaseModel):
+    target_hop_names: list[str] = Field(default_factory=list, max_length=20)
+    available_hop_names: list[str] = Field(default_factory=list, max_length=50)
+    include_inventory_hops: bool = True
+    candidate_scope: Literal["available", "any"] = "available"
+    top_k: int = Field(default=5, ge=1, le=10)
+    blend_max_hops: int = Field(default=1, ge=1, le=3)
 
 
 class HopProfileRead(BaseModel):
@@ -104,13 +118,57 @@ class HopSubstitutionCandidateRead(BaseModel):
     shared_descriptors: list[str] = Field(default_factory=list)
 
 
+class HopBlendComponentRead(BaseModel):
+    name: str
+    proportion: float
+
+
+class HopBlendCandidateRead(BaseModel):
+    components: list[HopBlendComponentRead] = Field(default_factory=list)
+    blend_alpha_acid_pct: float
+    flavor_similarity_score: float
+    descriptor_overlap_score: float
+    similarity_score: float
+    recommended_bittering_ratio: float
+    shared_descriptors: list[str] = Field(default_factory=list)
+
+
+class HopNameResolutionRead(BaseModel):
+    input_name: str
+    resolved_name: str
+    confidence: float
+
+
 class RecipeHopSubstitutionRead(BaseModel):
     recipe_id: int
     recipe_name: str
     target_hop_name: str
     target_hop_profile: HopProfileRead
+    target_match_confidence: float = 1.0
     candidate_source: str
     candidate_input_count: int
     recognized_candidate_count: int
     unresolved_hop_names: list[str] = Field(default_factory=list)
+    resolved_hop_names: list[HopNameResolutionRead] = Field(default_factory=list)
+    substitutions: list[HopSubstitutionCandidateRead] = Field(default_factory=list)
+    blends: list[HopBlendCandidateRead] = Field(default_factory=list)
+
+
+class RecipeHopSubstitutionTargetRead(BaseModel):
+    target_hop_name: str
+    target_hop_profile: HopProfileRead
+    target_match_confidence: float = 1.0
     substitutions: list[HopSubstitutionCandidateRead] = Field(default_factory=list)
+    blends: list[HopBlendCandidateRead] = Field(default_factory=list)
+
+
+class RecipeHopSubstitutionBatchRead(BaseModel):
+    recipe_id: int
+    recipe_name: str
+    candidate_source: str
+    candidate_input_count: int
+    recognized_candidate_count: int
+    unresolved_hop_names: list[str] = Field(default_factory=list)
+    resolved_hop_names: list[HopNameResolutionRead] = Field(default_factory=list)
+    unresolved_target_names: list[str] = Field(default_factory=list)
+    targets: list[RecipeHopSubstitutionTargetRead] = Field(default_factory=list)
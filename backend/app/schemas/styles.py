@@ -24,3 +24,16 @@ class BJCPStyleRead(BaseModel):
 class BJCPStyleListResponse(BaseModel):
     count: int
     items: list[BJCPStyleRead] = Field(default_factory=list)
+
+
+class BJCPStyleSuggestionRead(BaseModel):
+    code: str
+    name: str
+    category: str
+    score: float
+
+
+class BJCPStyleSuggestResponse(BaseModel):
+    query: str
+    count: int
+    items: list[BJCPStyleSuggestionRead] = Field(default_factory=list)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -34,6 +35,10 @@ class WaterRecommendationRequest(BaseModel):
     style_code: str | None = Field(default=None, min_length=1, max_length=20)
     recipe_id: int | None = Field(default=None, gt=0)
     batch_volume_liters: float = Field(default=20.0, gt=0, le=300)
+    mode: Literal["greedy", "optimize"] = "greedy"
+    allow_acid: bool = False
+    allow_dilution: bool = False
+    include_ro_blends: bool = False
 
 
 class MineralAdditionRead(BaseModel):
@@ -52,14 +57,42 @@ class WaterIonSnapshotRead(BaseModel):
     bicarbonate_ppm: float
 
 
+class WaterBlendOptionRead(BaseModel):
+    ro_dilution_fraction: float
+    projected_profile: WaterIonSnapshotRead
+    additions: list[MineralAdditionRead] = Field(default_factory=list)
+    distance_to_range: float
+    salt_grams_per_liter: float
+
+
 class WaterRecommendationRead(BaseModel):
     water_profile_id: int
     water_profile_name: str
     style_code: str
     style_name: str
     batch_volume_liters: float
+    mode: str = "greedy"
+    ro_dilution_fraction: float = 0.0
     source_profile: WaterIonSnapshotRead
     target_profile: WaterIonSnapshotRead
     projected_profile: WaterIonSnapshotRead
     additions: list[MineralAdditionRead] = Field(default_factory=list)
+    ro_blend_options: list[WaterBlendOptionRead] = Field(default_factory=list)
     notes: list[str] = Field(default_factory=list)
+
+
+class StyleWaterCompatibilityRead(BaseModel):
+    style_code: str
+    style_name: str
+    distance_to_range: float
+    ions_out_of_range: list[str] = Field(default_factory=list)
+    projected_distance_to_range: float
+    additions: list[MineralAdditionRead] = Field(default_factory=list)
+
+
+class WaterStyleCompatibilityRead(BaseModel):
+    water_profile_id: int
+    water_profile_name: str
+    batch_volume_liters: float
+    count: int
+    items: list[StyleWaterCompatibilityRead] = Field(default_factory=list)
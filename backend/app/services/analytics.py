@@ -1,98 +1,116 @@
-from sqlalchemy import desc, func
+from sqlalchemy import Float, Integer, Numeric, and_, case, cast, desc, func, select, true
 from sqlalchemy.orm import Session
 
 from app.models.batch import Batch
 from app.models.recipe import Recipe
 from app.schemas.analytics import AnalyticsOverviewRead, RecentBatchInsight, StyleBatchCount
-from app.services.recipe_calculator import attenuation_pct, estimate_abv
+from app.services.recipe_calculator import estimate_abv
 
+_FINISHED_STATUSES = ("completed", "packaged")
 
-def _avg(values: list[float]) -> float | None:
-    if not values:
-        return None
-    return round(sum(values) / len(values), 2)
 
+def _average(total: float, count: int) -> float | None:
+    if not count:
+        return None
+    return round(total / count, 2)
 
-def build_overview(db: Session, user_id: int) -> AnalyticsOverviewRead:
-    total_recipes = db.query(func.count(Recipe.id)).filter(Recipe.owner_user_id == user_id).scalar() or 0
 
-    total_batches = db.query(func.count(Batch.id)).filter(Batch.owner_user_id == user_id).scalar() or 0
+def _overview_statement(user_id: int):
+    """Recipe count plus per-style batch counts and gravity sums, from one pass over the user's batches.
 
-    completed_batches = (
-        db.query(func.count(Batch.id))
-        .filter(
-            Batch.owner_user_id == user_id,
-            Batch.status.in_(("completed", "packaged")),
-        )
-        .scalar()
-        or 0
+    Batches are first aggregated per recipe in a CTE, so the join to recipes touches each recipe
+    once. ABV and attenuation mirror `estimate_abv` and `attenuation_pct`, including the
+    per-batch rounding to two places, and only batches whose OG is above both FG and 1.0 count.
+    The recipe count is the left side of an outer join so a user without batches still gets a row.
+    Count sums are cast back to INTEGER: Postgres returns SUM(bigint) as NUMERIC, which the
+    driver would hand back as Decimal.
+    """
+    measured_og, measured_fg = Batch.measured_og, Batch.measured_fg
+    has_gravity = and_(
+        measured_og.isnot(None),
+        measured_fg.isnot(None),
+        measured_og > measured_fg,
+        measured_og > 1.0,
     )
+    abv = func.round(cast((measured_og - measured_fg) * 131.25, Numeric), 2)
+    attenuation = func.round(cast((measured_og - measured_fg) / (measured_og - 1.0) * 100, Numeric), 2)
 
-    gravity_rows = (
-        db.query(Batch.measured_og, Batch.measured_fg)
-        .filter(
-            Batch.owner_user_id == user_id,
-            Batch.measured_og.isnot(None),
-            Batch.measured_fg.isnot(None),
+    per_recipe = (
+        select(
+            Batch.recipe_id,
+            func.count(Batch.id).label("batch_count"),
+            func.count(case((Batch.status.in_(_FINISHED_STATUSES), Batch.id))).label("completed_count"),
+            func.count(case((has_gravity, Batch.id))).label("gravity_count"),
+            func.sum(case((has_gravity, abv))).label("abv_sum"),
+            func.sum(case((has_gravity, attenuation))).label("attenuation_sum"),
         )
-        .all()
+        .where(Batch.owner_user_id == user_id)
+        .group_by(Batch.recipe_id)
+        .cte("per_recipe")
     )
-
-    abv_values: list[float] = []
-    attenuation_values: list[float] = []
-    for measured_og, measured_fg in gravity_rows:
-        if measured_og is None or measured_fg is None:
-            continue
-        if measured_og <= measured_fg or measured_og <= 1.0:
-            continue
-
-        abv_values.append(estimate_abv(measured_og, measured_fg))
-        attenuation_values.append(attenuation_pct(measured_og, measured_fg))
-
-    style_rows = (
-        db.query(
+    per_style = (
+        select(
             Recipe.style,
-            func.count(Batch.id).label("batch_count"),
+            cast(func.sum(per_recipe.c.batch_count), Integer).label("batch_count"),
+            cast(func.sum(per_recipe.c.completed_count), Integer).label("completed_count"),
+            cast(func.sum(per_recipe.c.gravity_count), Integer).label("gravity_count"),
+            func.sum(per_recipe.c.abv_sum, type_=Float).label("abv_sum"),
+            func.sum(per_recipe.c.attenuation_sum, type_=Float).label("attenuation_sum"),
         )
-        .join(Batch, Batch.recipe_id == Recipe.id)
-        .filter(Batch.owner_user_id == user_id)
+        .select_from(per_recipe)
+        .join(Recipe, Recipe.id == per_recipe.c.recipe_id)
         .group_by(Recipe.style)
-        .order_by(desc("batch_count"), Recipe.style.asc())
-        .all()
+        .subquery("per_style")
     )
+    recipe_total = (
+        select(func.count(Recipe.id).label("total_recipes")).where(Recipe.owner_user_id == user_id).subquery("recipe_total")
+    )
+
+    return (
+        select(recipe_total.c.total_recipes, *per_style.c)
+        .select_from(recipe_total)
+        .outerjoin(per_style, true())
+        .order_by(desc(per_style.c.batch_count), per_style.c.style.asc())
+    )
+
+
+def build_overview(db: Session, user_id: int) -> AnalyticsOverviewRead:
+    overview_rows = db.execute(_overview_statement(user_id)).all()
+    style_rows = [row for row in overview_rows if row.batch_count is not None]
+    gravity_count = sum(row.gravity_count for row in style_rows)
+
     style_breakdown = [
-        StyleBatchCount(style=style or "Unknown", batch_count=batch_count)
-        for style, batch_count in style_rows
+        StyleBatchCount(style=row.style or "Unknown", batch_count=row.batch_count)
+        for row in style_rows
     ]
 
-    recent_batch_rows = (
-        db.query(Batch)
-        .filter(Batch.owner_user_id == user_id)
+    recent_batch_rows = db.execute(
+        select(Batch.id, Batch.name, Batch.status, Batch.brewed_on, Batch.measured_og, Batch.measured_fg)
+        .where(Batch.owner_user_id == user_id)
         .order_by(Batch.brewed_on.desc(), Batch.id.desc())
         .limit(5)
-        .all()
-    )
+    ).all()
     recent_batches = [
         RecentBatchInsight(
-            id=batch.id,
-            name=batch.name,
-            status=batch.status,
-            brewed_on=batch.brewed_on,
+            id=row.id,
+            name=row.name,
+            status=row.status,
+            brewed_on=row.brewed_on,
             abv=(
-                estimate_abv(batch.measured_og, batch.measured_fg)
-                if batch.measured_og is not None and batch.measured_fg is not None and batch.measured_og > batch.measured_fg
+                estimate_abv(row.measured_og, row.measured_fg)
+                if row.measured_og is not None and row.measured_fg is not None and row.measured_og > row.measured_fg
                 else None
             ),
         )
-        for batch in recent_batch_rows
+        for row in recent_batch_rows
     ]
 
     return AnalyticsOverviewRead(
-        total_recipes=total_recipes,
-        total_batches=total_batches,
-        completed_batches=completed_batches,
-        average_abv=_avg(abv_values),
-        average_attenuation_pct=_avg(attenuation_values),
+        total_recipes=overview_rows[0].total_recipes,
+        total_batches=sum(row.batch_count for row in style_rows),
+        completed_batches=sum(row.completed_count for row in style_rows),
+        average_abv=_average(sum(row.abv_sum or 0.0 for row in style_rows), gravity_count),
+        average_attenuation_pct=_average(sum(row.attenuation_sum or 0.0 for row in style_rows), gravity_count),
         style_breakdown=style_breakdown,
         recent_batches=recent_batches,
     )
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import heapq
+import re
+from dataclasses import dataclass, field
 
 
 @dataclass(frozen=True)
@@ -135,20 +137,141 @@ _BJCP_STYLES: tuple[BJCPStyleProfile, ...] = (
     ),
 )
 
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+# A code hit outranks a name hit, which outranks a category hit.
+_FIELD_WEIGHTS = (("code", 3.0), ("name", 2.0), ("category", 1.0))
+_PREFIX_MATCH_FACTOR = 0.8
+_TYPO_MATCH_FACTOR = 0.6
+_MIN_TYPO_TOKEN_LENGTH = 4
+
+
+@dataclass(frozen=True)
+class BJCPStyleMatch:
+    style: BJCPStyleProfile
+    score: float
+
+
+@dataclass
+class _TrieNode:
+    children: dict[str, _TrieNode] = field(default_factory=dict)
+    # Every indexed token that starts with this node's prefix, in sorted order.
+    tokens: list[str] = field(default_factory=list)
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _typo_budget(token: str) -> int:
+    if len(token) < _MIN_TYPO_TOKEN_LENGTH:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def _edit_distance(left: str, right: str) -> int:
+    previous = list(range(len(right) + 1))
+    for row, left_char in enumerate(left, start=1):
+        current = [row]
+        for column, right_char in enumerate(right, start=1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + (left_char != right_char)))
+        previous = current
+    return previous[-1]
+
+
+class _StyleSearchIndex:
+    """Inverted index and prefix trie over the code, name and category tokens of every style.
+
+    Built once at import over the code-sorted styles, so positions double as display order
+    and filtered listings never need sorting.
+    """
+
+    def __init__(self, styles: tuple[BJCPStyleProfile, ...]) -> None:
+        self.styles = tuple(sorted(styles, key=lambda style: style.code))
+        postings: dict[str, dict[int, float]] = {}
+        for position, style in enumerate(self.styles):
+            for field_name, weight in _FIELD_WEIGHTS:
+                for token in _tokenize(getattr(style, field_name)):
+                    weights = postings.setdefault(token, {})
+                    weights[position] = max(weights.get(position, 0.0), weight)
+        self._postings = postings
+        self._trie = _TrieNode()
+        for token in sorted(postings):
+            node = self._trie
+            node.tokens.append(token)
+            for char in token:
+                node = node.children.setdefault(char, _TrieNode())
+                node.tokens.append(token)
+
+    def _completions(self, prefix: str) -> list[str]:
+        node = self._trie
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                return []
+            node = child
+        return node.tokens
+
+    def _token_scores(self, token: str) -> dict[int, float]:
+        """Per-style score for one query token: exact hits, then prefix completions, then typos."""
+        scores: dict[int, float] = {}
+
+        def merge(indexed_token: str, factor: float) -> None:
+            for position, weight in self._postings[indexed_token].items():
+                scores[position] = max(scores.get(position, 0.0), weight * factor)
+
+        for completion in self._completions(token):
+            merge(completion, 1.0 if completion == token else _PREFIX_MATCH_FACTOR)
+        budget = _typo_budget(token)
+        if not scores and budget:
+            for indexed_token in self._postings:
+                if abs(len(indexed_token) - len(token)) <= budget and _edit_distance(token, indexed_token) <= budget:
+                    merge(indexed_token, _TYPO_MATCH_FACTOR)
+        return scores
+
+    def _matches(self, query: str) -> dict[int, float] | None:
+        """Summed scores of the styles that match every query token; None for an empty query."""
+        tokens = _tokenize(query)
+        if not tokens:
+            return None
+        matched: dict[int, float] | None = None
+        for token in tokens:
+            scores = self._token_scores(token)
+            if matched is None:
+                matched = scores
+            else:
+                matched = {position: score + scores[position] for position, score in matched.items() if position in scores}
+            if not matched:
+                return {}
+        return matched
+
+    def filter(self, query: str) -> list[BJCPStyleProfile]:
+        matched = self._matches(query)
+        if matched is None:
+            return list(self.styles)
+        return [style for position, style in enumerate(self.styles) if position in matched]
+
+    def search(self, query: str, *, limit: int) -> list[BJCPStyleMatch]:
+        matched = self._matches(query) or {}
+        best = heapq.nsmallest(limit, matched.items(), key=lambda item: (-item[1], item[0]))
+        return [BJCPStyleMatch(style=self.styles[position], score=round(score, 3)) for position, score in best]
+
+
+_STYLE_INDEX = _StyleSearchIndex(_BJCP_STYLES)
 _BY_CODE = {style.code.upper(): style for style in _BJCP_STYLES}
 _BY_NAME = {style.name.lower(): style for style in _BJCP_STYLES}
+_BY_NAME_KEY = {" ".join(_tokenize(style.name)): style for style in _BJCP_STYLES}
 
 
 def list_bjcp_styles(search: str | None = None) -> list[BJCPStyleProfile]:
+    """Styles in code order, optionally narrowed to those matching every search token."""
     if not search:
-        return sorted(_BJCP_STYLES, key=lambda style: style.code)
+        return list(_STYLE_INDEX.styles)
+    return _STYLE_INDEX.filter(search)
+
 
-    query = search.strip().lower()
-    return [
-        style
-        for style in sorted(_BJCP_STYLES, key=lambda row: row.code)
-        if query in style.code.lower() or query in style.name.lower() or query in style.category.lower()
-    ]
+def search_bjcp_styles(query: str, *, limit: int = 10) -> list[BJCPStyleMatch]:
+    """Rank styles for a partial or misspelt query; the last word may be an unfinished prefix."""
+    return _STYLE_INDEX.search(query, limit=limit)
 
 
 def resolve_bjcp_style(identifier: str) -> BJCPStyleProfile | None:
@@ -156,8 +279,17 @@ def resolve_bjcp_style(identifier: str) -> BJCPStyleProfile | None:
     if not token:
         return None
 
-    direct = _BY_CODE.get(token.upper())
+    direct = _BY_CODE.get(token.upper()) or _BY_NAME.get(token.lower())
     if direct:
         return direct
 
-    return _BY_NAME.get(token.lower())
+    # Tolerate "21-A", "american_ipa" and a small typo in a full style name.
+    key = " ".join(_tokenize(token))
+    normalized = _BY_CODE.get(key.replace(" ", "").upper()) or _BY_NAME_KEY.get(key)
+    if normalized or not _typo_budget(key):
+        return normalized
+    distances = sorted((_edit_distance(key, name_key), name_key) for name_key in _BY_NAME_KEY)
+    closest_distance, closest_key = distances[0]
+    if closest_distance > _typo_budget(key) or (len(distances) > 1 and distances[1][0] == closest_distance):
+        return None
+    return _BY_NAME_KEY[closest_key]
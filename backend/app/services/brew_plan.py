@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import math
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -14,33 +16,26 @@ from app.schemas.batch import (
     BrewPlanHopSubstitutionRead,
     BrewPlanShoppingItemRead,
     BrewPlanStepRead,
+    BrewPlanSweepRowRead,
     BrewPlanVolumeRead,
 )
-from app.services.hop_substitution import recommend_hop_substitutions
+from app.services.hop_substitution import (
+    HopCandidatePool,
+    build_hop_candidate_pool,
+    merge_hop_candidate_pools,
+    recommend_hop_substitutions,
+)
 from app.services.preferences import t
 from app.services.recipe_calculator import estimate_abv
+from app.services.units import convert_many
 
 _FERMENTABLE_TYPES = {"grain", "extract", "sugar"}
 _HOP_TYPES = {"hop"}
 
-_MASS_TO_KG = {
-    "kg": 1.0,
-    "g": 0.001,
-    "lb": 0.453592,
-    "oz": 0.0283495,
-}
-
-_UNIT_ALIASES = {
-    "gram": "g",
-    "grams": "g",
-    "kilogram": "kg",
-    "kilograms": "kg",
-    "pound": "lb",
-    "pounds": "lb",
-    "ounce": "oz",
-    "ounces": "oz",
-}
-
+# Fixed timer step durations, shared by the timer plan and the sweep's total-time estimate.
+_MASH_IN_MINUTES = 10
+_CHILL_MINUTES = 20
+_TRANSFER_PITCH_MINUTES = 15
 
 @dataclass(frozen=True)
 class BrewPlanResult:
@@ -53,13 +48,24 @@ class BrewPlanResult:
     notes: list[str]
 
 
+@dataclass(frozen=True)
+class _BrewVolumes:
+    mash_water_liters: float
+    sparge_water_liters: float
+    total_water_liters: float
+    pre_boil_volume_liters: float
+    estimated_boil_off_liters: float
+    mash_water_capped: bool
+    exceeds_boil_kettle: bool
+
+
 def build_brew_day_plan(
     *,
     batch: Batch,
     inventory_preview: BatchInventoryPreviewRead,
     equipment: EquipmentProfile | None,
     snapshot_ingredients: list[dict[str, object]],
-    inventory_hop_names: list[str],
+    inventory_hop_pool: HopCandidatePool,
     extra_available_hops: list[str],
     brew_start_at: datetime | None,
     language: str,
@@ -84,26 +90,22 @@ def build_brew_day_plan(
 
     mash_temp_c = _choose_mash_temp(style_token=style_token)
     mash_rest_minutes = _choose_mash_rest_minutes(style_token=style_token, source_og=source_og)
-    mash_ratio_l_per_kg = 2.8 if source_og >= 1.070 else 2.7
-    mash_water_liters = round(grain_bill_kg * mash_ratio_l_per_kg, 2)
-
-    if equipment and equipment.mash_tun_volume_liters:
-        max_mash_water = round(equipment.mash_tun_volume_liters * 0.9, 2)
-        if mash_water_liters > max_mash_water and max_mash_water > 0:
-            notes.append(t("mash_water_limit", language))
-            mash_water_liters = max_mash_water
-
-    grain_absorption_liters = round(grain_bill_kg * 0.8, 2)
-    first_runnings_liters = max(mash_water_liters - grain_absorption_liters, 0.0)
+    mash_ratio_l_per_kg = _choose_mash_ratio(source_og=source_og)
     boil_minutes = 75 if "lager" in style_token else 60
-    boil_off_rate_l_per_hour = equipment.boil_off_rate_l_per_hour if equipment and equipment.boil_off_rate_l_per_hour else 3.0
-    trub_loss_liters = equipment.trub_loss_liters if equipment and equipment.trub_loss_liters else 1.0
-    estimated_boil_off_liters = round(boil_off_rate_l_per_hour * (boil_minutes / 60.0), 2)
-    pre_boil_volume_liters = round(batch.volume_liters + trub_loss_liters + estimated_boil_off_liters, 2)
-    sparge_water_liters = round(max(pre_boil_volume_liters - first_runnings_liters, 0.0), 2)
-    total_water_liters = round(mash_water_liters + sparge_water_liters, 2)
+    brew_volumes = _estimate_volumes(
+        grain_bill_kg=grain_bill_kg,
+        mash_ratio_l_per_kg=mash_ratio_l_per_kg,
+        boil_minutes=boil_minutes,
+        batch_volume_liters=batch.volume_liters,
+        equipment=equipment,
+    )
+    mash_water_liters = brew_volumes.mash_water_liters
+    sparge_water_liters = brew_volumes.sparge_water_liters
+    pre_boil_volume_liters = brew_volumes.pre_boil_volume_liters
 
-    if equipment and equipment.boil_kettle_volume_liters and pre_boil_volume_liters > equipment.boil_kettle_volume_liters:
+    if brew_volumes.mash_water_capped:
+        notes.append(t("mash_water_limit", language))
+    if brew_volumes.exceeds_boil_kettle:
         notes.append(t("boil_kettle_limit", language))
 
     strike_temp_c = _estimate_strike_temp(mash_temp_c=mash_temp_c, mash_ratio_l_per_kg=mash_ratio_l_per_kg)
@@ -121,10 +123,14 @@ def build_brew_day_plan(
         language=language,
     )
 
-    available_hops = [name for name in [*extra_available_hops, *inventory_hop_names] if name.strip()]
+    # Resolved once here and shared by every missing hop, instead of once per substitution query.
+    available_hops = merge_hop_candidate_pools(
+        build_hop_candidate_pool([name for name in extra_available_hops if name.strip()]),
+        inventory_hop_pool,
+    )
     shopping_list, substitutions = _build_shopping_and_substitutions(
         requirements=inventory_preview.requirements,
-        available_hop_names=available_hops,
+        available_hops=available_hops,
     )
 
     if not shopping_list:
@@ -136,10 +142,10 @@ def build_brew_day_plan(
         grain_bill_kg=round(grain_bill_kg, 3),
         mash_water_liters=mash_water_liters,
         sparge_water_liters=sparge_water_liters,
-        total_water_liters=total_water_liters,
+        total_water_liters=brew_volumes.total_water_liters,
         pre_boil_volume_liters=pre_boil_volume_liters,
         post_boil_volume_liters=round(batch.volume_liters, 2),
-        estimated_boil_off_liters=estimated_boil_off_liters,
+        estimated_boil_off_liters=brew_volumes.estimated_boil_off_liters,
         mash_target_temp_c=round(mash_temp_c, 1),
         strike_water_temp_c=round(strike_temp_c, 1),
         mash_rest_minutes=mash_rest_minutes,
@@ -168,6 +174,111 @@ def build_brew_day_plan(
     )
 
 
+def sweep_range_size(*, start: float, stop: float, step: float) -> int:
+    """Number of values `expand_sweep_range` yields, computed without expanding; 0 when stop < start."""
+    if stop < start:
+        return 0
+    steps = (stop - start) / step
+    if not math.isfinite(steps):
+        # The span overflows a float at this step, which is more values than any caller allows.
+        return sys.maxsize
+    return math.floor(steps + 1e-9) + 1
+
+
+def expand_sweep_range(*, start: float, stop: float, step: float) -> list[float]:
+    return [round(start + index * step, 4) for index in range(sweep_range_size(start=start, stop=stop, step=step))]
+
+
+def build_brew_plan_sweep(
+    *,
+    batch: Batch,
+    inventory_preview: BatchInventoryPreviewRead,
+    snapshot_ingredients: list[dict[str, object]],
+    equipment_options: list[EquipmentProfile | None],
+    efficiency_pct_values: list[float],
+    batch_volume_values: list[float],
+) -> list[BrewPlanSweepRowRead]:
+    """Evaluate the brew-day volume, gravity and timer math over an equipment x efficiency x volume grid.
+
+    Batch-level inputs are derived once and each axis only recomputes the terms that depend on it,
+    so a grid cell costs a handful of arithmetic operations instead of a full plan build.
+    Volumes other than the batch volume scale the grain bill and fermentable requirements linearly.
+    """
+    style_token = (batch.recipe_style_snapshot or "").lower()
+    source_og = float(batch.recipe_target_og_snapshot or 1.050)
+    source_fg = float(batch.recipe_target_fg_snapshot or 1.012)
+    source_efficiency_pct = float(batch.recipe_efficiency_pct_snapshot or 70.0)
+    grain_bill_kg = _sum_grain_bill_kg(snapshot_ingredients)
+    mash_rest_minutes = _choose_mash_rest_minutes(style_token=style_token, source_og=source_og)
+    mash_ratio_l_per_kg = _choose_mash_ratio(source_og=source_og)
+    boil_minutes = 75 if "lager" in style_token else 60
+
+    volume_values = batch_volume_values or [batch.volume_liters]
+    scale_by_volume = {
+        volume: (volume / batch.volume_liters if batch.volume_liters > 0 else 1.0)
+        for volume in volume_values
+    }
+    coverage_by_volume = {
+        volume: _fermentable_coverage(inventory_preview.requirements, scale=scale)
+        for volume, scale in scale_by_volume.items()
+    }
+
+    rows: list[BrewPlanSweepRowRead] = []
+    for equipment in equipment_options:
+        default_efficiency_pct = equipment.brewhouse_efficiency_pct if equipment else source_efficiency_pct
+        efficiencies = efficiency_pct_values or [default_efficiency_pct]
+
+        for volume in volume_values:
+            scaled_grain_bill_kg = grain_bill_kg * scale_by_volume[volume]
+            brew_volumes = _estimate_volumes(
+                grain_bill_kg=scaled_grain_bill_kg,
+                mash_ratio_l_per_kg=mash_ratio_l_per_kg,
+                boil_minutes=boil_minutes,
+                batch_volume_liters=volume,
+                equipment=equipment,
+            )
+            total_brew_minutes = _estimate_total_brew_minutes(
+                grain_bill_kg=scaled_grain_bill_kg,
+                mash_water_liters=brew_volumes.mash_water_liters,
+                pre_boil_volume_liters=brew_volumes.pre_boil_volume_liters,
+                mash_rest_minutes=mash_rest_minutes,
+                sparge_minutes=_estimate_sparge_minutes(sparge_water_liters=brew_volumes.sparge_water_liters),
+                boil_minutes=boil_minutes,
+            )
+            fermentable_coverage = coverage_by_volume[volume]
+
+            for efficiency_pct in efficiencies:
+                adjusted_og = _estimate_adjusted_og(
+                    source_og=source_og,
+                    source_efficiency_pct=source_efficiency_pct,
+                    target_efficiency_pct=efficiency_pct,
+                    fermentable_coverage=fermentable_coverage,
+                )
+                adjusted_fg = _estimate_adjusted_fg(source_og=source_og, source_fg=source_fg, adjusted_og=adjusted_og)
+                rows.append(
+                    BrewPlanSweepRowRead(
+                        equipment_profile_id=equipment.id if equipment else None,
+                        equipment_name=equipment.name if equipment else None,
+                        target_efficiency_pct=round(efficiency_pct, 2),
+                        batch_volume_liters=round(volume, 2),
+                        grain_bill_kg=round(scaled_grain_bill_kg, 3),
+                        estimated_og=round(adjusted_og, 3),
+                        estimated_fg=round(adjusted_fg, 3),
+                        estimated_abv=estimate_abv(round(adjusted_og, 3), round(adjusted_fg, 3)),
+                        fermentable_inventory_coverage_pct=round(fermentable_coverage * 100, 2),
+                        mash_water_liters=brew_volumes.mash_water_liters,
+                        sparge_water_liters=brew_volumes.sparge_water_liters,
+                        total_water_liters=brew_volumes.total_water_liters,
+                        pre_boil_volume_liters=brew_volumes.pre_boil_volume_liters,
+                        total_brew_minutes=total_brew_minutes,
+                        mash_water_capped=brew_volumes.mash_water_capped,
+                        exceeds_boil_kettle=brew_volumes.exceeds_boil_kettle,
+                    )
+                )
+
+    return rows
+
+
 def _build_equipment_summary(equipment: EquipmentProfile | None) -> BrewPlanEquipmentRead:
     if equipment is None:
         return BrewPlanEquipmentRead(
@@ -192,30 +303,30 @@ def _build_equipment_summary(equipment: EquipmentProfile | None) -> BrewPlanEqui
 
 
 def _sum_grain_bill_kg(snapshot_ingredients: list[dict[str, object]]) -> float:
-    total_kg = 0.0
+    amounts: list[float] = []
+    units: list[str] = []
     for ingredient in snapshot_ingredients:
         ingredient_type = str(ingredient.get("ingredient_type", "")).strip().lower()
         if ingredient_type not in _FERMENTABLE_TYPES:
             continue
         amount = _safe_float(ingredient.get("amount"))
-        unit = str(ingredient.get("unit", "")).strip().lower()
-        unit = _UNIT_ALIASES.get(unit, unit)
-        factor = _MASS_TO_KG.get(unit)
-        if amount is None or factor is None or amount <= 0:
+        if amount is None or amount <= 0:
             continue
-        total_kg += amount * factor
-    return total_kg
+        amounts.append(amount)
+        units.append(str(ingredient.get("unit", "")))
 
+    return sum(kg for kg in convert_many(amounts, units, "kg") if kg is not None)
 
-def _fermentable_coverage(requirements: list[BatchInventoryRequirementRead]) -> float:
+
+def _fermentable_coverage(requirements: list[BatchInventoryRequirementRead], scale: float = 1.0) -> float:
     fermentables = [row for row in requirements if row.ingredient_type.strip().lower() in _FERMENTABLE_TYPES]
     if not fermentables:
         return 1.0
 
-    required_total = sum(max(row.required_amount, 0.0) for row in fermentables)
+    required_total = sum(max(row.required_amount, 0.0) * scale for row in fermentables)
     if required_total <= 0:
         return 1.0
-    covered_total = sum(min(max(row.available_amount, 0.0), max(row.required_amount, 0.0)) for row in fermentables)
+    covered_total = sum(min(max(row.available_amount, 0.0), max(row.required_amount, 0.0) * scale) for row in fermentables)
     return max(0.0, min(covered_total / required_total, 1.0))
 
 
@@ -259,6 +370,51 @@ def _choose_mash_rest_minutes(*, style_token: str, source_og: float) -> int:
     return minutes
 
 
+def _choose_mash_ratio(*, source_og: float) -> float:
+    return 2.8 if source_og >= 1.070 else 2.7
+
+
+def _estimate_volumes(
+    *,
+    grain_bill_kg: float,
+    mash_ratio_l_per_kg: float,
+    boil_minutes: int,
+    batch_volume_liters: float,
+    equipment: EquipmentProfile | None,
+) -> _BrewVolumes:
+    mash_water_liters = round(grain_bill_kg * mash_ratio_l_per_kg, 2)
+    mash_water_capped = False
+
+    if equipment and equipment.mash_tun_volume_liters:
+        max_mash_water = round(equipment.mash_tun_volume_liters * 0.9, 2)
+        if mash_water_liters > max_mash_water and max_mash_water > 0:
+            mash_water_liters = max_mash_water
+            mash_water_capped = True
+
+    grain_absorption_liters = round(grain_bill_kg * 0.8, 2)
+    first_runnings_liters = max(mash_water_liters - grain_absorption_liters, 0.0)
+    boil_off_rate_l_per_hour = equipment.boil_off_rate_l_per_hour if equipment and equipment.boil_off_rate_l_per_hour else 3.0
+    trub_loss_liters = equipment.trub_loss_liters if equipment and equipment.trub_loss_liters else 1.0
+    estimated_boil_off_liters = round(boil_off_rate_l_per_hour * (boil_minutes / 60.0), 2)
+    pre_boil_volume_liters = round(batch_volume_liters + trub_loss_liters + estimated_boil_off_liters, 2)
+    sparge_water_liters = round(max(pre_boil_volume_liters - first_runnings_liters, 0.0), 2)
+    total_water_liters = round(mash_water_liters + sparge_water_liters, 2)
+
+    exceeds_boil_kettle = bool(
+        equipment and equipment.boil_kettle_volume_liters and pre_boil_volume_liters > equipment.boil_kettle_volume_liters
+    )
+
+    return _BrewVolumes(
+        mash_water_liters=mash_water_liters,
+        sparge_water_liters=sparge_water_liters,
+        total_water_liters=total_water_liters,
+        pre_boil_volume_liters=pre_boil_volume_liters,
+        estimated_boil_off_liters=estimated_boil_off_liters,
+        mash_water_capped=mash_water_capped,
+        exceeds_boil_kettle=exceeds_boil_kettle,
+    )
+
+
 def _estimate_strike_temp(*, mash_temp_c: float, mash_ratio_l_per_kg: float) -> float:
     ratio_qt_lb = max(mash_ratio_l_per_kg / 2.086, 0.8)
     grain_temp_c = 20.0
@@ -269,6 +425,40 @@ def _estimate_sparge_minutes(*, sparge_water_liters: float) -> int:
     return max(15, min(45, int(round(10 + (sparge_water_liters * 1.6)))))
 
 
+def _estimate_heat_strike_minutes(*, mash_water_liters: float) -> int:
+    return max(15, min(55, int(round(mash_water_liters * 1.7))))
+
+
+def _estimate_bring_to_boil_minutes(*, pre_boil_volume_liters: float) -> int:
+    return max(15, min(50, int(round(max(pre_boil_volume_liters, 5.0) * 1.2))))
+
+
+def _estimate_total_brew_minutes(
+    *,
+    grain_bill_kg: float,
+    mash_water_liters: float,
+    pre_boil_volume_liters: float,
+    mash_rest_minutes: int,
+    sparge_minutes: int,
+    boil_minutes: int,
+) -> int:
+    """Sum of the step durations `_build_timer_plan` would schedule, without building the steps."""
+    total_minutes = (
+        _estimate_bring_to_boil_minutes(pre_boil_volume_liters=pre_boil_volume_liters)
+        + boil_minutes
+        + _CHILL_MINUTES
+        + _TRANSFER_PITCH_MINUTES
+    )
+    if grain_bill_kg > 0 and mash_water_liters > 0:
+        total_minutes += (
+            _estimate_heat_strike_minutes(mash_water_liters=mash_water_liters)
+            + _MASH_IN_MINUTES
+            + mash_rest_minutes
+            + sparge_minutes
+        )
+    return total_minutes
+
+
 def _build_timer_plan(
     *,
     grain_bill_kg: float,
@@ -285,23 +475,23 @@ def _build_timer_plan(
     steps: list[tuple[str, str, int, float | None]] = []
 
     if grain_bill_kg > 0 and mash_water_liters > 0:
-        heat_minutes = max(15, min(55, int(round(mash_water_liters * 1.7))))
+        heat_minutes = _estimate_heat_strike_minutes(mash_water_liters=mash_water_liters)
         steps.extend(
             [
                 ("heat_strike", t("step_heat_strike", language), heat_minutes, strike_temp_c),
-                ("mash_in", t("step_mash_in", language), 10, mash_temp_c),
+                ("mash_in", t("step_mash_in", language), _MASH_IN_MINUTES, mash_temp_c),
                 ("mash_rest", t("step_mash_rest", language), mash_rest_minutes, mash_temp_c),
                 ("sparge", t("step_sparge", language), sparge_minutes, 76.0),
             ]
         )
 
-    bring_to_boil_minutes = max(15, min(50, int(round(max(pre_boil_volume_liters, 5.0) * 1.2))))
+    bring_to_boil_minutes = _estimate_bring_to_boil_minutes(pre_boil_volume_liters=pre_boil_volume_liters)
     steps.extend(
         [
             ("heat_boil", t("step_heat_boil", language), bring_to_boil_minutes, 100.0),
             ("boil", t("step_boil", language), boil_minutes, 100.0),
-            ("chill", t("step_chill", language), 20, 20.0),
-            ("transfer_pitch", t("step_transfer_pitch", language), 15, None),
+            ("chill", t("step_chill", language), _CHILL_MINUTES, 20.0),
+            ("transfer_pitch", t("step_transfer_pitch", language), _TRANSFER_PITCH_MINUTES, None),
         ]
     )
 
@@ -330,7 +520,7 @@ def _build_timer_plan(
 def _build_shopping_and_substitutions(
     *,
     requirements: list[BatchInventoryRequirementRead],
-    available_hop_names: list[str],
+    available_hops: HopCandidatePool,
 ) -> tuple[list[BrewPlanShoppingItemRead], list[BrewPlanHopSubstitutionRead]]:
     shopping: list[BrewPlanShoppingItemRead] = []
     substitutions: list[BrewPlanHopSubstitutionRead] = []
@@ -345,7 +535,7 @@ def _build_shopping_and_substitutions(
             try:
                 result = recommend_hop_substitutions(
                     target_hop_name=requirement.name,
-                    available_hop_names=available_hop_names,
+                    available_hop_names=available_hops,
                     top_k=3,
                 )
                 hop_candidates = [
@@ -1,6 +1,30 @@
+"""External recipe, equipment and ingredient templates, mirrored into a local SQLite store.
+
+Loaders yield templates from a source: the built-in samples, or a provider's JSON dump.
+They are ingested once into an SQLite file with a unique ``(provider, external_id)`` index
+and FTS5 tables for ranked search. The file is rebuilt only when a loader's fingerprint
+changes, so a restart with the same dumps reuses it.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Generic, Protocol, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -229,66 +253,415 @@ _INGREDIENT_TEMPLATES: tuple[ExternalIngredientTemplate, ...] = (
 )
 
 
-def _matches(text: str, search: str | None) -> bool:
-    if not search:
-        return True
-    return search.lower() in text.lower()
+DEFAULT_CATALOG_PAGE_SIZE = 50
+_STORE_SCHEMA_VERSION = "1"
+_INGEST_CHUNK_SIZE = 1000
+_SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CatalogPage(Generic[T]):
+    total: int
+    items: tuple[T, ...]
+
+
+class ExternalCatalogLoader(Protocol):
+    """A source of catalog templates; any of the three streams may be empty."""
+
+    def fingerprint(self) -> str: ...
+
+    def recipes(self) -> Iterable[ExternalRecipeTemplate]: ...
+
+    def equipment(self) -> Iterable[ExternalEquipmentTemplate]: ...
+
+    def ingredients(self) -> Iterable[ExternalIngredientTemplate]: ...
+
+
+class BuiltinCatalogLoader:
+    """The sample templates bundled with the app."""
+
+    def fingerprint(self) -> str:
+        payload = repr((_RECIPE_TEMPLATES, _EQUIPMENT_TEMPLATES, _INGREDIENT_TEMPLATES)).encode()
+        return f"builtin:{hashlib.sha256(payload).hexdigest()[:16]}"
+
+    def recipes(self) -> Iterable[ExternalRecipeTemplate]:
+        return _RECIPE_TEMPLATES
+
+    def equipment(self) -> Iterable[ExternalEquipmentTemplate]:
+        return _EQUIPMENT_TEMPLATES
+
+    def ingredients(self) -> Iterable[ExternalIngredientTemplate]:
+        return _INGREDIENT_TEMPLATES
+
+
+class JsonDumpCatalogLoader:
+    """A provider dump: ``{"provider": ..., "recipes": [...], "equipment": [...], "ingredients": [...]}``.
 
+    Entries use the template field names without ``provider``; recipe ingredients are objects
+    with the ``ExternalRecipeIngredientTemplate`` fields.
+    """
 
-def list_recipe_templates(provider: str | None = None, search: str | None = None) -> list[ExternalRecipeTemplate]:
-    items = [
-        template
-        for template in _RECIPE_TEMPLATES
-        if (provider is None or template.provider == provider)
-        and (_matches(template.name, search) or _matches(template.style, search))
-    ]
-    items.sort(key=lambda item: (item.provider, item.name))
-    return items
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._payload: dict[str, object] | None = None
+
+    def fingerprint(self) -> str:
+        stat = self.path.stat()
+        return f"dump:{self.path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _load(self) -> tuple[str, dict[str, object]]:
+        if self._payload is None:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(payload, dict) or not isinstance(payload.get("provider"), str):
+                raise ValueError(f"{self.path}: catalog dump needs a top-level 'provider'")
+            self._payload = payload
+        return str(self._payload["provider"]), self._payload
+
+    def _entries(self, section: str) -> Iterator[tuple[str, dict[str, object]]]:
+        provider, payload = self._load()
+        entries = payload.get(section, [])
+        if not isinstance(entries, list):
+            raise ValueError(f"{self.path}: '{section}' must be a list")
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValueError(f"{self.path}: every '{section}' entry must be an object")
+            yield provider, entry
+
+    def recipes(self) -> Iterable[ExternalRecipeTemplate]:
+        for provider, entry in self._entries("recipes"):
+            ingredients = tuple(ExternalRecipeIngredientTemplate(**row) for row in entry.get("ingredients", ()))
+            yield ExternalRecipeTemplate(provider=provider, **{**entry, "ingredients": ingredients})
+
+    def equipment(self) -> Iterable[ExternalEquipmentTemplate]:
+        for provider, entry in self._entries("equipment"):
+            yield ExternalEquipmentTemplate(provider=provider, **entry)
+
+    def ingredients(self) -> Iterable[ExternalIngredientTemplate]:
+        for provider, entry in self._entries("ingredients"):
+            yield ExternalIngredientTemplate(provider=provider, **entry)
+
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE recipes (
+    provider TEXT NOT NULL, external_id TEXT NOT NULL, name TEXT NOT NULL, style TEXT NOT NULL,
+    target_og REAL NOT NULL, target_fg REAL NOT NULL, target_ibu REAL NOT NULL, target_srm REAL NOT NULL,
+    efficiency_pct REAL NOT NULL, notes TEXT NOT NULL, ingredients TEXT NOT NULL
+);
+CREATE UNIQUE INDEX recipes_key ON recipes (provider, external_id);
+CREATE INDEX recipes_listing ON recipes (provider, name);
+CREATE VIRTUAL TABLE recipes_fts USING fts5 (name, style, content='recipes', content_rowid='rowid');
+CREATE TABLE equipment (
+    provider TEXT NOT NULL, external_id TEXT NOT NULL, name TEXT NOT NULL, batch_volume_liters REAL NOT NULL,
+    mash_tun_volume_liters REAL, boil_kettle_volume_liters REAL, brewhouse_efficiency_pct REAL NOT NULL,
+    boil_off_rate_l_per_hour REAL, trub_loss_liters REAL, notes TEXT NOT NULL
+);
+CREATE UNIQUE INDEX equipment_key ON equipment (provider, external_id);
+CREATE INDEX equipment_listing ON equipment (provider, name);
+CREATE VIRTUAL TABLE equipment_fts USING fts5 (name, content='equipment', content_rowid='rowid');
+CREATE TABLE ingredients (
+    provider TEXT NOT NULL, external_id TEXT NOT NULL, name TEXT NOT NULL, ingredient_type TEXT NOT NULL,
+    default_unit TEXT NOT NULL, notes TEXT NOT NULL
+);
+CREATE UNIQUE INDEX ingredients_key ON ingredients (provider, external_id);
+CREATE INDEX ingredients_listing ON ingredients (provider, ingredient_type, name);
+CREATE VIRTUAL TABLE ingredients_fts USING fts5 (name, notes, content='ingredients', content_rowid='rowid');
+"""
+
+
+@dataclass(frozen=True)
+class _CatalogTable(Generic[T]):
+    name: str
+    columns: tuple[str, ...]
+    listing_columns: tuple[str, ...]
+    # bm25 weight per FTS column, in schema order.
+    search_weights: tuple[float, ...]
+    to_row: Callable[[T], tuple[object, ...]]
+    from_row: Callable[[sqlite3.Row], T]
+
+
+def _recipe_to_row(template: ExternalRecipeTemplate) -> tuple[object, ...]:
+    row = asdict(template)
+    row["ingredients"] = json.dumps(row["ingredients"], separators=(",", ":"))
+    return tuple(row.values())
+
+
+def _recipe_from_row(row: sqlite3.Row) -> ExternalRecipeTemplate:
+    fields = dict(row)
+    ingredients = tuple(ExternalRecipeIngredientTemplate(**ingredient) for ingredient in json.loads(fields.pop("ingredients")))
+    return ExternalRecipeTemplate(**fields, ingredients=ingredients)
+
+
+_RECIPE_TABLE: _CatalogTable[ExternalRecipeTemplate] = _CatalogTable(
+    name="recipes",
+    columns=tuple(ExternalRecipeTemplate.__dataclass_fields__),
+    listing_columns=("provider", "name"),
+    search_weights=(2.0, 1.0),
+    to_row=_recipe_to_row,
+    from_row=_recipe_from_row,
+)
+_EQUIPMENT_TABLE: _CatalogTable[ExternalEquipmentTemplate] = _CatalogTable(
+    name="equipment",
+    columns=tuple(ExternalEquipmentTemplate.__dataclass_fields__),
+    listing_columns=("provider", "name"),
+    search_weights=(1.0,),
+    to_row=lambda template: tuple(asdict(template).values()),
+    from_row=lambda row: ExternalEquipmentTemplate(**dict(row)),
+)
+_INGREDIENT_TABLE: _CatalogTable[ExternalIngredientTemplate] = _CatalogTable(
+    name="ingredients",
+    columns=tuple(ExternalIngredientTemplate.__dataclass_fields__),
+    listing_columns=("provider", "ingredient_type", "name"),
+    search_weights=(2.0, 1.0),
+    to_row=lambda template: tuple(asdict(template).values()),
+    from_row=lambda row: ExternalIngredientTemplate(**dict(row)),
+)
+
+
+def _fts_query(search: str) -> str | None:
+    """Each search word as a quoted prefix term, all required; None when there are no words."""
+    tokens = _SEARCH_TOKEN_PATTERN.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _chunks(rows: Iterable[tuple[object, ...]]) -> Iterator[list[tuple[object, ...]]]:
+    chunk: list[tuple[object, ...]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == _INGEST_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _loaders_fingerprint(loaders: Sequence[ExternalCatalogLoader]) -> str:
+    parts = [_STORE_SCHEMA_VERSION, *(loader.fingerprint() for loader in loaders)]
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+class ExternalCatalogStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._lock = Lock()
+
+    @classmethod
+    def build(cls, path: Path, loaders: Sequence[ExternalCatalogLoader]) -> ExternalCatalogStore:
+        """Open the store at ``path``, re-ingesting every loader if its fingerprint is stale.
+
+        The new file is written next to the old one and swapped in atomically, so concurrent
+        workers never read a half-built store. A later loader replaces earlier rows with the
+        same ``(provider, external_id)``.
+        """
+        fingerprint = _loaders_fingerprint(loaders)
+        if _read_fingerprint(path) != fingerprint:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, staging_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            os.close(descriptor)
+            staging = Path(staging_name)
+            try:
+                _ingest(staging, loaders, fingerprint=fingerprint)
+                os.replace(staging, path)
+            finally:
+                staging.unlink(missing_ok=True)
+        return cls(path)
+
+    def _get(self, table: _CatalogTable[T], provider: str, external_id: str) -> T | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(table.columns)} FROM {table.name} WHERE provider = ? AND external_id = ?",
+                (provider, external_id),
+            ).fetchone()
+        return table.from_row(row) if row is not None else None
+
+    def _search(
+        self,
+        table: _CatalogTable[T],
+        *,
+        filters: dict[str, str | None],
+        search: str | None,
+        limit: int | None,
+        offset: int,
+    ) -> CatalogPage[T]:
+        clauses = [f"t.{column} = ?" for column, value in filters.items() if value is not None]
+        params: list[object] = [value for value in filters.values() if value is not None]
+        match = _fts_query(search) if search else None
+        if match is None:
+            source = f"{table.name} AS t"
+            order = ", ".join(f"t.{column}" for column in table.listing_columns)
+        else:
+            source = f"{table.name}_fts JOIN {table.name} AS t ON t.rowid = {table.name}_fts.rowid"
+            clauses.insert(0, f"{table.name}_fts MATCH ?")
+            params.insert(0, match)
+            weights = ", ".join(str(weight) for weight in table.search_weights)
+            order = f"bm25({table.name}_fts, {weights}), t.rowid"
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = ", ".join(f"t.{column}" for column in table.columns)
+        with self._lock:
+            total = self._connection.execute(f"SELECT COUNT(*) FROM {source}{where}", params).fetchone()[0]
+            rows = self._connection.execute(
+                f"SELECT {columns} FROM {source}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                [*params, -1 if limit is None else limit, offset],
+            ).fetchall()
+        return CatalogPage(total=total, items=tuple(table.from_row(row) for row in rows))
+
+    def _distinct(self, table: _CatalogTable[T], columns: tuple[str, ...]) -> list[tuple[str, ...]]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT DISTINCT {', '.join(columns)} FROM {table.name} ORDER BY {', '.join(columns)}"
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def get_recipe(self, provider: str, external_id: str) -> ExternalRecipeTemplate | None:
+        return self._get(_RECIPE_TABLE, provider, external_id)
+
+    def get_equipment(self, provider: str, external_id: str) -> ExternalEquipmentTemplate | None:
+        return self._get(_EQUIPMENT_TABLE, provider, external_id)
+
+    def get_ingredient(self, provider: str, external_id: str) -> ExternalIngredientTemplate | None:
+        return self._get(_INGREDIENT_TABLE, provider, external_id)
+
+    def search_recipes(
+        self, *, provider: str | None, search: str | None, limit: int | None, offset: int
+    ) -> CatalogPage[ExternalRecipeTemplate]:
+        return self._search(_RECIPE_TABLE, filters={"provider": provider}, search=search, limit=limit, offset=offset)
+
+    def search_equipment(
+        self, *, provider: str | None, search: str | None, limit: int | None, offset: int
+    ) -> CatalogPage[ExternalEquipmentTemplate]:
+        return self._search(_EQUIPMENT_TABLE, filters={"provider": provider}, search=search, limit=limit, offset=offset)
+
+    def search_ingredients(
+        self, *, provider: str | None, ingredient_type: str | None, search: str | None, limit: int | None, offset: int
+    ) -> CatalogPage[ExternalIngredientTemplate]:
+        return self._search(
+            _INGREDIENT_TABLE,
+            filters={"provider": provider, "ingredient_type": ingredient_type},
+            search=search,
+            limit=limit,
+            offset=offset,
+        )
+
+    def recipe_providers(self) -> list[str]:
+        return [row[0] for row in self._distinct(_RECIPE_TABLE, ("provider",))]
+
+    def equipment_providers(self) -> list[str]:
+        return [row[0] for row in self._distinct(_EQUIPMENT_TABLE, ("provider",))]
+
+    def ingredient_facets(self) -> list[tuple[str, str]]:
+        """Every (provider, ingredient_type) pair present in the store."""
+        return [(row[0], row[1]) for row in self._distinct(_INGREDIENT_TABLE, ("provider", "ingredient_type"))]
+
+
+def _read_fingerprint(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    try:
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return None
+    return row[0] if row else None
+
+
+def _ingest(path: Path, loaders: Sequence[ExternalCatalogLoader], *, fingerprint: str) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        connection.executescript(_SCHEMA)
+        with connection:
+            for loader in loaders:
+                for table, templates in (
+                    (_RECIPE_TABLE, loader.recipes()),
+                    (_EQUIPMENT_TABLE, loader.equipment()),
+                    (_INGREDIENT_TABLE, loader.ingredients()),
+                ):
+                    statement = (
+                        f"INSERT OR REPLACE INTO {table.name} ({', '.join(table.columns)}) "
+                        f"VALUES ({', '.join('?' for _ in table.columns)})"
+                    )
+                    for chunk in _chunks(table.to_row(template) for template in templates):
+                        connection.executemany(statement, chunk)
+            for table in (_RECIPE_TABLE, _EQUIPMENT_TABLE, _INGREDIENT_TABLE):
+                connection.execute(f"INSERT INTO {table.name}_fts ({table.name}_fts) VALUES ('rebuild')")
+            connection.execute("INSERT INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,))
+    finally:
+        connection.close()
+
+
+def _store_path() -> Path:
+    if settings.external_catalog_store_path:
+        return Path(settings.external_catalog_store_path)
+    return Path(tempfile.gettempdir()) / "brewpilot-external-catalog.sqlite3"
+
+
+def _configured_loaders() -> list[ExternalCatalogLoader]:
+    return [BuiltinCatalogLoader(), *(JsonDumpCatalogLoader(Path(path)) for path in settings.external_catalog_dump_paths)]
+
+
+_store_lock = Lock()
+_store: ExternalCatalogStore | None = None
+
+
+def get_external_catalog_store() -> ExternalCatalogStore:
+    """The process-wide store, built from the configured loaders on first use."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ExternalCatalogStore.build(_store_path(), _configured_loaders())
+    return _store
+
+
+def list_recipe_templates(
+    provider: str | None = None,
+    search: str | None = None,
+    *,
+    limit: int | None = None,
+    offset: int = 0,
+) -> CatalogPage[ExternalRecipeTemplate]:
+    """Recipes by provider and name, or by full-text rank on name and style when searching."""
+    return get_external_catalog_store().search_recipes(provider=provider, search=search, limit=limit, offset=offset)
 
 
 def get_recipe_template(provider: str, external_id: str) -> ExternalRecipeTemplate | None:
-    for template in _RECIPE_TEMPLATES:
-        if template.provider == provider and template.external_id == external_id:
-            return template
-    return None
+    return get_external_catalog_store().get_recipe(provider, external_id)
 
 
-def list_equipment_templates(provider: str | None = None, search: str | None = None) -> list[ExternalEquipmentTemplate]:
-    items = [
-        template
-        for template in _EQUIPMENT_TEMPLATES
-        if (provider is None or template.provider == provider)
-        and _matches(template.name, search)
-    ]
-    items.sort(key=lambda item: (item.provider, item.name))
-    return items
+def list_equipment_templates(
+    provider: str | None = None,
+    search: str | None = None,
+    *,
+    limit: int | None = None,
+    offset: int = 0,
+) -> CatalogPage[ExternalEquipmentTemplate]:
+    return get_external_catalog_store().search_equipment(provider=provider, search=search, limit=limit, offset=offset)
 
 
 def get_equipment_template(provider: str, external_id: str) -> ExternalEquipmentTemplate | None:
-    for template in _EQUIPMENT_TEMPLATES:
-        if template.provider == provider and template.external_id == external_id:
-            return template
-    return None
+    return get_external_catalog_store().get_equipment(provider, external_id)
 
 
 def list_ingredient_templates(
     provider: str | None = None,
     ingredient_type: str | None = None,
     search: str | None = None,
-) -> list[ExternalIngredientTemplate]:
-    items = [
-        template
-        for template in _INGREDIENT_TEMPLATES
-        if (provider is None or template.provider == provider)
-        and (ingredient_type is None or template.ingredient_type == ingredient_type)
-        and (_matches(template.name, search) or _matches(template.notes, search))
-    ]
-    items.sort(key=lambda item: (item.provider, item.ingredient_type, item.name))
-    return items
+    *,
+    limit: int | None = None,
+    offset: int = 0,
+) -> CatalogPage[ExternalIngredientTemplate]:
+    """Ingredients by provider, type and name, or by full-text rank on name and notes when searching."""
+    return get_external_catalog_store().search_ingredients(
+        provider=provider, ingredient_type=ingredient_type, search=search, limit=limit, offset=offset
+    )
 
 
 def get_ingredient_template(provider: str, external_id: str) -> ExternalIngredientTemplate | None:
-    for template in _INGREDIENT_TEMPLATES:
-        if template.provider == provider and template.external_id == external_id:
-            return template
-    return None
+    return get_external_catalog_store().get_ingredient(provider, external_id)
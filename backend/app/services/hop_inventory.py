@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryItem
+from app.services.cache import LRUCache
+from app.services.hop_substitution import (
+    HopCandidatePool,
+    build_hop_candidate_pool,
+    get_hop_catalog,
+)
+
+# Keyed by user id; each value carries the hop-inventory version it was resolved from.
+_POOL_CACHE: LRUCache[int, tuple[tuple[object, ...], HopCandidatePool]] = LRUCache(maxsize=256)
+
+
+def get_inventory_hop_pool(db: Session, user_id: int) -> HopCandidatePool:
+    """Resolve the user's hop inventory against the catalog once per inventory version.
+
+    The version is (count, max id, max updated_at) over the user's hop rows, so adding,
+    removing or renaming a hop re-resolves the pool; so does a catalog reload.
+    """
+    version = tuple(
+        db.execute(
+            select(func.count(InventoryItem.id), func.max(InventoryItem.id), func.max(InventoryItem.updated_at)).where(
+                InventoryItem.owner_user_id == user_id,
+                func.lower(InventoryItem.ingredient_type) == "hop",
+            )
+        ).one()
+    )
+    catalog = get_hop_catalog()
+    cached = _POOL_CACHE.get(user_id)
+    if cached is not None and cached[0] == version and cached[1].catalog is catalog:
+        return cached[1]
+
+    names = db.scalars(
+        select(InventoryItem.name)
+        .where(
+            InventoryItem.owner_user_id == user_id,
+            func.lower(InventoryItem.ingredient_type) == "hop",
+        )
+        .order_by(InventoryItem.id)
+    ).all()
+    pool = build_hop_candidate_pool(names, catalog=catalog)
+    _POOL_CACHE.put(user_id, (version, pool))
+    return pool
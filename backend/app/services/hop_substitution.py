@@ -1,8 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import itertools
+import json
+import logging
 import math
+import os
 import re
-from dataclasses import dataclass
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Literal
+
+from app.core.config import settings
+from app.services.cache import LRUCache
+from app.services.hop_index import HopFlavorIndex
+from app.services.numeric import solve_linear_system
+
+logger = logging.getLogger("brewpilot.hops")
 
 
 @dataclass(frozen=True)
@@ -28,235 +51,612 @@ class HopSubstitutionCandidate:
     shared_descriptors: tuple[str, ...]
 
 
+@dataclass(frozen=True)
+class HopBlendComponent:
+    name: str
+    proportion: float
+
+
+@dataclass(frozen=True)
+class HopBlendCandidate:
+    components: tuple[HopBlendComponent, ...]
+    blend_alpha_acid_pct: float
+    flavor_similarity_score: float
+    descriptor_overlap_score: float
+    similarity_score: float
+    recommended_bittering_ratio: float
+    shared_descriptors: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class HopNameResolution:
+    input_name: str
+    normalized_name: str
+    hop_index: int
+    hop_name: str
+    confidence: float
+
+
 @dataclass(frozen=True)
 class HopSubstitutionResult:
     target_hop: HopProfile
     substitutions: tuple[HopSubstitutionCandidate, ...]
     unresolved_hop_names: tuple[str, ...]
     recognized_candidate_count: int
+    target_confidence: float = 1.0
+    resolved_candidates: tuple[HopNameResolution, ...] = ()
+    blends: tuple[HopBlendCandidate, ...] = ()
+
+
+@dataclass(frozen=True)
+class HopCatalog:
+    """Compiled hop catalog: profiles plus the arrays the scoring code reads."""
+
+    hops: tuple[HopProfile, ...]
+    index_by_alias: dict[str, int]
+    descriptors: tuple[str, ...]
+    # Bit i of a hop's mask is set when the hop carries descriptors[i].
+    descriptor_masks: tuple[int, ...]
+    alpha_midpoints: array
+    flavor_norms: array
+    # Row-major len(hops) x len(hops) cosine similarity of the flavor vectors.
+    flavor_similarity: array
+    alias_keys: tuple[str, ...]
+    alias_owners: tuple[int, ...]
+    # Character trigram -> positions in alias_keys, for typo-tolerant lookups.
+    alias_trigrams: dict[str, tuple[int, ...]]
+    fuzzy_resolutions: LRUCache[str, tuple[int, float]] = field(
+        default_factory=lambda: LRUCache(maxsize=4096), compare=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self.hops)
+
+    def resolve(self, name: str) -> tuple[int, float] | None:
+        """Return (hop index, confidence) for a name, tolerating typos; None when nothing is close enough."""
+        normalized = normalize_hop_name(name)
+        if not normalized:
+            return None
+        exact = self.index_by_alias.get(normalized)
+        if exact is not None:
+            return exact, 1.0
+
+        resolved = self.fuzzy_resolutions.get(normalized)
+        if resolved is None:
+            resolved = _fuzzy_resolve(self, normalized) or _UNRESOLVED
+            self.fuzzy_resolutions.put(normalized, resolved)
+        return None if resolved == _UNRESOLVED else resolved
+
+    def resolve_index(self, name: str) -> int | None:
+        resolved = self.resolve(name)
+        return None if resolved is None else resolved[0]
+
+
+@dataclass(frozen=True)
+class HopCandidatePool:
+    """Candidate hop names resolved against one catalog, deduplicated by normalized name."""
+
+    catalog: HopCatalog
+    input_names: tuple[str, ...]
+    resolved: tuple[HopNameResolution, ...]
+    unresolved_hop_names: tuple[str, ...]
 
 
-_HOP_PROFILES: tuple[HopProfile, ...] = (
-    HopProfile(
-        name="Amarillo",
-        aliases=("amarillo",),
-        alpha_acid_min_pct=8.0,
-        alpha_acid_max_pct=11.0,
-        flavor_descriptors=("citrus", "floral", "orange", "tropical"),
-        flavor_vector=(4.1, 3.4, 0.8, 1.0, 2.3, 0.8, 0.3, 0.2, 1.6, 0.3, 0.5),
-        use="dual-purpose",
-    ),
-    HopProfile(
-        name="Cascade",
-        aliases=("cascade",),
-        alpha_acid_min_pct=4.5,
-        alpha_acid_max_pct=7.0,
-        flavor_descriptors=("citrus", "floral", "grapefruit", "spicy"),
-        flavor_vector=(4.0, 1.2, 1.0, 0.7, 2.4, 1.2, 1.0, 0.4, 0.5, 0.2, 0.2),
-        use="dual-purpose",
-    ),
-    HopProfile(
-        name="Centennial",
-        aliases=("centennial",),
-        alpha_acid_min_pct=9.5,
-        alpha_acid_max_pct=11.5,
-        flavor_descriptors=("citrus", "floral", "pine"),
-        flavor_vector=(4.0, 1.5, 2.1, 1.2, 1.9, 0.9, 0.4, 0.2, 0.6, 0.1, 0.4),
-        use="dual-purpose",
-    ),
-    HopProfile(
-        name="Chinook",
-        aliases=("chinook",),
-        alpha_acid_min_pct=12.0,
-        alpha_acid_max_pct=14.0,
-        flavor_descriptors=("grapefruit", "pine", "resin", "spicy"),
-        flavor_vector=(2.7, 0.9, 3.8, 3.6, 0.8, 1.0, 1.8, 0.5, 0.3, 0.1, 1.6),
-        use="dual-purpose",
-    ),
-    HopProfile(
-        name="Citra",
-        aliases=("citra",),
-        alpha_acid_min_pct=11.0,
-        alpha_acid_max_pct=14.0,
-        flavor_descriptors=("citrus", "tropical", "stone fruit"),
-        flavor_vector=(4.8, 4.7, 0.5, 0.9, 0.9, 0.3, 0.1, 0.1, 3.3, 0.4, 1.0),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Columbus",
-        aliases=("columbus", "ctz", "tomahawk", "zeus"),
-        alpha_acid_min_pct=14.0,
-        alpha_acid_max_pct=18.0,
-        flavor_descriptors=("citrus", "dank", "resin", "spicy"),
-        flavor_vector=(2.5, 0.9, 2.0, 3.9, 0.5, 0.7, 1.1, 0.4, 0.2, 0.3, 3.9),
-        use="bittering",
-    ),
-    HopProfile(
-        name="Crystal",
-        aliases=("crystal",),
-        alpha_acid_min_pct=3.0,
-        alpha_acid_max_pct=6.0,
-        flavor_descriptors=("citrus", "floral", "spicy"),
-        flavor_vector=(2.2, 0.8, 0.4, 0.4, 2.0, 1.4, 1.3, 0.7, 0.2, 0.1, 0.2),
-        use="aroma",
-    ),
-    HopProfile(
-        name="East Kent Goldings",
-        aliases=("east kent goldings", "ekg"),
-        alpha_acid_min_pct=4.0,
-        alpha_acid_max_pct=6.0,
-        flavor_descriptors=("earthy", "floral", "honey", "spicy"),
-        flavor_vector=(0.4, 0.2, 0.3, 0.2, 2.6, 1.7, 1.7, 3.1, 0.2, 0.1, 0.2),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Fuggle",
-        aliases=("fuggle", "fuggles"),
-        alpha_acid_min_pct=3.5,
-        alpha_acid_max_pct=5.5,
-        flavor_descriptors=("earthy", "herbal", "woody"),
-        flavor_vector=(0.3, 0.2, 0.2, 0.2, 1.4, 2.6, 0.8, 3.7, 0.1, 0.1, 0.1),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Hallertau Mittelfruh",
-        aliases=("hallertau mittelfruh", "hallertau"),
-        alpha_acid_min_pct=3.0,
-        alpha_acid_max_pct=5.5,
-        flavor_descriptors=("floral", "herbal", "spicy"),
-        flavor_vector=(0.3, 0.1, 0.2, 0.1, 2.8, 2.1, 1.7, 1.9, 0.1, 0.1, 0.1),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Magnum",
-        aliases=("magnum",),
-        alpha_acid_min_pct=12.0,
-        alpha_acid_max_pct=15.0,
-        flavor_descriptors=("clean", "herbal", "light citrus"),
-        flavor_vector=(1.1, 0.2, 0.7, 0.8, 0.4, 1.6, 0.4, 0.5, 0.1, 0.1, 0.2),
-        use="bittering",
-    ),
-    HopProfile(
-        name="Mosaic",
-        aliases=("mosaic",),
-        alpha_acid_min_pct=10.5,
-        alpha_acid_max_pct=13.5,
-        flavor_descriptors=("berry", "citrus", "dank", "tropical"),
-        flavor_vector=(4.1, 4.4, 1.3, 2.2, 0.9, 0.5, 0.2, 0.2, 2.2, 3.8, 2.8),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Nugget",
-        aliases=("nugget",),
-        alpha_acid_min_pct=11.0,
-        alpha_acid_max_pct=14.0,
-        flavor_descriptors=("herbal", "resin", "spicy"),
-        flavor_vector=(1.4, 0.4, 1.9, 2.9, 0.5, 2.1, 1.7, 0.6, 0.2, 0.1, 0.8),
-        use="bittering",
-    ),
-    HopProfile(
-        name="Saaz",
-        aliases=("saaz",),
-        alpha_acid_min_pct=2.5,
-        alpha_acid_max_pct=4.5,
-        flavor_descriptors=("floral", "herbal", "spicy"),
-        flavor_vector=(0.2, 0.1, 0.1, 0.1, 2.2, 2.5, 2.0, 1.7, 0.1, 0.1, 0.1),
-        use="aroma",
-    ),
-    HopProfile(
-        name="Simcoe",
-        aliases=("simcoe",),
-        alpha_acid_min_pct=12.0,
-        alpha_acid_max_pct=14.0,
-        flavor_descriptors=("berry", "citrus", "dank", "pine", "resin"),
-        flavor_vector=(3.1, 2.2, 3.8, 3.4, 0.7, 0.7, 0.4, 0.2, 1.0, 1.6, 2.6),
-        use="dual-purpose",
-    ),
-    HopProfile(
-        name="Warrior",
-        aliases=("warrior",),
-        alpha_acid_min_pct=14.0,
-        alpha_acid_max_pct=17.0,
-        flavor_descriptors=("citrus", "clean", "resin"),
-        flavor_vector=(1.5, 0.4, 1.5, 2.3, 0.3, 0.8, 0.5, 0.3, 0.2, 0.1, 0.8),
-        use="bittering",
-    ),
-)
+@dataclass(frozen=True)
+class HopSubstitutionBatchResult:
+    results: tuple[HopSubstitutionResult, ...]
+    unresolved_target_names: tuple[str, ...]
+    pool: HopCandidatePool
+
+
+_DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "hop_catalog.json"
+
+# Magic, sha256 of the source file, hop count.
+_INDEX_HEADER = struct.Struct("<8s32sI")
+_INDEX_MAGIC = b"BPHOPIX1"
+
+# Pass as `available_hop_names` to search the whole catalog instead of a candidate list.
+ANY_HOP_CANDIDATES = "any"
+# Flavor is 65% of the substitution score, so the ANN search over-fetches flavor neighbours
+# and re-scores them with descriptors and alpha acids before taking the top k.
+_ANY_CANDIDATE_OVERFETCH = 10
+
+# Fuzzy matches below this confidence (1 - edit distance / longer length) stay unresolved.
+MIN_HOP_NAME_CONFIDENCE = 0.75
+# A misspelt noise word ("pelets") around an exact hop name.
+_NOISE_TYPO_CONFIDENCE = 0.95
+_FUZZY_CANDIDATE_LIMIT = 8
+_UNRESOLVED: tuple[int, float] = (-1, 0.0)
+
+MAX_HOP_BLEND_SIZE = 3
+# Blends are only built from the hops most similar to the target; pairs of near-identical
+# hops are skipped, and triples only extend the best-scoring pairs.
+_BLEND_SHORTLIST_SIZE = 10
+_BLEND_TRIPLE_SEED_PAIRS = 6
+_BLEND_DUPLICATE_SIMILARITY = 0.98
+# Weight of the alpha-acid row in the blend least squares, in flavor-vector units per % alpha acid.
+_BLEND_ALPHA_WEIGHT = 0.3
+# A component below this share is noise; the smaller blend without it is scored on its own.
+_MIN_BLEND_SHARE = 0.1
 
 _SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
+_T90_PATTERN = re.compile(r"\bt[\s-]?90\b")
 _NOISE_TOKENS = {"hop", "hops", "pellet", "pellets", "t90", "wholecone", "whole", "leaf", "cryo"}
-
-_HOPS_BY_ALIAS: dict[str, HopProfile] = {}
-for _hop in _HOP_PROFILES:
-    canonical = _SEPARATOR_PATTERN.sub(" ", _hop.name.lower()).strip()
-    _HOPS_BY_ALIAS[canonical] = _hop
-    for _alias in _hop.aliases:
-        _HOPS_BY_ALIAS[_SEPARATOR_PATTERN.sub(" ", _alias.lower()).strip()] = _hop
+_TYPO_PRONE_NOISE_TOKENS = tuple(token for token in _NOISE_TOKENS if len(token) >= 5)
 
 
+@lru_cache(maxsize=4096)
 def normalize_hop_name(name: str) -> str:
-    raw_tokens = [token for token in _SEPARATOR_PATTERN.split(name.lower().strip()) if token]
+    raw_tokens = [token for token in _SEPARATOR_PATTERN.split(_T90_PATTERN.sub(" ", name.lower().strip())) if token]
     kept_tokens = [token for token in raw_tokens if token not in _NOISE_TOKENS]
     return " ".join(kept_tokens)
 
 
-def resolve_hop_profile(name: str) -> HopProfile | None:
-    normalized = normalize_hop_name(name)
-    if not normalized:
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+def _edit_distance(left: str, right: str) -> int:
+    """Optimal string alignment distance: insertions, deletions, substitutions and adjacent swaps."""
+    before_previous: list[int] = []
+    previous = list(range(len(right) + 1))
+    for row, left_char in enumerate(left, start=1):
+        current = [row, *([0] * len(right))]
+        for column, right_char in enumerate(right, start=1):
+            current[column] = min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (left_char != right_char),
+            )
+            if row > 1 and column > 1 and left_char == right[column - 2] and left[row - 2] == right_char:
+                current[column] = min(current[column], before_previous[column - 2] + 1)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+def _fuzzy_resolve(catalog: HopCatalog, normalized: str) -> tuple[int, float] | None:
+    key = " ".join(
+        token
+        for token in normalized.split()
+        if len(token) < 5 or all(_edit_distance(token, noise) > 1 for noise in _TYPO_PRONE_NOISE_TOKENS)
+    )
+    if not key:
         return None
-    return _HOPS_BY_ALIAS.get(normalized)
+    if key != normalized and key in catalog.index_by_alias:
+        return catalog.index_by_alias[key], _NOISE_TYPO_CONFIDENCE
+
+    shared_counts: Counter[int] = Counter()
+    for trigram in _trigrams(key):
+        shared_counts.update(catalog.alias_trigrams.get(trigram, ()))
+    shortlist = sorted(shared_counts.items(), key=lambda item: (-item[1], item[0]))[:_FUZZY_CANDIDATE_LIMIT]
+
+    best: tuple[int, float] | None = None
+    for position, _ in shortlist:
+        alias = catalog.alias_keys[position]
+        confidence = round(1.0 - _edit_distance(key, alias) / max(len(key), len(alias)), 3)
+        if confidence >= MIN_HOP_NAME_CONFIDENCE and (best is None or confidence > best[1]):
+            best = (catalog.alias_owners[position], confidence)
+    return best
+
+
+def _parse_hop_profiles(payload: object) -> tuple[HopProfile, ...]:
+    if not isinstance(payload, dict) or not isinstance(payload.get("hops"), list):
+        raise ValueError("Hop catalog must be an object with a 'hops' list.")
+
+    hops: list[HopProfile] = []
+    for position, row in enumerate(payload["hops"]):
+        try:
+            hop = HopProfile(
+                name=str(row["name"]).strip(),
+                aliases=tuple(str(alias) for alias in row.get("aliases", ())),
+                alpha_acid_min_pct=float(row["alpha_acid_min_pct"]),
+                alpha_acid_max_pct=float(row["alpha_acid_max_pct"]),
+                flavor_descriptors=tuple(str(descriptor) for descriptor in row.get("flavor_descriptors", ())),
+                flavor_vector=tuple(float(value) for value in row["flavor_vector"]),
+                use=str(row.get("use", "dual-purpose")),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Hop catalog entry {position} is invalid: {exc}") from exc
+
+        if not hop.name:
+            raise ValueError(f"Hop catalog entry {position} has an empty name.")
+        if hop.alpha_acid_min_pct > hop.alpha_acid_max_pct:
+            raise ValueError(f"Hop '{hop.name}' has alpha_acid_min_pct above alpha_acid_max_pct.")
+        if hops and len(hop.flavor_vector) != len(hops[0].flavor_vector):
+            raise ValueError(f"Hop '{hop.name}' has a flavor_vector of a different length.")
+        hops.append(hop)
+
+    if not hops:
+        raise ValueError("Hop catalog has no hops.")
+    return tuple(hops)
+
+
+def _flavor_norms(hops: tuple[HopProfile, ...]) -> array:
+    return array("d", (math.sqrt(sum(value * value for value in hop.flavor_vector)) for hop in hops))
+
+
+def _flavor_similarity_matrix(hops: tuple[HopProfile, ...]) -> array:
+    size = len(hops)
+    norms = _flavor_norms(hops)
+    matrix = array("d", bytes(8 * size * size))
+    for left in range(size):
+        matrix[left * size + left] = 1.0 if norms[left] else 0.0
+        for right in range(left + 1, size):
+            norm_product = norms[left] * norms[right]
+            dot_product = sum(a * b for a, b in zip(hops[left].flavor_vector, hops[right].flavor_vector))
+            similarity = dot_product / norm_product if norm_product else 0.0
+            matrix[left * size + right] = similarity
+            matrix[right * size + left] = similarity
+    return matrix
+
+
+def _read_index(index_path: Path, *, digest: bytes, size: int) -> array | None:
+    try:
+        with index_path.open("rb") as handle:
+            header = handle.read(_INDEX_HEADER.size)
+            if len(header) != _INDEX_HEADER.size or _INDEX_HEADER.unpack(header) != (_INDEX_MAGIC, digest, size):
+                return None
+            matrix = array("d")
+            matrix.fromfile(handle, size * size)
+    except (OSError, EOFError):
+        return None
+    if sys.byteorder != "little":
+        matrix.byteswap()
+    return matrix
+
+
+def _write_index(index_path: Path, *, digest: bytes, matrix: array, size: int) -> None:
+    stored = array("d", matrix)
+    if sys.byteorder != "little":
+        stored.byteswap()
+    temporary_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with temporary_path.open("wb") as handle:
+            handle.write(_INDEX_HEADER.pack(_INDEX_MAGIC, digest, size))
+            stored.tofile(handle)
+        os.replace(temporary_path, index_path)
+    except OSError:
+        # The index is only a startup cache; a read-only location just means recompiling next time.
+        logger.warning("Could not write hop catalog index to %s", index_path)
+        temporary_path.unlink(missing_ok=True)
+
+
+def load_hop_catalog(path: Path, *, index_path: Path | None = None) -> HopCatalog:
+    """Parse a JSON hop catalog and compile it, reusing the binary index when it matches the file."""
+    raw = path.read_bytes()
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Hop catalog {path} is not valid JSON: {exc}") from exc
+    hops = _parse_hop_profiles(payload)
+
+    index_by_alias: dict[str, int] = {}
+    for position, hop in enumerate(hops):
+        for alias in (hop.name, *hop.aliases):
+            normalized = _SEPARATOR_PATTERN.sub(" ", alias.lower()).strip()
+            owner = index_by_alias.setdefault(normalized, position)
+            if owner != position:
+                raise ValueError(f"Hop alias '{alias}' is used by both '{hops[owner].name}' and '{hop.name}'.")
+
+    alias_trigrams: dict[str, list[int]] = {}
+    for position, alias_key in enumerate(index_by_alias):
+        for trigram in _trigrams(alias_key):
+            alias_trigrams.setdefault(trigram, []).append(position)
+
+    descriptors = tuple(sorted({descriptor for hop in hops for descriptor in hop.flavor_descriptors}))
+    descriptor_bits = {descriptor: 1 << bit for bit, descriptor in enumerate(descriptors)}
+
+    digest = hashlib.sha256(raw).digest()
+    matrix = _read_index(index_path, digest=digest, size=len(hops)) if index_path is not None else None
+    if matrix is None:
+        matrix = _flavor_similarity_matrix(hops)
+        if index_path is not None:
+            _write_index(index_path, digest=digest, matrix=matrix, size=len(hops))
+
+    return HopCatalog(
+        hops=hops,
+        index_by_alias=index_by_alias,
+        descriptors=descriptors,
+        descriptor_masks=tuple(
+            sum(descriptor_bits[descriptor] for descriptor in set(hop.flavor_descriptors)) for hop in hops
+        ),
+        alpha_midpoints=array("d", (_alpha_midpoint(hop) for hop in hops)),
+        flavor_norms=_flavor_norms(hops),
+        flavor_similarity=matrix,
+        alias_keys=tuple(index_by_alias),
+        alias_owners=tuple(index_by_alias.values()),
+        alias_trigrams={trigram: tuple(positions) for trigram, positions in alias_trigrams.items()},
+    )
 
 
-def recommend_hop_substitutions(
-    *,
-    target_hop_name: str,
-    available_hop_names: list[str],
-    top_k: int = 5,
-) -> HopSubstitutionResult:
-    target_hop = resolve_hop_profile(target_hop_name)
-    if target_hop is None:
-        raise ValueError("Target hop is not recognized by the flavor catalog.")
+def _catalog_paths() -> tuple[Path, Path]:
+    catalog_path = Path(settings.hop_catalog_path) if settings.hop_catalog_path else _DEFAULT_CATALOG_PATH
+    if settings.hop_catalog_index_path:
+        return catalog_path, Path(settings.hop_catalog_index_path)
+    path_digest = hashlib.sha1(str(catalog_path.resolve()).encode()).hexdigest()[:12]
+    return catalog_path, Path(tempfile.gettempdir()) / f"brewpilot-hop-catalog-{path_digest}.idx"
+
+
+_catalog_lock = Lock()
+_loaded_catalog: tuple[tuple[str, int, int], HopCatalog] | None = None
+
+
+def get_hop_catalog() -> HopCatalog:
+    """Return the compiled catalog, reloading it when the data file's mtime or size changes.
+
+    A reload that fails (bad JSON, invalid entry) keeps serving the previous catalog.
+    """
+    global _loaded_catalog
+
+    catalog_path, index_path = _catalog_paths()
+    stat = catalog_path.stat()
+    fingerprint = (str(catalog_path), stat.st_mtime_ns, stat.st_size)
+    loaded = _loaded_catalog
+    if loaded is not None and loaded[0] == fingerprint:
+        return loaded[1]
+
+    with _catalog_lock:
+        loaded = _loaded_catalog
+        if loaded is not None and loaded[0] == fingerprint:
+            return loaded[1]
+        try:
+            catalog = load_hop_catalog(catalog_path, index_path=index_path)
+        except (OSError, ValueError):
+            if loaded is None:
+                raise
+            logger.exception("Hop catalog reload from %s failed; keeping the previous catalog", catalog_path)
+            catalog = loaded[1]
+        _loaded_catalog = (fingerprint, catalog)
+        return catalog
+
 
+_flavor_index_lock = Lock()
+_loaded_flavor_index: tuple[HopCatalog, HopFlavorIndex] | None = None
+
+
+def get_hop_flavor_index(catalog: HopCatalog) -> HopFlavorIndex:
+    """ANN index over the catalog's flavor vectors, rebuilt when the catalog is reloaded."""
+    global _loaded_flavor_index
+
+    loaded = _loaded_flavor_index
+    if loaded is not None and loaded[0] is catalog:
+        return loaded[1]
+    with _flavor_index_lock:
+        loaded = _loaded_flavor_index
+        if loaded is None or loaded[0] is not catalog:
+            loaded = (catalog, HopFlavorIndex([hop.flavor_vector for hop in catalog.hops]))
+            _loaded_flavor_index = loaded
+        return loaded[1]
+
+
+def resolve_hop_profile(name: str) -> HopProfile | None:
+    catalog = get_hop_catalog()
+    index = catalog.resolve_index(name)
+    return None if index is None else catalog.hops[index]
+
+
+def build_hop_candidate_pool(names: Sequence[str], *, catalog: HopCatalog | None = None) -> HopCandidatePool:
+    catalog = catalog or get_hop_catalog()
+    resolved: list[HopNameResolution] = []
     unresolved: list[str] = []
-    candidates: list[HopSubstitutionCandidate] = []
     seen_normalized: set[str] = set()
 
-    for candidate_name in available_hop_names:
-        normalized_name = normalize_hop_name(candidate_name)
+    for name in names:
+        normalized_name = normalize_hop_name(name)
         if not normalized_name or normalized_name in seen_normalized:
             continue
         seen_normalized.add(normalized_name)
 
-        candidate_hop = resolve_hop_profile(candidate_name)
-        if candidate_hop is None:
-            unresolved.append(candidate_name)
+        resolution = catalog.resolve(name)
+        if resolution is None:
+            unresolved.append(name)
             continue
-        if candidate_hop.name == target_hop.name:
+        hop_index, confidence = resolution
+        resolved.append(
+            HopNameResolution(
+                input_name=name,
+                normalized_name=normalized_name,
+                hop_index=hop_index,
+                hop_name=catalog.hops[hop_index].name,
+                confidence=confidence,
+            )
+        )
+
+    return HopCandidatePool(
+        catalog=catalog,
+        input_names=tuple(names),
+        resolved=tuple(resolved),
+        unresolved_hop_names=tuple(unresolved),
+    )
+
+
+def merge_hop_candidate_pools(*pools: HopCandidatePool) -> HopCandidatePool:
+    """Concatenate pools in order; a name already seen in an earlier pool is dropped, as in one list."""
+    catalog = get_hop_catalog()
+    if any(pool.catalog is not catalog for pool in pools):
+        return build_hop_candidate_pool([name for pool in pools for name in pool.input_names], catalog=catalog)
+
+    resolved: list[HopNameResolution] = []
+    unresolved: list[str] = []
+    seen_normalized: set[str] = set()
+    for pool in pools:
+        for resolution in pool.resolved:
+            if resolution.normalized_name not in seen_normalized:
+                seen_normalized.add(resolution.normalized_name)
+                resolved.append(resolution)
+        for name in pool.unresolved_hop_names:
+            normalized_name = normalize_hop_name(name)
+            if normalized_name not in seen_normalized:
+                seen_normalized.add(normalized_name)
+                unresolved.append(name)
+
+    return HopCandidatePool(
+        catalog=catalog,
+        input_names=tuple(name for pool in pools for name in pool.input_names),
+        resolved=tuple(resolved),
+        unresolved_hop_names=tuple(unresolved),
+    )
+
+
+def recommend_hop_substitutions(
+    *,
+    target_hop_name: str,
+    available_hop_names: Sequence[str] | HopCandidatePool | Literal["any"],
+    top_k: int = 5,
+    blend_max_hops: int = 1,
+) -> HopSubstitutionResult:
+    """Rank single-hop substitutes for the target.
+
+    With ``blend_max_hops`` of 2 or 3, also return blends of that many candidate hops that
+    approximate the target better than the best single substitute.
+    """
+    _check_blend_size(blend_max_hops)
+    catalog = get_hop_catalog()
+    target_resolution = catalog.resolve(target_hop_name)
+    if target_resolution is None:
+        raise ValueError("Target hop is not recognized by the flavor catalog.")
+    target_index, target_confidence = target_resolution
+
+    if available_hop_names == ANY_HOP_CANDIDATES:
+        neighbours = get_hop_flavor_index(catalog).query(
+            catalog.hops[target_index].flavor_vector,
+            k=max(top_k * _ANY_CANDIDATE_OVERFETCH, _BLEND_SHORTLIST_SIZE),
+            exclude=frozenset({target_index}),
+        )
+        scored = [
+            _score_candidate(catalog, target_index=target_index, candidate_index=candidate_index)
+            for candidate_index, _ in neighbours
+        ]
+        substitutions = tuple(heapq.nsmallest(top_k, scored, key=lambda row: (-row.similarity_score, row.name)))
+        return HopSubstitutionResult(
+            target_hop=catalog.hops[target_index],
+            substitutions=substitutions,
+            unresolved_hop_names=(),
+            recognized_candidate_count=len(catalog) - 1,
+            target_confidence=target_confidence,
+            blends=_rank_blends(
+                catalog,
+                target_index=target_index,
+                candidate_indices=[candidate_index for candidate_index, _ in neighbours],
+                max_hops=blend_max_hops,
+                top_k=top_k,
+                score_to_beat=substitutions[0].similarity_score if substitutions else 0.0,
+            ),
+        )
+
+    pool = _pool_for_catalog(available_hop_names, catalog)
+    return _rank_pool(
+        catalog,
+        target_index=target_index,
+        target_confidence=target_confidence,
+        pool=pool,
+        top_k=top_k,
+        blend_max_hops=blend_max_hops,
+    )
+
+
+def recommend_hop_substitutions_batch(
+    *,
+    target_hop_names: Sequence[str],
+    available_hop_names: Sequence[str] | HopCandidatePool,
+    top_k: int = 5,
+    blend_max_hops: int = 1,
+) -> HopSubstitutionBatchResult:
+    """Rank one resolved candidate pool against many targets.
+
+    Candidates are resolved once and each target reads its row of the precomputed
+    similarity matrix, so N targets cost one pool resolution plus N row scans.
+    """
+    _check_blend_size(blend_max_hops)
+    catalog = get_hop_catalog()
+    pool = _pool_for_catalog(available_hop_names, catalog)
+
+    results: list[HopSubstitutionResult] = []
+    unresolved_targets: list[str] = []
+    for target_hop_name in target_hop_names:
+        target_resolution = catalog.resolve(target_hop_name)
+        if target_resolution is None:
+            unresolved_targets.append(target_hop_name)
             continue
-        candidates.append(_score_candidate(target_hop=target_hop, candidate_hop=candidate_hop))
+        target_index, target_confidence = target_resolution
+        results.append(
+            _rank_pool(
+                catalog,
+                target_index=target_index,
+                target_confidence=target_confidence,
+                pool=pool,
+                top_k=top_k,
+                blend_max_hops=blend_max_hops,
+            )
+        )
+
+    return HopSubstitutionBatchResult(
+        results=tuple(results),
+        unresolved_target_names=tuple(unresolved_targets),
+        pool=pool,
+    )
 
-    candidates.sort(key=lambda row: (-row.similarity_score, row.name))
+
+def _check_blend_size(blend_max_hops: int) -> None:
+    if not 1 <= blend_max_hops <= MAX_HOP_BLEND_SIZE:
+        raise ValueError(f"Hop blends can combine at most {MAX_HOP_BLEND_SIZE} hops.")
+
+
+def _pool_for_catalog(available_hop_names: Sequence[str] | HopCandidatePool, catalog: HopCatalog) -> HopCandidatePool:
+    if isinstance(available_hop_names, HopCandidatePool):
+        if available_hop_names.catalog is catalog:
+            return available_hop_names
+        return build_hop_candidate_pool(available_hop_names.input_names, catalog=catalog)
+    return build_hop_candidate_pool(available_hop_names, catalog=catalog)
+
+
+def _rank_pool(
+    catalog: HopCatalog,
+    *,
+    target_index: int,
+    target_confidence: float,
+    pool: HopCandidatePool,
+    top_k: int,
+    blend_max_hops: int = 1,
+) -> HopSubstitutionResult:
+    candidates = [
+        _score_candidate(catalog, target_index=target_index, candidate_index=resolution.hop_index)
+        for resolution in pool.resolved
+        if resolution.hop_index != target_index
+    ]
+    top_candidates = heapq.nsmallest(top_k, candidates, key=lambda row: (-row.similarity_score, row.name))
 
     return HopSubstitutionResult(
-        target_hop=target_hop,
-        substitutions=tuple(candidates[:top_k]),
-        unresolved_hop_names=tuple(unresolved),
+        target_hop=catalog.hops[target_index],
+        substitutions=tuple(top_candidates),
+        unresolved_hop_names=pool.unresolved_hop_names,
         recognized_candidate_count=len(candidates),
+        target_confidence=target_confidence,
+        resolved_candidates=pool.resolved,
+        blends=_rank_blends(
+            catalog,
+            target_index=target_index,
+            candidate_indices=[resolution.hop_index for resolution in pool.resolved],
+            max_hops=blend_max_hops,
+            top_k=top_k,
+            score_to_beat=top_candidates[0].similarity_score if top_candidates else 0.0,
+        ),
     )
 
 
-def _score_candidate(*, target_hop: HopProfile, candidate_hop: HopProfile) -> HopSubstitutionCandidate:
-    flavor_similarity = _cosine_similarity(target_hop.flavor_vector, candidate_hop.flavor_vector)
-
-    target_descriptors = set(target_hop.flavor_descriptors)
-    candidate_descriptors = set(candidate_hop.flavor_descriptors)
-    shared_descriptors = tuple(sorted(target_descriptors.intersection(candidate_descriptors)))
-    descriptor_overlap = len(shared_descriptors) / len(target_descriptors) if target_descriptors else 0.0
+def _score_candidate(catalog: HopCatalog, *, target_index: int, candidate_index: int) -> HopSubstitutionCandidate:
+    target_hop = catalog.hops[target_index]
+    candidate_hop = catalog.hops[candidate_index]
+    flavor_similarity = catalog.flavor_similarity[target_index * len(catalog) + candidate_index]
+    descriptor_overlap, shared_descriptors = _descriptor_overlap(
+        catalog, target_index=target_index, candidate_mask=catalog.descriptor_masks[candidate_index]
+    )
 
-    target_alpha_mid = _alpha_midpoint(target_hop)
-    candidate_alpha_mid = _alpha_midpoint(candidate_hop)
-    alpha_gap_ratio = abs(candidate_alpha_mid - target_alpha_mid) / max(target_alpha_mid, 0.1)
-    alpha_similarity = max(0.0, 1.0 - min(alpha_gap_ratio, 1.0))
+    target_alpha_mid = catalog.alpha_midpoints[target_index]
+    candidate_alpha_mid = catalog.alpha_midpoints[candidate_index]
+    alpha_similarity = _alpha_similarity(target_alpha_mid, candidate_alpha_mid)
 
     use_bonus = 0.05 if target_hop.use == candidate_hop.use else 0.0
     similarity_score = min(1.0, (0.65 * flavor_similarity) + (0.2 * descriptor_overlap) + (0.15 * alpha_similarity) + use_bonus)
@@ -274,14 +674,157 @@ def _score_candidate(*, target_hop: HopProfile, candidate_hop: HopProfile) -> Ho
     )
 
 
-def _alpha_midpoint(hop: HopProfile) -> float:
-    return (hop.alpha_acid_min_pct + hop.alpha_acid_max_pct) / 2.0
+def _descriptor_overlap(catalog: HopCatalog, *, target_index: int, candidate_mask: int) -> tuple[float, tuple[str, ...]]:
+    target_mask = catalog.descriptor_masks[target_index]
+    shared_mask = target_mask & candidate_mask
+    target_descriptor_count = target_mask.bit_count()
+    descriptor_overlap = shared_mask.bit_count() / target_descriptor_count if target_descriptor_count else 0.0
+    shared_descriptors = tuple(
+        descriptor for bit, descriptor in enumerate(catalog.descriptors) if shared_mask >> bit & 1
+    )
+    return descriptor_overlap, shared_descriptors
+
 
+def _alpha_similarity(target_alpha_mid: float, candidate_alpha_mid: float) -> float:
+    alpha_gap_ratio = abs(candidate_alpha_mid - target_alpha_mid) / max(target_alpha_mid, 0.1)
+    return max(0.0, 1.0 - min(alpha_gap_ratio, 1.0))
+
+
+def _rank_blends(
+    catalog: HopCatalog,
+    *,
+    target_index: int,
+    candidate_indices: Sequence[int],
+    max_hops: int,
+    top_k: int,
+    score_to_beat: float,
+) -> tuple[HopBlendCandidate, ...]:
+    """Search pairs (and triples) of candidates for blends that beat the best single hop.
+
+    Only the ``_BLEND_SHORTLIST_SIZE`` candidates closest to the target, by its row of the
+    similarity matrix, are blended, so the work is bounded however large the pool is:
+    45 pairs plus at most 60 triples, each a closed-form solve of a 2x2 or 3x3 system.
+    """
+    if max_hops < 2:
+        return ()
+
+    size = len(catalog)
+    target_row = target_index * size
+    shortlist = heapq.nlargest(
+        _BLEND_SHORTLIST_SIZE,
+        set(candidate_indices) - {target_index},
+        key=lambda index: (catalog.flavor_similarity[target_row + index], -index),
+    )
+
+    def distinct(left: int, right: int) -> bool:
+        return catalog.flavor_similarity[left * size + right] < _BLEND_DUPLICATE_SIMILARITY
+
+    scored: dict[tuple[int, ...], HopBlendCandidate] = {}
+    for members in itertools.combinations(sorted(shortlist), 2):
+        if distinct(*members):
+            blend = _score_blend(catalog, target_index=target_index, members=members)
+            if blend is not None:
+                scored[members] = blend
+
+    if max_hops >= 3:
+        seed_pairs = heapq.nsmallest(_BLEND_TRIPLE_SEED_PAIRS, scored, key=lambda members: -scored[members].similarity_score)
+        for pair in seed_pairs:
+            for extra in shortlist:
+                members = tuple(sorted((*pair, extra)))
+                if extra in pair or members in scored or not all(distinct(extra, member) for member in pair):
+                    continue
+                blend = _score_blend(catalog, target_index=target_index, members=members)
+                if blend is not None:
+                    scored[members] = blend
+
+    improving = [blend for blend in scored.values() if blend.similarity_score > score_to_beat]
+    return tuple(
+        heapq.nsmallest(
+            top_k,
+            improving,
+            key=lambda blend: (-blend.similarity_score, tuple(component.name for component in blend.components)),
+        )
+    )
+
+
+def _score_blend(catalog: HopCatalog, *, target_index: int, members: tuple[int, ...]) -> HopBlendCandidate | None:
+    """Fit non-negative hop weights to the target's flavor vector and alpha acid.
+
+    Minimises ||sum(w_i * v_i) - v_target||^2 + (k * sum(w_i * a_i) - k * a_target)^2 through
+    the normal equations, whose Gram entries come straight from the similarity matrix and
+    flavor norms. If the unconstrained optimum has a non-positive weight, the non-negative
+    optimum sits on a face of the feasible region, i.e. a smaller blend, which is scored
+    separately; so only all-positive solutions are kept.
+    """
+    alpha_weight_sq = _BLEND_ALPHA_WEIGHT * _BLEND_ALPHA_WEIGHT
+    alphas = catalog.alpha_midpoints
+    gram = [
+        [_flavor_dot(catalog, left, right) + alpha_weight_sq * alphas[left] * alphas[right] for right in members]
+        for left in members
+    ]
+    rhs = [
+        _flavor_dot(catalog, member, target_index) + alpha_weight_sq * alphas[member] * alphas[target_index]
+        for member in members
+    ]
+    weights = solve_linear_system(gram, rhs)
+    if weights is None or min(weights) <= 0:
+        return None
+    total_weight = sum(weights)
+    proportions = [weight / total_weight for weight in weights]
+    if min(proportions) < _MIN_BLEND_SHARE:
+        return None
+
+    target_norm = catalog.flavor_norms[target_index]
+    blend_dot_target = sum(
+        proportion * _flavor_dot(catalog, member, target_index) for proportion, member in zip(proportions, members)
+    )
+    blend_norm_sq = sum(
+        left_share * right_share * _flavor_dot(catalog, left, right)
+        for left_share, left in zip(proportions, members)
+        for right_share, right in zip(proportions, members)
+    )
+    blend_norm = math.sqrt(max(blend_norm_sq, 0.0))
+    flavor_similarity = blend_dot_target / (blend_norm * target_norm) if blend_norm and target_norm else 0.0
+
+    blend_mask = 0
+    for member in members:
+        blend_mask |= catalog.descriptor_masks[member]
+    descriptor_overlap, shared_descriptors = _descriptor_overlap(
+        catalog, target_index=target_index, candidate_mask=blend_mask
+    )
+
+    target_alpha_mid = alphas[target_index]
+    blend_alpha_mid = sum(proportion * alphas[member] for proportion, member in zip(proportions, members))
+    alpha_similarity = _alpha_similarity(target_alpha_mid, blend_alpha_mid)
 
-def _cosine_similarity(left: tuple[float, ...], right: tuple[float, ...]) -> float:
-    numerator = sum(a * b for a, b in zip(left, right))
-    left_norm = math.sqrt(sum(value * value for value in left))
-    right_norm = math.sqrt(sum(value * value for value in right))
-    if left_norm == 0 or right_norm == 0:
-        return 0.0
-    return numerator / (left_norm * right_norm)
+    target_use = catalog.hops[target_index].use
+    use_bonus = 0.05 * sum(
+        proportion for proportion, member in zip(proportions, members) if catalog.hops[member].use == target_use
+    )
+    similarity_score = min(1.0, (0.65 * flavor_similarity) + (0.2 * descriptor_overlap) + (0.15 * alpha_similarity) + use_bonus)
+
+    components = sorted(
+        (
+            HopBlendComponent(name=catalog.hops[member].name, proportion=round(proportion, 3))
+            for proportion, member in zip(proportions, members)
+        ),
+        key=lambda component: (-component.proportion, component.name),
+    )
+    return HopBlendCandidate(
+        components=tuple(components),
+        blend_alpha_acid_pct=round(blend_alpha_mid, 2),
+        flavor_similarity_score=round(flavor_similarity, 3),
+        descriptor_overlap_score=round(descriptor_overlap, 3),
+        similarity_score=round(similarity_score, 3),
+        recommended_bittering_ratio=round(target_alpha_mid / max(blend_alpha_mid, 0.1), 3),
+        shared_descriptors=shared_descriptors,
+    )
+
+
+def _flavor_dot(catalog: HopCatalog, left: int, right: int) -> float:
+    cosine = catalog.flavor_similarity[left * len(catalog) + right]
+    return cosine * catalog.flavor_norms[left] * catalog.flavor_norms[right]
+
+
+def _alpha_midpoint(hop: HopProfile) -> float:
+    return (hop.alpha_acid_min_pct + hop.alpha_acid_max_pct) / 2.0
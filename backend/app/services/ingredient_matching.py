@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.ingredient_profile import IngredientProfile
+from app.models.inventory import InventoryItem
+from app.services.cache import LRUCache
+
+DEFAULT_MIN_SCORE = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+(?:\.\d+)?")
+_TRIGRAM_WEIGHT = 0.7
+_TOKEN_WEIGHT = 0.3
+
+
+@dataclass(frozen=True)
+class IngredientNameEntry:
+    source: str
+    id: int
+    name: str
+    ingredient_type: str
+    unit: str
+    key: str
+    tokens: frozenset[str]
+    trigrams: frozenset[str]
+
+
+@dataclass(frozen=True)
+class IngredientNameMatch:
+    entry: IngredientNameEntry
+    score: float
+
+
+@lru_cache(maxsize=4096)
+def normalize_ingredient_key(name: str) -> str:
+    """Lowercase alphanumeric tokens joined by spaces: "Pale Malt (2-Row)" -> "pale malt 2 row"."""
+    return " ".join(_TOKEN_PATTERN.findall(name.lower()))
+
+
+def _trigrams(key: str) -> frozenset[str]:
+    padded = f"  {key} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+class IngredientNameIndex:
+    """Token and trigram postings over one user's inventory and ingredient profile names."""
+
+    def __init__(self, entries: list[IngredientNameEntry]) -> None:
+        self._entries = entries
+        self._by_key: dict[str, list[int]] = {}
+        self._trigram_postings: dict[str, list[int]] = {}
+        for position, entry in enumerate(entries):
+            self._by_key.setdefault(entry.key, []).append(position)
+            for trigram in entry.trigrams:
+                self._trigram_postings.setdefault(trigram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self,
+        name: str,
+        *,
+        ingredient_type: str | None = None,
+        source: str | None = None,
+        limit: int = 5,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> list[IngredientNameMatch]:
+        key = normalize_ingredient_key(name)
+        if not key:
+            return []
+
+        wanted_type = ingredient_type.strip().lower() if ingredient_type else None
+
+        def accepts(entry: IngredientNameEntry) -> bool:
+            if source is not None and entry.source != source:
+                return False
+            return wanted_type is None or entry.ingredient_type.strip().lower() == wanted_type
+
+        exact = [self._entries[position] for position in self._by_key.get(key, []) if accepts(self._entries[position])]
+        if exact:
+            return [IngredientNameMatch(entry=entry, score=1.0) for entry in _newest_first(exact)[:limit]]
+
+        query_trigrams = _trigrams(key)
+        query_tokens = frozenset(key.split())
+        shared_counts: Counter[int] = Counter()
+        for trigram in query_trigrams:
+            shared_counts.update(self._trigram_postings.get(trigram, ()))
+
+        matches: list[IngredientNameMatch] = []
+        for position, shared in shared_counts.items():
+            entry = self._entries[position]
+            # Skip candidates that cannot reach the threshold even with a perfect token score.
+            trigram_score = 2 * shared / (len(query_trigrams) + len(entry.trigrams))
+            if _TRIGRAM_WEIGHT * trigram_score + _TOKEN_WEIGHT < min_score or not accepts(entry):
+                continue
+
+            token_score = len(query_tokens & entry.tokens) / len(query_tokens | entry.tokens)
+            score = round(_TRIGRAM_WEIGHT * trigram_score + _TOKEN_WEIGHT * token_score, 4)
+            if score >= min_score:
+                matches.append(IngredientNameMatch(entry=entry, score=score))
+
+        matches.sort(key=lambda match: (-match.score, match.entry.source != "inventory", -match.entry.id))
+        return matches[:limit]
+
+
+def _newest_first(entries: list[IngredientNameEntry]) -> list[IngredientNameEntry]:
+    return sorted(entries, key=lambda entry: (entry.source != "inventory", -entry.id))
+
+
+def _entry(*, source: str, id: int, name: str, ingredient_type: str, unit: str) -> IngredientNameEntry:
+    key = normalize_ingredient_key(name)
+    return IngredientNameEntry(
+        source=source,
+        id=id,
+        name=name,
+        ingredient_type=ingredient_type,
+        unit=unit,
+        key=key,
+        tokens=frozenset(key.split()),
+        trigrams=_trigrams(key),
+    )
+
+
+# Keyed by user id; each value carries the version it was built from.
+_INDEX_CACHE: LRUCache[int, tuple[tuple[object, ...], IngredientNameIndex]] = LRUCache(maxsize=256)
+
+
+def _name_version(db: Session, user_id: int) -> tuple[object, ...]:
+    inventory_version = db.execute(
+        select(func.count(InventoryItem.id), func.max(InventoryItem.id), func.max(InventoryItem.updated_at)).where(
+            InventoryItem.owner_user_id == user_id
+        )
+    ).one()
+    profile_version = db.execute(
+        select(
+            func.count(IngredientProfile.id),
+            func.max(IngredientProfile.id),
+            func.max(IngredientProfile.updated_at),
+        ).where(IngredientProfile.owner_user_id == user_id)
+    ).one()
+    return (*inventory_version, *profile_version)
+
+
+def _build_index(db: Session, user_id: int) -> IngredientNameIndex:
+    entries = [
+        _entry(source="inventory", id=item_id, name=name, ingredient_type=ingredient_type, unit=unit)
+        for item_id, name, ingredient_type, unit in db.execute(
+            select(InventoryItem.id, InventoryItem.name, InventoryItem.ingredient_type, InventoryItem.unit).where(
+                InventoryItem.owner_user_id == user_id
+            )
+        )
+    ]
+    entries.extend(
+        _entry(source="profile", id=profile_id, name=name, ingredient_type=ingredient_type, unit=unit)
+        for profile_id, name, ingredient_type, unit in db.execute(
+            select(
+                IngredientProfile.id,
+                IngredientProfile.name,
+                IngredientProfile.ingredient_type,
+                IngredientProfile.default_unit,
+            ).where(IngredientProfile.owner_user_id == user_id)
+        )
+    )
+    return IngredientNameIndex(entries)
+
+
+def get_ingredient_name_index(db: Session, user_id: int) -> IngredientNameIndex:
+    """Return the user's name index, rebuilding it only when inventory or profiles changed.
+
+    The version key is (count, max id, max updated_at) for both tables, which changes on every
+    insert, delete and update, so a stale index is never served.
+    """
+    version = _name_version(db, user_id)
+    cached = _INDEX_CACHE.get(user_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = _build_index(db, user_id)
+    _INDEX_CACHE.put(user_id, (version, index))
+    return index
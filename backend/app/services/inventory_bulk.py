@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryItem, normalize_inventory_name
+from app.models.inventory_transaction import InventoryTransaction
+from app.schemas.inventory import (
+    InventoryBulkImportRead,
+    InventoryBulkRowErrorRead,
+    InventoryItemCreate,
+)
+
+INVENTORY_CSV_COLUMNS = ("name", "ingredient_type", "quantity", "unit", "low_stock_threshold")
+
+_UPSERT_CHUNK_SIZE = 500
+_MAX_REPORTED_ERRORS = 200
+_BULK_NOTE = "Bulk import"
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class InventoryCsvError(ValueError):
+    pass
+
+
+def iter_inventory_csv_rows(lines: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield (row number, raw values) from CSV text, numbering data rows from 1."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise InventoryCsvError("CSV body is empty")
+
+    columns = [column.strip().lower() for column in header]
+    missing = [column for column in INVENTORY_CSV_COLUMNS if column != "low_stock_threshold" and column not in columns]
+    if missing:
+        raise InventoryCsvError(f"CSV header is missing columns: {', '.join(missing)}")
+
+    for row_number, values in enumerate(reader, start=1):
+        if not any(value.strip() for value in values):
+            continue
+        yield row_number, {
+            column: value.strip()
+            for column, value in zip(columns, values, strict=False)
+            if column in INVENTORY_CSV_COLUMNS and value.strip()
+        }
+
+
+def _format_validation_error(exc: ValidationError) -> list[str]:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return messages
+
+
+def _validate_rows(
+    rows: Iterable[tuple[int, Any]],
+) -> tuple[dict[str, tuple[int, InventoryItemCreate]], list[InventoryBulkRowErrorRead], int]:
+    """Validate every row once; later rows with the same name replace earlier ones."""
+    valid_by_name: dict[str, tuple[int, InventoryItemCreate]] = {}
+    errors: list[InventoryBulkRowErrorRead] = []
+    received = 0
+
+    for row_number, raw in rows:
+        received += 1
+        try:
+            item = InventoryItemCreate.model_validate(raw)
+        except ValidationError as exc:
+            name = raw.get("name") if isinstance(raw, dict) else None
+            errors.append(
+                InventoryBulkRowErrorRead(
+                    row=row_number,
+                    name=name if isinstance(name, str) else None,
+                    errors=_format_validation_error(exc),
+                )
+            )
+            continue
+
+        superseded = valid_by_name.get(item.name)
+        if superseded is not None:
+            errors.append(
+                InventoryBulkRowErrorRead(
+                    row=superseded[0],
+                    name=item.name,
+                    errors=[f"Superseded by row {row_number} with the same name"],
+                )
+            )
+        valid_by_name[item.name] = (row_number, item)
+
+    return valid_by_name, errors, received
+
+
+def _chunks(items: list[InventoryItemCreate], size: int) -> Iterator[list[InventoryItemCreate]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _upsert_chunk(
+    db: Session,
+    *,
+    user_id: int,
+    chunk: list[InventoryItemCreate],
+    now: datetime,
+) -> list[tuple[int, str, float]]:
+    values = [
+        {
+            "owner_user_id": user_id,
+            "name": item.name,
+            "name_normalized": normalize_inventory_name(item.name),
+            "ingredient_type": item.ingredient_type,
+            "quantity": item.quantity,
+            "unit": item.unit,
+            "low_stock_threshold": item.low_stock_threshold,
+            "updated_at": now,
+        }
+        for item in chunk
+    ]
+
+    dialect_name = db.get_bind().dialect.name
+    dialect_insert = _DIALECT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        raise RuntimeError(f"Bulk inventory upsert is not supported on {dialect_name}")
+
+    # Core executemany lets SQLAlchemy batch the rows into multi-row INSERT ... RETURNING statements
+    # ("insertmanyvalues") while compiling the statement only once.
+    inventory_table = InventoryItem.__table__
+    statement = dialect_insert(inventory_table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[inventory_table.c.owner_user_id, inventory_table.c.name],
+        set_={
+            "ingredient_type": statement.excluded.ingredient_type,
+            "quantity": statement.excluded.quantity,
+            "unit": statement.excluded.unit,
+            "low_stock_threshold": statement.excluded.low_stock_threshold,
+            "updated_at": statement.excluded.updated_at,
+        },
+    ).returning(inventory_table.c.id, inventory_table.c.name, inventory_table.c.quantity)
+    return [(row[0], row[1], float(row[2])) for row in db.connection().execute(statement, values)]
+
+
+def bulk_upsert_inventory(
+    db: Session,
+    *,
+    user_id: int,
+    rows: Iterable[tuple[int, Any]],
+    chunk_size: int = _UPSERT_CHUNK_SIZE,
+) -> InventoryBulkImportRead:
+    """Validate rows in one pass, then upsert valid ones in chunked multi-row statements.
+
+    Rows that fail validation are reported and skipped; the valid rows are committed together and
+    every quantity change is written to the inventory ledger.
+    """
+    valid_by_name, errors, received = _validate_rows(rows)
+    items = [item for _, item in valid_by_name.values()]
+
+    created = 0
+    updated = 0
+    now = datetime.utcnow()
+    for chunk in _chunks(items, chunk_size):
+        previous_quantities = {
+            name: quantity
+            for name, quantity in db.execute(
+                select(InventoryItem.name, InventoryItem.quantity)
+                .where(
+                    InventoryItem.owner_user_id == user_id,
+                    InventoryItem.name.in_([item.name for item in chunk]),
+                )
+                .with_for_update()
+            )
+        }
+
+        ledger_rows: list[dict[str, Any]] = []
+        for item_id, name, quantity in _upsert_chunk(db, user_id=user_id, chunk=chunk, now=now):
+            quantity_before = previous_quantities.get(name)
+            if quantity_before is None:
+                created += 1
+                kind, quantity_delta = "restock", quantity
+            else:
+                updated += 1
+                kind, quantity_delta = "adjust", quantity - quantity_before
+                if quantity_delta == 0:
+                    continue
+
+            ledger_rows.append(
+                {
+                    "inventory_item_id": item_id,
+                    "owner_user_id": user_id,
+                    "kind": kind,
+                    "quantity_delta": round(quantity_delta, 6),
+                    "balance_after": round(quantity, 6),
+                    "batch_id": None,
+                    "note": _BULK_NOTE,
+                    "created_at": now,
+                }
+            )
+
+        if ledger_rows:
+            db.connection().execute(insert(InventoryTransaction.__table__), ledger_rows)
+
+    db.commit()
+
+    errors.sort(key=lambda error: error.row)
+    return InventoryBulkImportRead(
+        received=received,
+        created=created,
+        updated=updated,
+        error_count=len(errors),
+        errors=errors[:_MAX_REPORTED_ERRORS],
+    )
@@ -3,107 +3,63 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Float,
+    Integer,
+    String,
+    and_,
+    case,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import Session, aliased
 
 from app.models.batch import Batch
-from app.models.inventory import InventoryItem
+from app.models.inventory import InventoryItem, normalize_inventory_name
+from app.models.inventory_reservation import InventoryReservation
+from app.models.unit_conversion import UnitConversion
 from app.schemas.batch import (
+    BatchInventoryBulkConsumeRead,
     BatchInventoryConsumeItemRead,
     BatchInventoryConsumeRead,
     BatchInventoryPreviewRead,
     BatchInventoryRequirementRead,
 )
 from app.services.batch_snapshot import parse_snapshot_ingredients
-
-_UNIT_FACTORS_TO_BASE: dict[str, tuple[str, float]] = {
-    "g": ("mass", 1.0),
-    "kg": ("mass", 1000.0),
-    "oz": ("mass", 28.3495),
-    "lb": ("mass", 453.592),
-    "ml": ("volume", 1.0),
-    "l": ("volume", 1000.0),
-    "floz": ("volume", 29.5735),
-    "qt": ("volume", 946.353),
-    "gal": ("volume", 3785.41),
-    "pack": ("count", 1.0),
-    "each": ("count", 1.0),
-    "unit": ("count", 1.0),
-}
-
-_UNIT_ALIASES: dict[str, str] = {
-    "gram": "g",
-    "grams": "g",
-    "kgs": "kg",
-    "kilogram": "kg",
-    "kilograms": "kg",
-    "ounce": "oz",
-    "ounces": "oz",
-    "pound": "lb",
-    "pounds": "lb",
-    "liter": "l",
-    "liters": "l",
-    "litre": "l",
-    "litres": "l",
-    "fl oz": "floz",
-    "fluid ounce": "floz",
-    "fluid ounces": "floz",
-    "floz": "floz",
-    "quart": "qt",
-    "quarts": "qt",
-    "gallon": "gal",
-    "gallons": "gal",
-    "milliliter": "ml",
-    "milliliters": "ml",
-    "millilitre": "ml",
-    "millilitres": "ml",
-    "packs": "pack",
-}
+from app.services.ingredient_matching import get_ingredient_name_index
+from app.services.inventory_ledger import apply_inventory_delta
+from app.services.units import convert
 
 
 @dataclass
-class _Requirement:
+class BatchRequirement:
     name: str
     ingredient_type: str
     amount: float
     unit: str
 
 
-def _canonical_unit(unit: str) -> str:
-    lowered = unit.strip().lower()
-    if lowered in _UNIT_ALIASES:
-        return _UNIT_ALIASES[lowered]
-    return lowered
-
-
-def _convert_amount(amount: float, from_unit: str, to_unit: str) -> float | None:
-    from_canonical = _canonical_unit(from_unit)
-    to_canonical = _canonical_unit(to_unit)
-
-    if from_canonical == to_canonical:
-        return amount
-
-    from_meta = _UNIT_FACTORS_TO_BASE.get(from_canonical)
-    to_meta = _UNIT_FACTORS_TO_BASE.get(to_canonical)
-    if not from_meta or not to_meta:
-        return None
-
-    from_group, from_factor = from_meta
-    to_group, to_factor = to_meta
-    if from_group != to_group:
-        return None
-
-    value_in_base = amount * from_factor
-    return value_in_base / to_factor
+@dataclass(frozen=True)
+class _InventoryMatch:
+    inventory_item_id: int
+    name: str
+    unit: str
+    available_amount: float | None
+    score: float
 
 
 def _round(value: float) -> float:
     return round(value, 4)
 
 
-def _build_requirements(batch: Batch) -> list[_Requirement]:
+def build_batch_requirements(batch: Batch) -> list[BatchRequirement]:
     raw_ingredients = parse_snapshot_ingredients(batch)
 
-    aggregated: dict[tuple[str, str, str], _Requirement] = {}
+    aggregated: dict[tuple[str, str, str], BatchRequirement] = {}
     for ingredient in raw_ingredients:
         name = str(ingredient.get("name", "")).strip()
         ingredient_type = str(ingredient.get("ingredient_type", "")).strip()
@@ -123,7 +79,7 @@ def _build_requirements(batch: Batch) -> list[_Requirement]:
         key = (name.lower(), ingredient_type.lower(), unit.lower())
         existing = aggregated.get(key)
         if existing is None:
-            aggregated[key] = _Requirement(
+            aggregated[key] = BatchRequirement(
                 name=name,
                 ingredient_type=ingredient_type,
                 amount=amount,
@@ -156,43 +112,225 @@ def _failure_result(
     )
 
 
-def build_inventory_preview(db: Session, batch: Batch, user_id: int) -> BatchInventoryPreviewRead:
-    requirements = _build_requirements(batch)
+def _match_inventory(
+    db: Session,
+    requirements: list[BatchRequirement],
+    user_id: int,
+) -> dict[int, _InventoryMatch]:
+    """Match requirements to inventory in one query.
+
+    Requirements are joined to `inventory_items` on the indexed normalized name and both units are
+    resolved through `unit_conversions`, so only matched rows come back, already converted to the
+    requirement unit. Returns requirement index -> exact match.
+    """
+    if not requirements:
+        return {}
+
+    requirement_rows = union_all(
+        *[
+            select(
+                literal(index, Integer).label("requirement_index"),
+                literal(normalize_inventory_name(requirement.name), String).label("name_normalized"),
+                literal(requirement.unit.strip().lower(), String).label("unit_alias"),
+            )
+            for index, requirement in enumerate(requirements)
+        ]
+    ).cte("requirements")
+
+    inventory_unit = aliased(UnitConversion)
+    required_unit = aliased(UnitConversion)
+    inventory_unit_alias = func.lower(func.trim(InventoryItem.unit))
+    inventory_canonical = func.coalesce(inventory_unit.canonical_unit, inventory_unit_alias)
+    required_canonical = func.coalesce(required_unit.canonical_unit, requirement_rows.c.unit_alias)
+    available_amount = case(
+        (inventory_canonical == required_canonical, InventoryItem.quantity),
+        (
+            inventory_unit.dimension == required_unit.dimension,
+            (InventoryItem.quantity * inventory_unit.factor_to_base) / required_unit.factor_to_base,
+        ),
+        else_=literal(None, Float),
+    )
 
-    inventory_items = (
-        db.query(InventoryItem)
-        .filter(InventoryItem.owner_user_id == user_id)
-        .all()
+    statement = (
+        select(
+            requirement_rows.c.requirement_index,
+            InventoryItem.id,
+            InventoryItem.name,
+            InventoryItem.unit,
+            available_amount.label("available_amount"),
+        )
+        .select_from(requirement_rows)
+        .join(
+            InventoryItem,
+            and_(
+                InventoryItem.owner_user_id == user_id,
+                InventoryItem.name_normalized == requirement_rows.c.name_normalized,
+            ),
+        )
+        .outerjoin(inventory_unit, inventory_unit.alias == inventory_unit_alias)
+        .outerjoin(required_unit, required_unit.alias == requirement_rows.c.unit_alias)
+        .order_by(requirement_rows.c.requirement_index, InventoryItem.id)
     )
-    inventory_by_name = {
-        item.name.strip().lower(): item
-        for item in inventory_items
+
+    # Rows are ordered by item id so the newest item wins on duplicate normalized names,
+    # matching the previous name -> item dictionary behaviour.
+    matches: dict[int, _InventoryMatch] = {}
+    for requirement_index, inventory_item_id, name, unit, converted_amount in db.execute(statement):
+        matches[requirement_index] = _InventoryMatch(
+            inventory_item_id=inventory_item_id,
+            name=name,
+            unit=unit,
+            available_amount=converted_amount,
+            score=1.0,
+        )
+    return matches
+
+
+def _fuzzy_match_inventory(
+    db: Session,
+    requirements: list[BatchRequirement],
+    exact_matches: dict[int, _InventoryMatch],
+    user_id: int,
+) -> dict[int, _InventoryMatch]:
+    """Fall back to the cached name index for requirements without an exact name match.
+
+    A hit scoring 1.0 shares the requirement's punctuation-insensitive key ("Pale Malt" vs
+    "Pale-Malt") and is as good as an exact match. Anything lower is only a suggestion: the
+    preview reports it but never counts its stock, so consumption cannot deduct from it.
+    """
+    unmatched = [index for index in range(len(requirements)) if index not in exact_matches]
+    if not unmatched:
+        return {}
+
+    name_index = get_ingredient_name_index(db, user_id)
+    candidates: dict[int, tuple[int, str, float]] = {}
+    for index in unmatched:
+        requirement = requirements[index]
+        best = name_index.lookup(
+            requirement.name,
+            ingredient_type=requirement.ingredient_type or None,
+            source="inventory",
+            limit=1,
+        )
+        if best:
+            candidates[index] = (best[0].entry.id, best[0].entry.name, best[0].score)
+    if not candidates:
+        return {}
+
+    stock = {
+        item_id: (quantity, unit)
+        for item_id, quantity, unit in db.execute(
+            select(InventoryItem.id, InventoryItem.quantity, InventoryItem.unit).where(
+                InventoryItem.owner_user_id == user_id,
+                InventoryItem.id.in_({item_id for item_id, _, _ in candidates.values()}),
+            )
+        )
     }
 
+    fuzzy: dict[int, _InventoryMatch] = {}
+    for index, (item_id, item_name, score) in candidates.items():
+        if item_id not in stock:
+            continue
+        quantity, unit = stock[item_id]
+        fuzzy[index] = _InventoryMatch(
+            inventory_item_id=item_id,
+            name=item_name,
+            unit=unit,
+            available_amount=convert(quantity, from_unit=unit, to_unit=requirements[index].unit),
+            score=score,
+        )
+    return fuzzy
+
+
+def _reserved_by_earlier_batches(
+    db: Session,
+    batch: Batch,
+    requirements: list[BatchRequirement],
+    user_id: int,
+) -> dict[int, float]:
+    """Active reservations held by batches brewed before this one, in each requirement's unit.
+
+    Batches are prioritised by (brewed_on, id), the same order the availability projection uses.
+    """
+    if not requirements:
+        return {}
+
+    indexes_by_name: dict[str, list[int]] = {}
+    for index, requirement in enumerate(requirements):
+        indexes_by_name.setdefault(normalize_inventory_name(requirement.name), []).append(index)
+
+    statement = (
+        select(
+            InventoryReservation.name_normalized,
+            InventoryReservation.unit,
+            func.sum(InventoryReservation.amount),
+        )
+        .join(Batch, Batch.id == InventoryReservation.batch_id)
+        .where(
+            InventoryReservation.owner_user_id == user_id,
+            InventoryReservation.released_at.is_(None),
+            InventoryReservation.name_normalized.in_(list(indexes_by_name)),
+            InventoryReservation.batch_id != batch.id,
+            or_(
+                Batch.brewed_on < batch.brewed_on,
+                and_(Batch.brewed_on == batch.brewed_on, Batch.id < batch.id),
+            ),
+        )
+        .group_by(InventoryReservation.name_normalized, InventoryReservation.unit)
+    )
+
+    reserved: dict[int, float] = {}
+    for name_normalized, unit, amount in db.execute(statement):
+        for index in indexes_by_name[name_normalized]:
+            converted = convert(amount, from_unit=unit, to_unit=requirements[index].unit)
+            if converted is not None:
+                reserved[index] = reserved.get(index, 0.0) + converted
+    return reserved
+
+
+def build_inventory_preview(
+    db: Session,
+    batch: Batch,
+    user_id: int,
+    *,
+    net_reservations: bool = True,
+) -> BatchInventoryPreviewRead:
+    """Compare a batch's requirements with stock.
+
+    By default stock reserved by batches brewed earlier is netted out, so planning never promises
+    the same stock twice. Consumption passes ``net_reservations=False`` to check physical stock.
+    """
+    requirements = build_batch_requirements(batch)
+    matches = _match_inventory(db, requirements, user_id=user_id)
+    fuzzy_matches = _fuzzy_match_inventory(db, requirements, matches, user_id=user_id)
+    reserved = _reserved_by_earlier_batches(db, batch, requirements, user_id=user_id) if net_reservations else {}
+
     preview_rows: list[BatchInventoryRequirementRead] = []
     shortage_count = 0
 
-    for requirement in requirements:
-        matched_inventory = inventory_by_name.get(requirement.name.strip().lower())
+    for index, requirement in enumerate(requirements):
+        matched_inventory = matches.get(index) or fuzzy_matches.get(index)
         available_amount = 0.0
         shortage_amount = requirement.amount
         enough_stock = False
         inventory_item_id: int | None = None
         inventory_unit: str | None = None
+        reserved_amount = reserved.get(index, 0.0)
+        matched_name: str | None = None
+        match_score: float | None = None
 
         if matched_inventory:
-            converted_available = _convert_amount(
-                amount=matched_inventory.quantity,
-                from_unit=matched_inventory.unit,
-                to_unit=requirement.unit,
-            )
+            matched_name = matched_inventory.name
+            match_score = matched_inventory.score
 
-            inventory_item_id = matched_inventory.id
+        if matched_inventory and matched_inventory.score >= 1.0:
+            inventory_item_id = matched_inventory.inventory_item_id
             inventory_unit = matched_inventory.unit
+            converted_available = matched_inventory.available_amount
 
             if converted_available is not None:
-                available_amount = converted_available
-                shortage_amount = max(requirement.amount - converted_available, 0.0)
+                available_amount = max(converted_available - reserved_amount, 0.0)
+                shortage_amount = max(requirement.amount - available_amount, 0.0)
                 enough_stock = shortage_amount <= 0.0001
 
         if not enough_stock:
@@ -209,6 +347,9 @@ def build_inventory_preview(db: Session, batch: Batch, user_id: int) -> BatchInv
                 enough_stock=enough_stock,
                 inventory_item_id=inventory_item_id,
                 inventory_unit=inventory_unit,
+                reserved_amount=_round(reserved_amount),
+                matched_name=matched_name,
+                match_score=match_score,
             )
         )
 
@@ -222,91 +363,204 @@ def build_inventory_preview(db: Session, batch: Batch, user_id: int) -> BatchInv
     )
 
 
-def consume_inventory_for_batch(db: Session, batch: Batch, user_id: int) -> BatchInventoryConsumeRead:
+@dataclass
+class _PlannedDeduction:
+    inventory_item_id: int
+    amount: float
+    requirement: BatchInventoryRequirementRead
+
+
+def _plan_batch_deductions(
+    db: Session,
+    batch: Batch,
+    user_id: int,
+) -> tuple[list[_PlannedDeduction], BatchInventoryConsumeRead | None]:
     if batch.inventory_consumed_at is not None:
-        return _failure_result(
+        return [], _failure_result(
             batch_id=batch.id,
             detail="Inventory already consumed for this batch.",
             consumed_at=batch.inventory_consumed_at,
         )
 
-    preview = build_inventory_preview(db, batch=batch, user_id=user_id)
+    if batch.status == "cancelled":
+        return [], _failure_result(batch_id=batch.id, detail="Cancelled batches cannot consume inventory.")
+
+    preview = build_inventory_preview(db, batch=batch, user_id=user_id, net_reservations=False)
     if not preview.requirements:
-        return _failure_result(
+        return [], _failure_result(
             batch_id=batch.id,
             detail="No snapshot ingredients available for this batch.",
         )
 
     shortages = [row for row in preview.requirements if not row.enough_stock]
     if shortages:
-        return _failure_result(
+        return [], _failure_result(
             batch_id=batch.id,
             detail="Insufficient inventory to consume this batch.",
             shortage_count=preview.shortage_count,
             shortages=shortages,
         )
 
-    inventory_items = (
-        db.query(InventoryItem)
-        .filter(InventoryItem.owner_user_id == user_id)
-        .all()
-    )
-    inventory_by_id = {item.id: item for item in inventory_items}
-
-    planned_deductions: list[tuple[InventoryItem, BatchInventoryRequirementRead, float]] = []
+    planned: list[_PlannedDeduction] = []
     for requirement in preview.requirements:
-        inventory_item_id = requirement.inventory_item_id
-        if inventory_item_id is None:
-            return _failure_result(batch_id=batch.id, detail="Missing inventory mapping for requirement.")
-
-        inventory_item = inventory_by_id.get(inventory_item_id)
-        if inventory_item is None:
-            return _failure_result(batch_id=batch.id, detail="Inventory item was not found during consumption.")
+        if requirement.inventory_item_id is None or requirement.inventory_unit is None:
+            return [], _failure_result(batch_id=batch.id, detail="Missing inventory mapping for requirement.")
 
-        deduction = _convert_amount(
+        deduction = convert(
             amount=requirement.required_amount,
             from_unit=requirement.required_unit,
-            to_unit=inventory_item.unit,
+            to_unit=requirement.inventory_unit,
         )
         if deduction is None:
-            return _failure_result(batch_id=batch.id, detail="Incompatible units during inventory consumption.")
-
-        planned_deductions.append((inventory_item, requirement, deduction))
-
-    consumed_items: list[BatchInventoryConsumeItemRead] = []
-    for inventory_item, requirement, deduction in planned_deductions:
-        quantity_before = inventory_item.quantity
-        quantity_after = quantity_before - deduction
-        if quantity_after < 0 and abs(quantity_after) <= 0.0001:
-            quantity_after = 0.0
-
-        quantity_after = round(quantity_after, 6)
-        inventory_item.quantity = quantity_after
-
-        consumed_items.append(
-            BatchInventoryConsumeItemRead(
-                inventory_item_id=inventory_item.id,
-                name=inventory_item.name,
-                consumed_amount=_round(deduction),
-                consumed_unit=inventory_item.unit,
-                quantity_before=_round(quantity_before),
-                quantity_after=_round(inventory_item.quantity),
+            return [], _failure_result(batch_id=batch.id, detail="Incompatible units during inventory consumption.")
+
+        planned.append(
+            _PlannedDeduction(
+                inventory_item_id=requirement.inventory_item_id,
+                amount=deduction,
+                requirement=requirement,
             )
         )
 
+    return planned, None
+
+
+def _stock_shortage(db: Session, deduction: _PlannedDeduction, user_id: int) -> BatchInventoryRequirementRead:
+    requirement = deduction.requirement
+    row = db.execute(
+        select(InventoryItem.quantity, InventoryItem.unit).where(
+            InventoryItem.id == deduction.inventory_item_id,
+            InventoryItem.owner_user_id == user_id,
+        )
+    ).first()
+
+    available_amount = 0.0
+    if row is not None:
+        available_amount = convert(amount=row[0], from_unit=row[1], to_unit=requirement.required_unit) or 0.0
+
+    return requirement.model_copy(
+        update={
+            "available_amount": _round(max(available_amount, 0.0)),
+            "shortage_amount": _round(max(requirement.required_amount - available_amount, 0.0)),
+            "enough_stock": False,
+        }
+    )
+
+
+def consume_inventory_for_batches(db: Session, batches: list[Batch], user_id: int) -> BatchInventoryBulkConsumeRead:
+    """Consume inventory for several batches in one transaction; either every batch is consumed or none."""
+    planned_by_batch: list[tuple[Batch, list[_PlannedDeduction]]] = []
+    for batch in batches:
+        planned, failure = _plan_batch_deductions(db, batch=batch, user_id=user_id)
+        if failure is not None:
+            return _bulk_failure_result(batches, failure)
+        planned_by_batch.append((batch, planned))
+
     consumed_at = datetime.utcnow()
-    batch.inventory_consumed_at = consumed_at
+    for batch, _ in planned_by_batch:
+        claimed = db.execute(
+            update(Batch)
+            .where(Batch.id == batch.id, Batch.inventory_consumed_at.is_(None))
+            .values(inventory_consumed_at=consumed_at)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount != 1:
+            db.rollback()
+            db.refresh(batch)
+            return _bulk_failure_result(
+                batches,
+                _failure_result(
+                    batch_id=batch.id,
+                    detail="Inventory already consumed for this batch.",
+                    consumed_at=batch.inventory_consumed_at,
+                ),
+            )
+
+    db.execute(
+        update(InventoryReservation)
+        .where(
+            InventoryReservation.batch_id.in_([batch.id for batch, _ in planned_by_batch]),
+            InventoryReservation.released_at.is_(None),
+        )
+        .values(released_at=consumed_at, release_reason="consumed")
+        .execution_options(synchronize_session=False)
+    )
+
+    # Deduct in inventory id order so concurrent multi-item consumers acquire row locks consistently.
+    ordered = sorted(
+        (
+            (deduction.inventory_item_id, batch_position, deduction_position)
+            for batch_position, (_, planned) in enumerate(planned_by_batch)
+            for deduction_position, deduction in enumerate(planned)
+        ),
+    )
+    consumed_rows: dict[tuple[int, int], BatchInventoryConsumeItemRead] = {}
+    for _, batch_position, deduction_position in ordered:
+        batch, planned = planned_by_batch[batch_position]
+        deduction = planned[deduction_position]
+        entry = apply_inventory_delta(
+            db,
+            inventory_item_id=deduction.inventory_item_id,
+            user_id=user_id,
+            kind="consume",
+            quantity_delta=-deduction.amount,
+            batch_id=batch.id,
+        )
+        if entry is None:
+            shortage = _stock_shortage(db, deduction=deduction, user_id=user_id)
+            db.rollback()
+            return _bulk_failure_result(
+                batches,
+                _failure_result(
+                    batch_id=batch.id,
+                    detail="Insufficient inventory to consume this batch.",
+                    shortage_count=1,
+                    shortages=[shortage],
+                ),
+            )
+
+        consumed_rows[(batch_position, deduction_position)] = BatchInventoryConsumeItemRead(
+            inventory_item_id=entry.inventory_item_id,
+            name=entry.name,
+            consumed_amount=_round(deduction.amount),
+            consumed_unit=entry.unit,
+            quantity_before=_round(entry.balance_after + deduction.amount),
+            quantity_after=_round(entry.balance_after),
+        )
 
-    db.add(batch)
     db.commit()
-    db.refresh(batch)
 
-    return BatchInventoryConsumeRead(
-        batch_id=batch.id,
+    results = [
+        BatchInventoryConsumeRead(
+            batch_id=batch.id,
+            consumed=True,
+            consumed_at=consumed_at,
+            shortage_count=0,
+            items=[consumed_rows[(batch_position, index)] for index in range(len(planned))],
+            shortages=[],
+            detail="Inventory consumed successfully for batch.",
+        )
+        for batch_position, (batch, planned) in enumerate(planned_by_batch)
+    ]
+    return BatchInventoryBulkConsumeRead(
         consumed=True,
-        consumed_at=batch.inventory_consumed_at,
-        shortage_count=0,
-        items=consumed_items,
-        shortages=[],
-        detail="Inventory consumed successfully for batch.",
+        consumed_at=consumed_at,
+        batch_count=len(results),
+        results=results,
+        detail="Inventory consumed successfully for all batches.",
+    )
+
+
+def _bulk_failure_result(batches: list[Batch], failure: BatchInventoryConsumeRead) -> BatchInventoryBulkConsumeRead:
+    return BatchInventoryBulkConsumeRead(
+        consumed=False,
+        consumed_at=None,
+        batch_count=len(batches),
+        failed_batch_id=failure.batch_id,
+        results=[failure],
+        detail=failure.detail,
     )
+
+
+def consume_inventory_for_batch(db: Session, batch: Batch, user_id: int) -> BatchInventoryConsumeRead:
+    return consume_inventory_for_batches(db, batches=[batch], user_id=user_id).results[0]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Numeric, case, cast, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryItem
+from app.models.inventory_transaction import InventoryTransaction
+
+INVENTORY_TRANSACTION_KINDS = ("consume", "restock", "adjust")
+
+_BALANCE_TOLERANCE = 0.0001
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    transaction_id: int
+    inventory_item_id: int
+    name: str
+    unit: str
+    quantity_delta: float
+    balance_after: float
+    created_at: datetime
+
+
+def _insert_transaction(
+    db: Session,
+    *,
+    inventory_item_id: int,
+    user_id: int | None,
+    kind: str,
+    quantity_delta: float,
+    balance_after: float,
+    batch_id: int | None,
+    note: str | None,
+) -> tuple[int, datetime]:
+    if kind not in INVENTORY_TRANSACTION_KINDS:
+        raise ValueError(f"Unsupported inventory transaction kind: {kind}")
+
+    created_at = datetime.utcnow()
+    transaction_id = db.execute(
+        insert(InventoryTransaction)
+        .values(
+            inventory_item_id=inventory_item_id,
+            owner_user_id=user_id,
+            kind=kind,
+            quantity_delta=round(quantity_delta, 6),
+            balance_after=round(balance_after, 6),
+            batch_id=batch_id,
+            note=note,
+            created_at=created_at,
+        )
+        .returning(InventoryTransaction.id)
+    ).scalar_one()
+    return transaction_id, created_at
+
+
+def apply_inventory_delta(
+    db: Session,
+    *,
+    inventory_item_id: int,
+    user_id: int,
+    kind: str,
+    quantity_delta: float,
+    batch_id: int | None = None,
+    note: str | None = None,
+) -> LedgerEntry | None:
+    """Move an item's balance by ``quantity_delta`` and append the matching ledger row.
+
+    The balance is updated with a single guarded UPDATE ... RETURNING, so the row lock it takes
+    serialises concurrent writers and the ledger insert needs no extra read. Returns None when the
+    item does not exist or the delta would take the balance below zero; nothing is written then.
+    """
+    balance = InventoryItem.quantity + quantity_delta
+    row = db.execute(
+        update(InventoryItem)
+        .where(
+            InventoryItem.id == inventory_item_id,
+            InventoryItem.owner_user_id == user_id,
+            balance >= -_BALANCE_TOLERANCE,
+        )
+        .values(quantity=case((balance < 0, 0.0), else_=func.round(cast(balance, Numeric), 6)))
+        .returning(InventoryItem.name, InventoryItem.unit, InventoryItem.quantity)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return None
+
+    name, unit, balance_after = row[0], row[1], float(row[2])
+    transaction_id, created_at = _insert_transaction(
+        db,
+        inventory_item_id=inventory_item_id,
+        user_id=user_id,
+        kind=kind,
+        quantity_delta=quantity_delta,
+        balance_after=balance_after,
+        batch_id=batch_id,
+        note=note,
+    )
+    return LedgerEntry(
+        transaction_id=transaction_id,
+        inventory_item_id=inventory_item_id,
+        name=name,
+        unit=unit,
+        quantity_delta=quantity_delta,
+        balance_after=balance_after,
+        created_at=created_at,
+    )
+
+
+def record_inventory_transaction(
+    db: Session,
+    *,
+    item: InventoryItem,
+    kind: str,
+    quantity_delta: float,
+    note: str | None = None,
+) -> None:
+    """Append a ledger row for a balance change already applied to a flushed ORM item."""
+    _insert_transaction(
+        db,
+        inventory_item_id=item.id,
+        user_id=item.owner_user_id,
+        kind=kind,
+        quantity_delta=quantity_delta,
+        balance_after=item.quantity,
+        batch_id=None,
+        note=note,
+    )
+
+
+def close_inventory_ledger(db: Session, *, item: InventoryItem) -> None:
+    """Write a closing adjustment to zero and detach the item's history before it is deleted.
+
+    The ledger rows are kept with ``inventory_item_id`` set to NULL in one UPDATE, so nothing is
+    loaded into the session and a later item that reuses the id never inherits the history.
+    """
+    _insert_transaction(
+        db,
+        inventory_item_id=item.id,
+        user_id=item.owner_user_id,
+        kind="adjust",
+        quantity_delta=-item.quantity,
+        balance_after=0.0,
+        batch_id=None,
+        note=f"Removed from inventory: {item.name}",
+    )
+    db.execute(
+        update(InventoryTransaction)
+        .where(InventoryTransaction.inventory_item_id == item.id)
+        .values(inventory_item_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def inventory_balance_at(db: Session, *, inventory_item_id: int, at: datetime) -> tuple[float, int | None]:
+    """Return (balance, transaction id) as of ``at``.
+
+    Every ledger row carries the balance it produced, so this is a single seek on
+    (inventory_item_id, created_at) rather than a sum over the item's history.
+    """
+    row = db.execute(
+        select(InventoryTransaction.balance_after, InventoryTransaction.id)
+        .where(
+            InventoryTransaction.inventory_item_id == inventory_item_id,
+            InventoryTransaction.created_at <= at,
+        )
+        .order_by(InventoryTransaction.created_at.desc(), InventoryTransaction.id.desc())
+        .limit(1)
+    ).first()
+    if row is None:
+        return 0.0, None
+    return float(row[0]), row[1]
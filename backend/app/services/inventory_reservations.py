@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.models.batch import Batch
+from app.models.inventory import InventoryItem, normalize_inventory_name
+from app.models.inventory_reservation import InventoryReservation
+from app.schemas.batch import (
+    InventoryProjectionBatchRead,
+    InventoryProjectionIngredientRead,
+    InventoryProjectionRead,
+    InventoryProjectionShortageRead,
+)
+from app.services.inventory_consumption import build_batch_requirements
+from app.services.units import convert
+
+RESERVING_BATCH_STATUS = "planned"
+
+
+@dataclass
+class _ProjectedStock:
+    quantity: float
+    unit: str
+
+
+@dataclass
+class _IngredientShortage:
+    name: str
+    unit: str
+    first_short_on: date
+    first_short_batch_id: int
+    total_shortage_amount: float
+
+
+def _round(value: float) -> float:
+    return round(value, 4)
+
+
+def reserve_inventory_for_batch(db: Session, batch: Batch) -> int:
+    """Reserve the batch's snapshot requirements; returns the number of reservation rows added."""
+    reservations = [
+        InventoryReservation(
+            owner_user_id=batch.owner_user_id,
+            batch_id=batch.id,
+            name=requirement.name,
+            name_normalized=normalize_inventory_name(requirement.name),
+            ingredient_type=requirement.ingredient_type,
+            amount=requirement.amount,
+            unit=requirement.unit,
+        )
+        for requirement in build_batch_requirements(batch)
+    ]
+    db.add_all(reservations)
+    return len(reservations)
+
+
+def release_inventory_reservations(db: Session, *, batch_id: int, reason: str) -> int:
+    result = db.execute(
+        update(InventoryReservation)
+        .where(
+            InventoryReservation.batch_id == batch_id,
+            InventoryReservation.released_at.is_(None),
+        )
+        .values(released_at=datetime.utcnow(), release_reason=reason)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def build_inventory_projection(db: Session, *, user_id: int) -> InventoryProjectionRead:
+    """Walk every batch holding reservations in brew order and draw down a single stock ledger.
+
+    One query loads the active reservations, one loads the matching stock, and the sweep is
+    linear in the number of reservations, instead of one inventory preview per batch.
+    """
+    reservation_rows = db.execute(
+        select(InventoryReservation, Batch.name, Batch.brewed_on)
+        .join(Batch, Batch.id == InventoryReservation.batch_id)
+        .where(
+            InventoryReservation.owner_user_id == user_id,
+            InventoryReservation.released_at.is_(None),
+        )
+        .order_by(Batch.brewed_on, Batch.id, InventoryReservation.id)
+    ).all()
+
+    names = {reservation.name_normalized for reservation, _, _ in reservation_rows}
+    stock: dict[str, _ProjectedStock] = {}
+    if names:
+        # Ordered by id so the newest item wins on duplicate normalized names, as in the preview.
+        for name_normalized, quantity, unit in db.execute(
+            select(InventoryItem.name_normalized, InventoryItem.quantity, InventoryItem.unit)
+            .where(
+                InventoryItem.owner_user_id == user_id,
+                InventoryItem.name_normalized.in_(names),
+            )
+            .order_by(InventoryItem.id)
+        ):
+            stock[name_normalized] = _ProjectedStock(quantity=quantity, unit=unit)
+
+    batches: list[InventoryProjectionBatchRead] = []
+    ingredient_shortages: dict[tuple[str, str], _IngredientShortage] = {}
+    for reservation, batch_name, brewed_on in reservation_rows:
+        if not batches or batches[-1].batch_id != reservation.batch_id:
+            batches.append(
+                InventoryProjectionBatchRead(
+                    batch_id=reservation.batch_id,
+                    batch_name=batch_name,
+                    brewed_on=brewed_on,
+                    can_brew=True,
+                )
+            )
+        projected_batch = batches[-1]
+
+        available = 0.0
+        item_stock = stock.get(reservation.name_normalized)
+        if item_stock is not None:
+            converted = convert(item_stock.quantity, from_unit=item_stock.unit, to_unit=reservation.unit)
+            available = max(converted or 0.0, 0.0)
+
+        drawn = min(available, reservation.amount)
+        if item_stock is not None and drawn > 0:
+            item_stock.quantity -= convert(drawn, from_unit=reservation.unit, to_unit=item_stock.unit) or 0.0
+
+        shortage = reservation.amount - drawn
+        if shortage <= 0.0001:
+            continue
+
+        projected_batch.can_brew = False
+        projected_batch.shortages.append(
+            InventoryProjectionShortageRead(
+                name=reservation.name,
+                ingredient_type=reservation.ingredient_type,
+                unit=reservation.unit,
+                required_amount=_round(reservation.amount),
+                available_amount=_round(available),
+                shortage_amount=_round(shortage),
+            )
+        )
+
+        key = (reservation.name_normalized, reservation.unit.strip().lower())
+        summary = ingredient_shortages.get(key)
+        if summary is None:
+            ingredient_shortages[key] = _IngredientShortage(
+                name=reservation.name,
+                unit=reservation.unit,
+                first_short_on=brewed_on,
+                first_short_batch_id=reservation.batch_id,
+                total_shortage_amount=shortage,
+            )
+        else:
+            summary.total_shortage_amount += shortage
+
+    ingredients = [
+        InventoryProjectionIngredientRead(
+            name=summary.name,
+            unit=summary.unit,
+            first_short_on=summary.first_short_on,
+            first_short_batch_id=summary.first_short_batch_id,
+            total_shortage_amount=_round(summary.total_shortage_amount),
+        )
+        for summary in ingredient_shortages.values()
+    ]
+
+    return InventoryProjectionRead(
+        generated_at=datetime.utcnow(),
+        batch_count=len(batches),
+        short_batch_count=sum(1 for batch in batches if not batch.can_brew),
+        batches=batches,
+        ingredients=ingredients,
+    )
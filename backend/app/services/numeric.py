@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+
+def solve_linear_system(matrix: list[list[float]], rhs: list[float]) -> list[float] | None:
+    """Solve a small dense system by Gaussian elimination with partial pivoting.
+
+    Returns None when the system is (near) singular: a pivot at or below 1e-9 of the largest
+    diagonal entry, so the check scales with the matrix (or exactly zero for a zero matrix).
+    """
+    size = len(rhs)
+    rows = [[*matrix[row], rhs[row]] for row in range(size)]
+    tolerance = 1e-9 * max((abs(rows[row][row]) for row in range(size)), default=0.0)
+    for column in range(size):
+        pivot = max(range(column, size), key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) <= tolerance:
+            return None
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(column + 1, size):
+            factor = rows[row][column] / rows[column][column]
+            for position in range(column, size + 1):
+                rows[row][position] -= factor * rows[column][position]
+
+    solution = [0.0] * size
+    for row in reversed(range(size)):
+        known = sum(rows[row][position] * solution[position] for position in range(row + 1, size))
+        solution[row] = (rows[row][size] - known) / rows[row][row]
+    return solution
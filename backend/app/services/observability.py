@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from threading import Lock
 
+from app.services.cache import LRUCache
+
 
 @dataclass
 class RouteStats:
@@ -47,6 +49,11 @@ class ObservabilityTracker:
         self._total_client_errors = 0
         self._total_server_errors = 0
         self._routes: dict[tuple[str, str], RouteStats] = {}
+        self._caches: dict[str, LRUCache] = {}
+
+    def register_cache(self, name: str, cache: LRUCache) -> None:
+        with self._lock:
+            self._caches[name] = cache
 
     def reset(self) -> None:
         with self._lock:
@@ -91,6 +98,20 @@ class ObservabilityTracker:
                 for route in sorted(self._routes.values(), key=lambda item: (item.path, item.method))
             ]
 
+            caches = []
+            for name, cache in sorted(self._caches.items()):
+                stats = cache.stats()
+                caches.append(
+                    {
+                        "name": name,
+                        "hits": stats.hits,
+                        "misses": stats.misses,
+                        "size": stats.size,
+                        "maxsize": stats.maxsize,
+                        "hit_rate": round(stats.hit_rate, 4),
+                    }
+                )
+
             return {
                 "generated_at": now,
                 "uptime_seconds": uptime_seconds,
@@ -98,6 +119,7 @@ class ObservabilityTracker:
                 "total_client_errors": self._total_client_errors,
                 "total_server_errors": self._total_server_errors,
                 "routes": routes,
+                "caches": caches,
             }
 
 
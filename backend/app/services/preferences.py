@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from app.schemas.batch import BrewPlanDisplayRead, BrewPlanDisplayUnitsRead, BrewPlanVolumeRead
+from app.services.units import convert_many
 
 SUPPORTED_UNIT_SYSTEMS = {"metric", "imperial"}
 SUPPORTED_LANGUAGES = {"en", "es"}
@@ -101,6 +102,19 @@ def to_display_units(
         return value_c
 
     if unit_system == "imperial":
+        (grain_bill_lb,) = convert_many([volumes.grain_bill_kg], ["kg"], "lb")
+        mash_water, sparge_water, total_water, pre_boil, post_boil, boil_off = convert_many(
+            [
+                volumes.mash_water_liters,
+                volumes.sparge_water_liters,
+                volumes.total_water_liters,
+                volumes.pre_boil_volume_liters,
+                volumes.post_boil_volume_liters,
+                volumes.estimated_boil_off_liters,
+            ],
+            ["l"] * 6,
+            "gal",
+        )
         return (
             BrewPlanDisplayUnitsRead(
                 unit_system="imperial",
@@ -110,13 +124,13 @@ def to_display_units(
                 temperature_unit=temp_unit,
             ),
             BrewPlanDisplayRead(
-                grain_bill=round(volumes.grain_bill_kg * 2.20462262, 3),
-                mash_water=round(volumes.mash_water_liters * 0.264172052, 3),
-                sparge_water=round(volumes.sparge_water_liters * 0.264172052, 3),
-                total_water=round(volumes.total_water_liters * 0.264172052, 3),
-                pre_boil_volume=round(volumes.pre_boil_volume_liters * 0.264172052, 3),
-                post_boil_volume=round(volumes.post_boil_volume_liters * 0.264172052, 3),
-                boil_off=round(volumes.estimated_boil_off_liters * 0.264172052, 3),
+                grain_bill=round(grain_bill_lb, 3),
+                mash_water=round(mash_water, 3),
+                sparge_water=round(sparge_water, 3),
+                total_water=round(total_water, 3),
+                pre_boil_volume=round(pre_boil, 3),
+                post_boil_volume=round(post_boil, 3),
+                boil_off=round(boil_off, 3),
                 mash_target_temp=convert_temp(volumes.mash_target_temp_c),
                 strike_water_temp=convert_temp(volumes.strike_water_temp_c),
             ),
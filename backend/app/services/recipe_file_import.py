@@ -0,0 +1,451 @@
+"""Streaming BeerXML and BeerJSON recipe import.
+
+The request body is read chunk by chunk and fed to an incremental parser. BeerXML goes
+through an ``XMLPullParser``, and each finished ``RECIPE`` element is dropped from the tree.
+BeerJSON is scanned to the ``recipes`` array, and its items are decoded one at a time with
+``raw_decode``. Parsed recipes are buffered up to ``batch_size`` and written with multi-row
+inserts, one commit per batch. The next chunk is read only after a full batch is written, so
+memory stays bounded by one chunk, one record and one batch, whatever the file size.
+"""
+from __future__ import annotations
+
+import codecs
+import json
+import math
+import re
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, Literal
+from xml.etree import ElementTree
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.schemas.imports import RecipeFileImportRead, RecipeFileRecordErrorRead
+from app.services.external_catalog import (
+    ExternalRecipeIngredientTemplate,
+    ExternalRecipeTemplate,
+)
+from app.services.recipe_import import insert_recipe_templates
+
+RecipeFileFormat = Literal["beerxml", "beerjson"]
+
+DEFAULT_IMPORT_BATCH_SIZE = 200
+_MAX_REPORTED_ERRORS = 200
+_MAX_REPORTED_RECIPE_IDS = 200
+# A single BeerJSON recipe larger than this is treated as a malformed document.
+_MAX_JSON_RECORD_CHARS = 4 * 1024 * 1024
+# Bounds on imported numbers; minutes must also fit the INTEGER minute_added column.
+_MAX_INGREDIENT_AMOUNT = 1_000_000.0
+_MAX_MINUTE_ADDED = 525_600
+_RECIPES_ARRAY_PATTERN = re.compile(r'"recipes"\s*:\s*\[')
+_LEADING_NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+")
+
+_MASS_TO_KG = {"kg": 1.0, "g": 0.001, "mg": 0.000001, "lb": 0.45359237, "oz": 0.028349523125}
+_VOLUME_TO_L = {"l": 1.0, "ml": 0.001, "gal": 3.785411784, "qt": 0.946352946, "floz": 0.0295735295625}
+
+# Everything not listed goes to the boil (hops) or fermentation (BeerXML misc).
+_BEERXML_HOP_STAGES = {"mash": "mash", "dry hop": "fermentation"}
+_BEERXML_MISC_STAGES = {"mash": "mash", "boil": "boil"}
+_BEERJSON_HOP_STAGES = {"add_to_mash": "mash", "add_to_fermentation": "fermentation", "add_to_package": "fermentation"}
+
+ParsedRecord = tuple[int, str | None, ExternalRecipeTemplate | str]
+
+
+class RecipeFileError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class RecipeFileImportProgress:
+    bytes_read: int
+    records_parsed: int
+    recipes_imported: int
+    error_count: int
+    batches_committed: int
+
+
+def _truncate(value: str, length: int) -> str:
+    return value.strip()[:length]
+
+
+def _leading_float(text: str | None) -> float | None:
+    # BeerXML display fields look like "12.0 SRM" or "1.052 SG".
+    match = _LEADING_NUMBER_PATTERN.search(text or "")
+    return float(match.group()) if match else None
+
+
+def _template(
+    *,
+    file_format: RecipeFileFormat,
+    index: int,
+    name: str,
+    style: str,
+    og: float | None,
+    fg: float | None,
+    ibu: float | None,
+    srm: float | None,
+    efficiency_pct: float | None,
+    notes: str,
+    ingredients: list[ExternalRecipeIngredientTemplate],
+) -> ExternalRecipeTemplate | str:
+    if not name.strip():
+        return "Recipe has no name"
+    if og is None or fg is None:
+        return "Recipe has no original or final gravity"
+    if not all(math.isfinite(value) for value in (og, fg, ibu, srm, efficiency_pct) if value is not None):
+        return "Recipe has a non-finite gravity, IBU, colour or efficiency"
+    return ExternalRecipeTemplate(
+        provider=file_format,
+        external_id=str(index),
+        name=_truncate(name, 140),
+        style=_truncate(style, 80) or "Unknown",
+        target_og=og,
+        target_fg=fg,
+        target_ibu=ibu or 0.0,
+        target_srm=srm or 0.0,
+        efficiency_pct=efficiency_pct or 70.0,
+        notes=notes.strip(),
+        ingredients=tuple(ingredients),
+    )
+
+
+def _ingredient(
+    name: str, ingredient_type: str, amount: float, unit: str, stage: str, minute_added: float | None
+) -> ExternalRecipeIngredientTemplate:
+    """Build one ingredient line; raises ValueError for an amount or time the database cannot hold."""
+    minute = minute_added or 0
+    if not (math.isfinite(amount) and 0 <= amount <= _MAX_INGREDIENT_AMOUNT):
+        raise ValueError(f"{name.strip() or 'ingredient'} amount {amount!r} is out of range")
+    if not (math.isfinite(minute) and 0 <= minute <= _MAX_MINUTE_ADDED):
+        raise ValueError(f"{name.strip() or 'ingredient'} time {minute!r} is out of range")
+    return ExternalRecipeIngredientTemplate(
+        name=_truncate(name, 120) or "Unnamed",
+        ingredient_type=ingredient_type,
+        amount=round(amount, 4),
+        unit=unit,
+        stage=stage,
+        minute_added=round(minute),
+    )
+
+
+class BeerXMLRecipeParser:
+    """Incremental BeerXML 1.0 reader; amounts arrive in kg and L and are mapped to app units."""
+
+    def __init__(self) -> None:
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._open: list[ElementTree.Element] = []
+        self._index = 0
+
+    def feed(self, chunk: bytes) -> list[ParsedRecord]:
+        # XMLPullParser surfaces syntax errors from read_events(), so both calls are guarded.
+        try:
+            self._parser.feed(chunk)
+            return list(self._read_events())
+        except ElementTree.ParseError as exc:
+            raise RecipeFileError(f"Invalid BeerXML: {exc}") from exc
+
+    def close(self) -> list[ParsedRecord]:
+        try:
+            self._parser.close()
+            return list(self._read_events())
+        except ElementTree.ParseError as exc:
+            raise RecipeFileError(f"Invalid BeerXML: {exc}") from exc
+
+    def _read_events(self) -> Iterator[ParsedRecord]:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                # BeerXML tags are uppercase by spec, but some exporters lowercase them; normalize
+                # every element as it opens so the child lookups below see one spelling.
+                element.tag = element.tag.upper()
+                self._open.append(element)
+                continue
+            self._open.pop()
+            if element.tag != "RECIPE":
+                continue
+            self._index += 1
+            name = element.findtext("NAME")
+            try:
+                record: ExternalRecipeTemplate | str = self._map(element)
+            except (ValueError, OverflowError) as exc:
+                record = f"Unreadable recipe: {exc}"
+            yield self._index, name, record
+            # Finished recipes are detached so the tree never grows past the recipe being read.
+            if self._open:
+                self._open[-1].remove(element)
+
+    def _map(self, recipe: ElementTree.Element) -> ExternalRecipeTemplate | str:
+        def number(element: ElementTree.Element, *tags: str) -> float | None:
+            for tag in tags:
+                value = _leading_float(element.findtext(tag))
+                if value is not None:
+                    return value
+            return None
+
+        ingredients: list[ExternalRecipeIngredientTemplate] = []
+        for fermentable in recipe.iterfind("FERMENTABLES/FERMENTABLE"):
+            kind = (fermentable.findtext("TYPE") or "grain").strip().lower()
+            ingredients.append(
+                _ingredient(
+                    fermentable.findtext("NAME") or "",
+                    "grain",
+                    number(fermentable, "AMOUNT") or 0.0,
+                    "kg",
+                    "mash" if kind in {"grain", "adjunct"} else "boil",
+                    0,
+                )
+            )
+        for hop in recipe.iterfind("HOPS/HOP"):
+            use = (hop.findtext("USE") or "boil").strip().lower()
+            ingredients.append(
+                _ingredient(
+                    hop.findtext("NAME") or "",
+                    "hop",
+                    (number(hop, "AMOUNT") or 0.0) * 1000,
+                    "g",
+                    _BEERXML_HOP_STAGES.get(use, "boil"),
+                    number(hop, "TIME") if use != "dry hop" else 0,
+                )
+            )
+        for yeast in recipe.iterfind("YEASTS/YEAST"):
+            ingredients.append(_ingredient(yeast.findtext("NAME") or "", "yeast", 1, "pack", "fermentation", 0))
+        for misc in recipe.iterfind("MISCS/MISC"):
+            is_weight = (misc.findtext("AMOUNT_IS_WEIGHT") or "").strip().upper() == "TRUE"
+            use = (misc.findtext("USE") or "").strip().lower()
+            ingredients.append(
+                _ingredient(
+                    misc.findtext("NAME") or "",
+                    "misc",
+                    (number(misc, "AMOUNT") or 0.0) * 1000,
+                    "g" if is_weight else "ml",
+                    _BEERXML_MISC_STAGES.get(use, "fermentation"),
+                    number(misc, "TIME"),
+                )
+            )
+
+        style = recipe.find("STYLE")
+        style_name = ""
+        if style is not None:
+            code = f"{(style.findtext('CATEGORY_NUMBER') or '').strip()}{(style.findtext('STYLE_LETTER') or '').strip()}"
+            style_name = (style.findtext("NAME") or "").strip() or code
+        return _template(
+            file_format="beerxml",
+            index=self._index,
+            name=recipe.findtext("NAME") or "",
+            style=style_name,
+            og=number(recipe, "OG", "EST_OG"),
+            fg=number(recipe, "FG", "EST_FG"),
+            ibu=number(recipe, "IBU", "EST_IBU"),
+            srm=number(recipe, "EST_COLOR", "COLOR"),
+            efficiency_pct=number(recipe, "EFFICIENCY"),
+            notes=recipe.findtext("NOTES") or "",
+            ingredients=ingredients,
+        )
+
+
+class BeerJSONRecipeParser:
+    """Incremental BeerJSON 1.0 reader: yields each item of the ``recipes`` array in turn."""
+
+    def __init__(self) -> None:
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state: Literal["seek", "items", "done"] = "seek"
+        self._index = 0
+
+    def feed(self, chunk: bytes) -> list[ParsedRecord]:
+        try:
+            self._buffer += self._text.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise RecipeFileError("BeerJSON must be UTF-8") from exc
+        return list(self._drain(final=False))
+
+    def close(self) -> list[ParsedRecord]:
+        records = self.feed(b"") + list(self._drain(final=True))
+        if self._state == "seek":
+            raise RecipeFileError("Invalid BeerJSON: no recipes array")
+        if self._state == "items":
+            raise RecipeFileError("Invalid BeerJSON: recipes array is not terminated")
+        return records
+
+    def _drain(self, *, final: bool) -> Iterator[ParsedRecord]:
+        if self._state == "seek":
+            match = _RECIPES_ARRAY_PATTERN.search(self._buffer)
+            if match is None:
+                # Keep only enough of the tail to complete a key split across chunks.
+                self._buffer = self._buffer[-64:]
+                return
+            self._buffer = self._buffer[match.end() :]
+            self._state = "items"
+
+        while self._state == "items":
+            position = 0
+            while position < len(self._buffer) and self._buffer[position] in " \t\r\n,":
+                position += 1
+            self._buffer = self._buffer[position:]
+            if not self._buffer:
+                return
+            if self._buffer[0] == "]":
+                self._state = "done"
+                self._buffer = ""
+                return
+            try:
+                item, end = self._decoder.raw_decode(self._buffer)
+            except json.JSONDecodeError as exc:
+                if final or len(self._buffer) > _MAX_JSON_RECORD_CHARS:
+                    raise RecipeFileError(f"Invalid BeerJSON recipe: {exc.msg}") from exc
+                return
+            self._buffer = self._buffer[end:]
+            self._index += 1
+            if not isinstance(item, dict):
+                yield self._index, None, "Recipe is not an object"
+                continue
+            name = item.get("name") if isinstance(item.get("name"), str) else None
+            try:
+                yield self._index, name, self._map(item)
+            except (TypeError, ValueError, AttributeError, OverflowError) as exc:
+                yield self._index, name, f"Unreadable recipe: {exc}"
+
+    @staticmethod
+    def _value(measure: Any) -> float | None:
+        if isinstance(measure, dict) and isinstance(measure.get("value"), (int, float)):
+            return float(measure["value"])
+        return None
+
+    @staticmethod
+    def _amount(measure: Any, *, mass_unit: str) -> tuple[float, str]:
+        """Convert a BeerJSON amount to ``mass_unit`` (kg or g), litres/millilitres, or a count."""
+        if not isinstance(measure, dict):
+            return 0.0, mass_unit
+        value = float(measure.get("value") or 0.0)
+        unit = str(measure.get("unit", "")).lower()
+        if unit in _MASS_TO_KG:
+            return value * _MASS_TO_KG[unit] / _MASS_TO_KG[mass_unit], mass_unit
+        if unit in _VOLUME_TO_L:
+            volume_l = value * _VOLUME_TO_L[unit]
+            return (volume_l, "l") if mass_unit == "kg" else (volume_l * 1000, "ml")
+        return value, "pack" if unit in {"pkg", "each", "unit"} else unit[:20] or "each"
+
+    def _map(self, recipe: dict[str, Any]) -> ExternalRecipeTemplate | str:
+        ingredients_block = recipe.get("ingredients") or {}
+        ingredients: list[ExternalRecipeIngredientTemplate] = []
+        for fermentable in ingredients_block.get("fermentable_additions", ()):
+            amount, unit = self._amount(fermentable.get("amount"), mass_unit="kg")
+            kind = str(fermentable.get("type", "grain")).lower()
+            stage = "mash" if kind in {"grain", "other"} else "boil"
+            ingredients.append(_ingredient(str(fermentable.get("name", "")), "grain", amount, unit, stage, 0))
+        for hop in ingredients_block.get("hop_additions", ()):
+            amount, unit = self._amount(hop.get("amount"), mass_unit="g")
+            timing = hop.get("timing") or {}
+            stage = _BEERJSON_HOP_STAGES.get(str(timing.get("use", "")), "boil")
+            minute = self._value(timing.get("time")) if stage == "boil" else 0
+            ingredients.append(_ingredient(str(hop.get("name", "")), "hop", amount, unit, stage, minute))
+        for culture in ingredients_block.get("culture_additions", ()):
+            amount, unit = self._amount(culture.get("amount"), mass_unit="g")
+            ingredients.append(_ingredient(str(culture.get("name", "")), "yeast", amount or 1, unit, "fermentation", 0))
+        for misc in ingredients_block.get("miscellaneous_additions", ()):
+            amount, unit = self._amount(misc.get("amount"), mass_unit="g")
+            ingredients.append(_ingredient(str(misc.get("name", "")), "misc", amount, unit, "boil", 0))
+
+        style = recipe.get("style") or {}
+        code = f"{style.get('category_number', '')}{style.get('style_letter', '')}"
+        efficiency = recipe.get("efficiency") or {}
+        ibu = recipe.get("ibu_estimate") or {}
+        return _template(
+            file_format="beerjson",
+            index=self._index,
+            name=str(recipe.get("name", "")),
+            style=str(style.get("name") or code),
+            og=self._value(recipe.get("original_gravity")),
+            fg=self._value(recipe.get("final_gravity")),
+            ibu=self._value(ibu) if "value" in ibu else self._value(ibu.get("ibu")),
+            srm=self._value(recipe.get("color_estimate")),
+            efficiency_pct=self._value(efficiency.get("brewhouse")),
+            notes=str(recipe.get("notes", "")),
+            ingredients=ingredients,
+        )
+
+
+async def import_recipe_file(
+    chunks: AsyncIterator[bytes],
+    *,
+    file_format: RecipeFileFormat,
+    db: Session,
+    user_id: int,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+    on_progress: Callable[[RecipeFileImportProgress], None] | None = None,
+) -> RecipeFileImportRead:
+    """Parse an uploaded recipe file as it streams in, committing every ``batch_size`` recipes.
+
+    Records that cannot be mapped, such as a missing gravity, are reported and skipped. A
+    malformed document raises ``RecipeFileError``; batches committed before that point stay.
+    """
+    parser = BeerXMLRecipeParser() if file_format == "beerxml" else BeerJSONRecipeParser()
+    pending: list[ExternalRecipeTemplate] = []
+    errors: list[RecipeFileRecordErrorRead] = []
+    counters = {"bytes": 0, "parsed": 0, "imported": 0, "errors": 0, "batches": 0}
+    recipe_ids: list[int] = []
+
+    def report() -> None:
+        if on_progress is not None:
+            on_progress(
+                RecipeFileImportProgress(
+                    bytes_read=counters["bytes"],
+                    records_parsed=counters["parsed"],
+                    recipes_imported=counters["imported"],
+                    error_count=counters["errors"],
+                    batches_committed=counters["batches"],
+                )
+            )
+
+    def write_batch(templates: list[ExternalRecipeTemplate]) -> list[int]:
+        ids = insert_recipe_templates(db, user_id=user_id, templates=templates, record_source=False)
+        db.commit()
+        # Without a recorded source nothing can conflict, so every template gets an id.
+        return [recipe_id for recipe_id in ids if recipe_id is not None]
+
+    async def flush() -> None:
+        batch = pending.copy()
+        pending.clear()
+        ids = await run_in_threadpool(write_batch, batch)
+        counters["imported"] += len(ids)
+        counters["batches"] += 1
+        recipe_ids.extend(ids[: _MAX_REPORTED_RECIPE_IDS - len(recipe_ids)])
+        report()
+
+    async def accept(records: list[ParsedRecord]) -> None:
+        for index, name, outcome in records:
+            counters["parsed"] += 1
+            if isinstance(outcome, str):
+                counters["errors"] += 1
+                if len(errors) < _MAX_REPORTED_ERRORS:
+                    errors.append(RecipeFileRecordErrorRead(record=index, name=name, error=outcome))
+                continue
+            pending.append(outcome)
+            if len(pending) >= batch_size:
+                await flush()
+
+    try:
+        async for chunk in chunks:
+            counters["bytes"] += len(chunk)
+            await accept(parser.feed(chunk))
+        await accept(parser.close())
+    except RecipeFileError as exc:
+        if counters["imported"]:
+            raise RecipeFileError(f"{exc} ({counters['imported']} recipes were imported before the error)") from exc
+        raise
+    if pending:
+        await flush()
+    if counters["parsed"] == 0:
+        raise RecipeFileError("File contains no recipes")
+
+    return RecipeFileImportRead(
+        format=file_format,
+        bytes_read=counters["bytes"],
+        records_parsed=counters["parsed"],
+        imported_count=counters["imported"],
+        batches_committed=counters["batches"],
+        error_count=counters["errors"],
+        recipe_ids=recipe_ids,
+        errors=errors,
+    )
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.recipe import Recipe, RecipeIngredient
+from app.schemas.imports import RecipeBulkImportRead
+from app.services.external_catalog import ExternalRecipeTemplate, get_recipe_template
+
+_INSERT_CHUNK_SIZE = 500
+
+_DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _source_key(provider: str, external_id: str) -> str:
+    return f"{provider}:{external_id}"
+
+
+def _insert_recipe_rows(db: Session, rows: list[dict[str, Any]], *, record_source: bool) -> list[int | None]:
+    if not record_source:
+        # sort_by_parameter_order keeps RETURNING rows aligned with the rows across the
+        # batched multi-row statements, so ingredients can be attached by position.
+        return list(db.scalars(insert(Recipe).returning(Recipe.id, sort_by_parameter_order=True), rows))
+
+    dialect_name = db.get_bind().dialect.name
+    dialect_insert = _DIALECT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        raise RuntimeError(f"Recipe import is not supported on {dialect_name}")
+
+    # A template the user already has conflicts on uq_recipes_owner_source and returns no row,
+    # so RETURNING is matched back to the rows by source key rather than by position.
+    recipes = Recipe.__table__
+    statement = (
+        dialect_insert(recipes)
+        .on_conflict_do_nothing(
+            index_elements=[recipes.c.owner_user_id, recipes.c.source_provider, recipes.c.source_external_id],
+            index_where=recipes.c.source_provider.isnot(None),
+        )
+        .returning(recipes.c.id, recipes.c.source_provider, recipes.c.source_external_id)
+    )
+    inserted = {(provider, external_id): recipe_id for recipe_id, provider, external_id in db.connection().execute(statement, rows)}
+    return [inserted.get((row["source_provider"], row["source_external_id"])) for row in rows]
+
+
+def insert_recipe_templates(
+    db: Session,
+    *,
+    user_id: int,
+    templates: Sequence[ExternalRecipeTemplate],
+    record_source: bool = True,
+) -> list[int | None]:
+    """Insert recipes and their ingredients with multi-row INSERTs; returns ids in template order.
+
+    With ``record_source`` a template the user has already imported is left alone and its id is
+    None, including when a concurrent import inserted it first. Templates must be distinct.
+    Does not commit, so callers can group several calls into one transaction.
+    """
+    recipe_ids: list[int | None] = []
+    for start in range(0, len(templates), _INSERT_CHUNK_SIZE):
+        chunk = templates[start : start + _INSERT_CHUNK_SIZE]
+        recipe_rows = [
+            {
+                "owner_user_id": user_id,
+                "name": template.name,
+                "style": template.style,
+                "target_og": template.target_og,
+                "target_fg": template.target_fg,
+                "target_ibu": template.target_ibu,
+                "target_srm": template.target_srm,
+                "efficiency_pct": template.efficiency_pct,
+                "notes": template.notes,
+                "source_provider": template.provider if record_source else None,
+                "source_external_id": template.external_id if record_source else None,
+            }
+            for template in chunk
+        ]
+        chunk_ids = _insert_recipe_rows(db, recipe_rows, record_source=record_source)
+        ingredient_rows: list[dict[str, Any]] = [
+            {
+                "recipe_id": recipe_id,
+                "name": ingredient.name,
+                "ingredient_type": ingredient.ingredient_type,
+                "amount": ingredient.amount,
+                "unit": ingredient.unit,
+                "stage": ingredient.stage,
+                "minute_added": ingredient.minute_added,
+            }
+            for recipe_id, template in zip(chunk_ids, chunk, strict=True)
+            if recipe_id is not None
+            for ingredient in template.ingredients
+        ]
+        if ingredient_rows:
+            db.execute(insert(RecipeIngredient), ingredient_rows)
+        recipe_ids.extend(chunk_ids)
+    return recipe_ids
+
+
+def _imported_recipe_ids(db: Session, *, user_id: int, keys: list[tuple[str, str]]) -> dict[tuple[str, str], int]:
+    existing: dict[tuple[str, str], int] = {}
+    for start in range(0, len(keys), _INSERT_CHUNK_SIZE):
+        chunk = keys[start : start + _INSERT_CHUNK_SIZE]
+        for provider, external_id, recipe_id in db.execute(
+            select(Recipe.source_provider, Recipe.source_external_id, Recipe.id).where(
+                Recipe.owner_user_id == user_id,
+                tuple_(Recipe.source_provider, Recipe.source_external_id).in_(chunk),
+            )
+        ):
+            existing[(provider, external_id)] = recipe_id
+    return existing
+
+
+def bulk_import_catalog_recipes(
+    db: Session,
+    *,
+    user_id: int,
+    items: Iterable[tuple[str, str]],
+) -> RecipeBulkImportRead:
+    """Import many catalog recipes in one transaction.
+
+    Repeated keys count once. Templates the user already imported are skipped and reported
+    with the existing recipe id.
+    """
+    requested = list(dict.fromkeys(items))
+    existing = _imported_recipe_ids(db, user_id=user_id, keys=requested)
+
+    skipped: dict[str, int] = {}
+    not_found: list[str] = []
+    templates: list[ExternalRecipeTemplate] = []
+    for provider, external_id in requested:
+        if (provider, external_id) in existing:
+            skipped[_source_key(provider, external_id)] = existing[(provider, external_id)]
+            continue
+        template = get_recipe_template(provider=provider, external_id=external_id)
+        if template is None:
+            not_found.append(_source_key(provider, external_id))
+        else:
+            templates.append(template)
+
+    recipe_ids = insert_recipe_templates(db, user_id=user_id, templates=templates)
+    imported: dict[str, int] = {}
+    raced: list[tuple[str, str]] = []
+    for template, recipe_id in zip(templates, recipe_ids, strict=True):
+        if recipe_id is None:
+            raced.append((template.provider, template.external_id))
+        else:
+            imported[_source_key(template.provider, template.external_id)] = recipe_id
+    # Templates another request imported between the lookup and the insert are skipped too.
+    for (provider, external_id), recipe_id in _imported_recipe_ids(db, user_id=user_id, keys=raced).items():
+        skipped[_source_key(provider, external_id)] = recipe_id
+    db.commit()
+
+    return RecipeBulkImportRead(
+        requested=len(requested),
+        imported_count=len(imported),
+        skipped_count=len(skipped),
+        not_found_count=len(not_found),
+        imported=imported,
+        skipped=skipped,
+        not_found=not_found,
+    )
@@ -0,0 +1,133 @@
+"""Shared unit handling: alias canonicalisation and precompiled conversion factors.
+
+Units are interned to small integer ids at import time and every pairwise factor is
+precomputed, so a conversion is two memoised lookups and one multiply.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+# Canonical unit, dimension, factor to the dimension's base unit (g, ml, count).
+# Imperial factors use the exact international definitions (1 lb = 453.59237 g,
+# 1 US gal = 3785.411784 ml).
+_UNIT_DEFINITIONS: tuple[tuple[str, str, float], ...] = (
+    ("g", "mass", 1.0),
+    ("kg", "mass", 1000.0),
+    ("oz", "mass", 28.349523125),
+    ("lb", "mass", 453.59237),
+    ("ml", "volume", 1.0),
+    ("l", "volume", 1000.0),
+    ("floz", "volume", 29.5735295625),
+    ("qt", "volume", 946.352946),
+    ("gal", "volume", 3785.411784),
+    ("pack", "count", 1.0),
+    ("each", "count", 1.0),
+    ("unit", "count", 1.0),
+)
+
+_UNIT_ALIASES: dict[str, str] = {
+    "gram": "g",
+    "grams": "g",
+    "kgs": "kg",
+    "kilogram": "kg",
+    "kilograms": "kg",
+    "ounce": "oz",
+    "ounces": "oz",
+    "pound": "lb",
+    "pounds": "lb",
+    "liter": "l",
+    "liters": "l",
+    "litre": "l",
+    "litres": "l",
+    "fl oz": "floz",
+    "fluid ounce": "floz",
+    "fluid ounces": "floz",
+    "quart": "qt",
+    "quarts": "qt",
+    "gallon": "gal",
+    "gallons": "gal",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "millilitre": "ml",
+    "millilitres": "ml",
+    "packs": "pack",
+}
+
+UNIT_IDS: dict[str, int] = {canonical: index for index, (canonical, _, _) in enumerate(_UNIT_DEFINITIONS)}
+
+# _CONVERSION_MATRIX[from_id][to_id] is the multiplier, or None across dimensions.
+_CONVERSION_MATRIX: tuple[tuple[float | None, ...], ...] = tuple(
+    tuple(
+        from_factor / to_factor if from_dimension == to_dimension else None
+        for _, to_dimension, to_factor in _UNIT_DEFINITIONS
+    )
+    for _, from_dimension, from_factor in _UNIT_DEFINITIONS
+)
+
+
+@lru_cache(maxsize=512)
+def canonical_unit(unit: str) -> str:
+    lowered = unit.strip().lower()
+    return _UNIT_ALIASES.get(lowered, lowered)
+
+
+@lru_cache(maxsize=512)
+def unit_id(unit: str) -> int | None:
+    return UNIT_IDS.get(canonical_unit(unit))
+
+
+def conversion_factor(from_unit: str, to_unit: str) -> float | None:
+    from_id = unit_id(from_unit)
+    to_id = unit_id(to_unit)
+    if from_id is None or to_id is None:
+        # Units outside the table only convert to themselves (e.g. "Bottle" -> "bottle").
+        return 1.0 if canonical_unit(from_unit) == canonical_unit(to_unit) else None
+    return _CONVERSION_MATRIX[from_id][to_id]
+
+
+def convert(amount: float, from_unit: str, to_unit: str) -> float | None:
+    factor = conversion_factor(from_unit, to_unit)
+    if factor is None:
+        return None
+    return amount * factor
+
+
+def convert_many(amounts: Sequence[float], from_units: Sequence[str], to_unit: str) -> list[float | None]:
+    """Convert parallel amount/unit sequences into ``to_unit``; incompatible entries become None.
+
+    The target is resolved once and factors are cached per distinct source unit, so long
+    ingredient lists with a handful of units cost one dict lookup and multiply per entry.
+    """
+    if len(amounts) != len(from_units):
+        raise ValueError("amounts and from_units must have the same length")
+
+    factors: dict[str, float | None] = {}
+    converted: list[float | None] = []
+    for amount, from_unit in zip(amounts, from_units, strict=True):
+        if from_unit in factors:
+            factor = factors[from_unit]
+        else:
+            factor = factors[from_unit] = conversion_factor(from_unit, to_unit)
+        converted.append(None if factor is None else amount * factor)
+    return converted
+
+
+def conversion_rows() -> list[dict[str, object]]:
+    """Rows for the `unit_conversions` lookup table: every canonical unit and alias with its base factor."""
+    definitions = {canonical: (dimension, factor) for canonical, dimension, factor in _UNIT_DEFINITIONS}
+    aliases = {canonical: canonical for canonical in definitions}
+    aliases.update(_UNIT_ALIASES)
+
+    rows: list[dict[str, object]] = []
+    for alias, canonical in sorted(aliases.items()):
+        dimension, factor = definitions[canonical]
+        rows.append(
+            {
+                "alias": alias,
+                "canonical_unit": canonical,
+                "dimension": dimension,
+                "factor_to_base": factor,
+            }
+        )
+    return rows
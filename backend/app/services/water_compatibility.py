@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+
+from app.models.water_profile import WaterProfile
+from app.services.bjcp_styles import BJCPStyleProfile, list_bjcp_styles
+from app.services.cache import LRUCache
+from app.services.observability import observability_tracker
+from app.services.water_recommendation import (
+    WATER_IONS,
+    MineralAddition,
+    build_water_recommendation,
+    distance_to_style_range,
+    ion_range_half_width,
+)
+
+
+@dataclass(frozen=True)
+class StyleWaterCompatibility:
+    style_code: str
+    style_name: str
+    distance_to_range: float
+    ions_out_of_range: tuple[str, ...]
+    projected_distance_to_range: float
+    additions: tuple[MineralAddition, ...]
+
+
+@dataclass(frozen=True)
+class _StyleRangeTable:
+    styles: tuple[BJCPStyleProfile, ...]
+    # Row-major len(styles) x len(WATER_IONS), in the order of WATER_IONS.
+    min_ppm: array
+    max_ppm: array
+    half_width_ppm: array
+
+
+def _build_style_range_table() -> _StyleRangeTable:
+    styles = tuple(list_bjcp_styles())
+    ranges = [getattr(style, ion) for style in styles for ion in WATER_IONS]
+    return _StyleRangeTable(
+        styles=styles,
+        min_ppm=array("d", (ion_range.min_ppm for ion_range in ranges)),
+        max_ppm=array("d", (ion_range.max_ppm for ion_range in ranges)),
+        half_width_ppm=array("d", (ion_range_half_width(ion_range) for ion_range in ranges)),
+    )
+
+
+_STYLE_RANGES = _build_style_range_table()
+
+# Keyed by (profile id, updated_at, ion values, batch volume), so an edited profile misses.
+_COMPATIBILITY_CACHE: LRUCache[tuple[object, ...], tuple[StyleWaterCompatibility, ...]] = LRUCache(maxsize=256)
+observability_tracker.register_cache("water_style_compatibility", _COMPATIBILITY_CACHE)
+
+
+def _range_distances(ion_values: tuple[float, ...]) -> list[tuple[float, tuple[str, ...]]]:
+    """Distance of one ion profile to every style's ranges, in a single pass over the range table.
+
+    Each ion contributes how far it sits outside its range, in half-widths of that range;
+    the per-style distance is the Euclidean norm of those misses (0 when every ion is in range).
+    """
+    table = _STYLE_RANGES
+    ion_count = len(WATER_IONS)
+    distances: list[tuple[float, tuple[str, ...]]] = []
+    for row in range(len(table.styles)):
+        squared = 0.0
+        out_of_range: list[str] = []
+        for column, value in enumerate(ion_values):
+            cell = row * ion_count + column
+            miss = max(table.min_ppm[cell] - value, value - table.max_ppm[cell], 0.0)
+            if miss > 0.0:
+                out_of_range.append(WATER_IONS[column])
+                scaled = miss / table.half_width_ppm[cell]
+                squared += scaled * scaled
+        distances.append((math.sqrt(squared), tuple(out_of_range)))
+    return distances
+
+
+def rank_styles_for_water(
+    *,
+    water_profile: WaterProfile,
+    batch_volume_liters: float,
+) -> tuple[StyleWaterCompatibility, ...]:
+    """Rank every BJCP style by how close the water gets to its ranges after optimized salt additions.
+
+    Results are cached per profile version; editing the profile changes the key.
+    """
+    ion_values = tuple(float(getattr(water_profile, ion)) for ion in WATER_IONS)
+    key = (water_profile.id, water_profile.updated_at, ion_values, round(batch_volume_liters, 2))
+    return _COMPATIBILITY_CACHE.get_or_build(
+        key,
+        lambda: _rank_styles(
+            water_profile=water_profile,
+            ion_values=ion_values,
+            batch_volume_liters=batch_volume_liters,
+        ),
+    )
+
+
+def _rank_styles(
+    *,
+    water_profile: WaterProfile,
+    ion_values: tuple[float, ...],
+    batch_volume_liters: float,
+) -> tuple[StyleWaterCompatibility, ...]:
+    rows: list[StyleWaterCompatibility] = []
+    for style, (distance, out_of_range) in zip(_STYLE_RANGES.styles, _range_distances(ion_values), strict=True):
+        recommendation = build_water_recommendation(
+            water_profile=water_profile,
+            style=style,
+            batch_volume_liters=batch_volume_liters,
+            mode="optimize",
+            skip_ro_blends=True,
+        )
+        projected = recommendation.projected_profile
+        projected_distance = distance_to_style_range(style, [getattr(projected, ion) for ion in WATER_IONS])
+        rows.append(
+            StyleWaterCompatibility(
+                style_code=style.code,
+                style_name=style.name,
+                distance_to_range=round(distance, 3),
+                ions_out_of_range=out_of_range,
+                projected_distance_to_range=round(projected_distance, 3),
+                additions=recommendation.additions,
+            )
+        )
+    rows.sort(key=lambda row: (row.projected_distance_to_range, row.distance_to_range, row.style_code))
+    return tuple(rows)
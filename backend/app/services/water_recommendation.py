@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import math
+import operator
+from collections.abc import Sequence
 from dataclasses import dataclass
+from typing import Literal
 
 from app.models.water_profile import WaterProfile
-from app.services.bjcp_styles import BJCPStyleProfile
+from app.services.bjcp_styles import BJCPStyleProfile, IonRange
+from app.services.cache import CacheStats, LRUCache
+from app.services.numeric import solve_linear_system
+from app.services.observability import observability_tracker
 from app.services.preferences import t
 
 
@@ -32,13 +39,54 @@ class WaterRecommendation:
     projected_profile: WaterSnapshot
     additions: tuple[MineralAddition, ...]
     notes: tuple[str, ...]
+    mode: str = "greedy"
+    ro_dilution_fraction: float = 0.0
+    ro_blend_options: tuple[WaterBlendOption, ...] = ()
 
 
+@dataclass(frozen=True)
+class WaterBlendOption:
+    ro_dilution_fraction: float
+    projected_profile: WaterSnapshot
+    additions: tuple[MineralAddition, ...]
+    distance_to_range: float
+    salt_grams_per_liter: float
+
+
+WaterRecommendationMode = Literal["greedy", "optimize"]
+
 _GYPSUM = {"calcium_ppm": 61.5, "sulfate_ppm": 147.4}
 _CALCIUM_CHLORIDE = {"calcium_ppm": 72.0, "chloride_ppm": 127.0}
 _EPSOM_SALT = {"magnesium_ppm": 26.0, "sulfate_ppm": 103.0}
 _BAKING_SODA = {"sodium_ppm": 72.0, "bicarbonate_ppm": 191.7}
 
+WATER_IONS = ("calcium_ppm", "magnesium_ppm", "sodium_ppm", "chloride_ppm", "sulfate_ppm", "bicarbonate_ppm")
+# (mineral name, ppm per g/L, max g/L, reason); the caps match the greedy mode.
+_OPTIMIZER_SALTS: tuple[tuple[str, dict[str, float], float, str], ...] = (
+    ("Gypsum (CaSO4)", _GYPSUM, 1.5, "Adds calcium and sulfate toward the {style} profile."),
+    ("Calcium Chloride (CaCl2)", _CALCIUM_CHLORIDE, 1.5, "Adds calcium and chloride toward the {style} profile."),
+    ("Epsom Salt (MgSO4)", _EPSOM_SALT, 0.6, "Adds magnesium and sulfate toward the {style} profile."),
+    ("Baking Soda (NaHCO3)", _BAKING_SODA, 0.5, "Adds alkalinity toward the {style} profile."),
+)
+_BAKING_SODA_POSITION = 3
+# 1 mL of 88% lactic acid is about 11.8 mEq, neutralising 11.8 mEq x 61 mg of bicarbonate.
+_LACTIC_ACID_HCO3_PPM_PER_ML_L = 720.0
+_LACTIC_ACID_GRAMS_PER_ML = 1.21
+_MAX_RO_DILUTION_FRACTION = 0.8
+_RO_BLEND_STEP = 0.05
+# Blending RO water is extra work, so a small fit improvement does not justify it.
+_RO_DILUTION_PENALTY = 1.0
+# Ion errors are measured in half-widths of the style range, never narrower than this.
+_MIN_ION_TOLERANCE_PPM = 5.0
+# Small penalty on every variable so near-collinear salts do not trade off against each other.
+_OPTIMIZER_RIDGE = 1e-3
+_MIN_OPTIMIZED_GRAMS_PER_LITER = 0.005
+
+# Keyed by (profile id, updated_at, ion values, style code, batch volume, language, solver options).
+# Profile edits and deletes also drop a profile's entries, since a reused id could otherwise hit.
+_RECOMMENDATION_CACHE: LRUCache[tuple[object, ...], WaterRecommendation] = LRUCache(maxsize=512)
+observability_tracker.register_cache("water_recommendations", _RECOMMENDATION_CACHE)
+
 
 def build_water_recommendation(
     *,
@@ -46,7 +94,20 @@ def build_water_recommendation(
     style: BJCPStyleProfile,
     batch_volume_liters: float,
     language: str = "en",
+    mode: WaterRecommendationMode = "greedy",
+    allow_acid: bool = False,
+    allow_dilution: bool = False,
+    include_ro_blends: bool = False,
+    skip_ro_blends: bool = False,
 ) -> WaterRecommendation:
+    """Recommend additions that move a water profile toward a style's ion ranges.
+
+    ``greedy`` adds gypsum, calcium chloride, Epsom salt and baking soda one after another.
+    ``optimize`` chooses all of them at once and may also use lactic acid and RO dilution.
+    RO blend options are included on request, and always when the source bicarbonate is
+    too high for the style, unless ``skip_ro_blends`` is set by a caller that only reads
+    the additions and projected profile.
+    """
     source = _profile_snapshot(water_profile)
     target = WaterSnapshot(
         calcium_ppm=style.calcium_ppm.target_ppm,
@@ -66,7 +127,224 @@ def build_water_recommendation(
     }
     additions: list[MineralAddition] = []
     notes: list[str] = []
+    ro_dilution_fraction = 0.0
+
+    if mode == "optimize":
+        ro_dilution_fraction = _apply_optimized_additions(
+            additions=additions,
+            projected=projected,
+            style=style,
+            target=target,
+            batch_volume_liters=batch_volume_liters,
+            allow_acid=allow_acid,
+            allow_dilution=allow_dilution,
+        )
+    else:
+        _apply_greedy_additions(
+            additions=additions,
+            projected=projected,
+            style=style,
+            target=target,
+            batch_volume_liters=batch_volume_liters,
+        )
+
+    if projected["calcium_ppm"] > style.calcium_ppm.max_ppm + 40:
+        notes.append(t("high_calcium", language))
+    if projected["sulfate_ppm"] > style.sulfate_ppm.max_ppm + 50:
+        notes.append(t("high_sulfate", language))
+    if projected["chloride_ppm"] > style.chloride_ppm.max_ppm + 40:
+        notes.append(t("high_chloride", language))
+    high_bicarbonate_start = source.bicarbonate_ppm > style.bicarbonate_ppm.max_ppm + 50
+    if high_bicarbonate_start and projected["bicarbonate_ppm"] > style.bicarbonate_ppm.max_ppm:
+        notes.append(t("high_bicarbonate_start", language))
+    if not additions and not ro_dilution_fraction:
+        notes.append(t("water_close", language))
+
+    projected_snapshot = WaterSnapshot(
+        calcium_ppm=round(projected["calcium_ppm"], 2),
+        magnesium_ppm=round(projected["magnesium_ppm"], 2),
+        sodium_ppm=round(projected["sodium_ppm"], 2),
+        chloride_ppm=round(projected["chloride_ppm"], 2),
+        sulfate_ppm=round(projected["sulfate_ppm"], 2),
+        bicarbonate_ppm=round(projected["bicarbonate_ppm"], 2),
+    )
+
+    return WaterRecommendation(
+        source_profile=source,
+        target_profile=_rounded_snapshot(target),
+        projected_profile=projected_snapshot,
+        additions=tuple(additions),
+        notes=tuple(notes),
+        mode=mode,
+        ro_dilution_fraction=round(ro_dilution_fraction, 3),
+        ro_blend_options=(
+            build_ro_blend_options(
+                source=source,
+                style=style,
+                batch_volume_liters=batch_volume_liters,
+                allow_acid=allow_acid,
+            )
+            if (include_ro_blends or high_bicarbonate_start) and not skip_ro_blends
+            else ()
+        ),
+    )
+
+
+def get_cached_water_recommendation(
+    *,
+    water_profile: WaterProfile,
+    style: BJCPStyleProfile,
+    batch_volume_liters: float,
+    language: str = "en",
+    mode: WaterRecommendationMode = "greedy",
+    allow_acid: bool = False,
+    allow_dilution: bool = False,
+    include_ro_blends: bool = False,
+) -> WaterRecommendation:
+    """``build_water_recommendation`` memoised per profile version; see ``invalidate_water_recommendations``."""
+    key = (
+        water_profile.id,
+        water_profile.updated_at,
+        tuple(float(getattr(water_profile, ion)) for ion in WATER_IONS),
+        style.code,
+        round(batch_volume_liters, 2),
+        language,
+        mode,
+        allow_acid,
+        allow_dilution,
+        include_ro_blends,
+    )
+    return _RECOMMENDATION_CACHE.get_or_build(
+        key,
+        lambda: build_water_recommendation(
+            water_profile=water_profile,
+            style=style,
+            batch_volume_liters=batch_volume_liters,
+            language=language,
+            mode=mode,
+            allow_acid=allow_acid,
+            allow_dilution=allow_dilution,
+            include_ro_blends=include_ro_blends,
+        ),
+    )
+
+
+def invalidate_water_recommendations(water_profile_id: int) -> int:
+    return _RECOMMENDATION_CACHE.invalidate(lambda key: key[0] == water_profile_id)
+
+
+def water_recommendation_cache_stats() -> CacheStats:
+    return _RECOMMENDATION_CACHE.stats()
+
+
+def build_ro_blend_options(
+    *,
+    source: WaterSnapshot,
+    style: BJCPStyleProfile,
+    batch_volume_liters: float,
+    allow_acid: bool = False,
+    max_ro_fraction: float = _MAX_RO_DILUTION_FRACTION,
+    step: float = _RO_BLEND_STEP,
+) -> tuple[WaterBlendOption, ...]:
+    """Sweep the RO share of the brewing water and return the Pareto-best blends.
+
+    For one style the salt (and acid) columns, and so the Gram matrix, do not depend on the
+    RO share d; only the right-hand side does, linearly: b(d) = b_target - (1 - d) * b_source.
+    Those pieces are built once and each grid point is a single bounded solve. An option is
+    kept unless another is no worse on distance to range, RO share and salt, and better on one.
+    """
+    source_values = [getattr(source, ion) for ion in WATER_IONS]
+    target_values = [getattr(style, ion).target_ppm for ion in WATER_IONS]
+    weights = [ion_range_half_width(getattr(style, ion)) ** -2 for ion in WATER_IONS]
+    salt_columns = [[contribution.get(ion, 0.0) for ion in WATER_IONS] for _, contribution, _, _ in _OPTIMIZER_SALTS]
+    acid_column = [0.0] * (len(WATER_IONS) - 1) + [-_LACTIC_ACID_HCO3_PPM_PER_ML_L]
+
+    systems: dict[bool, tuple[list[list[float]], list[list[float]], list[float], list[float]]] = {}
+    for with_acid in (False, True) if allow_acid else (False,):
+        columns = [*salt_columns, acid_column] if with_acid else salt_columns
+        weighted_columns = [[weight * value for weight, value in zip(weights, column)] for column in columns]
+        gram = [[sum(map(operator.mul, left, right)) for right in columns] for left in weighted_columns]
+        for position in range(len(columns)):
+            gram[position][position] += _OPTIMIZER_RIDGE
+        rhs_target = [sum(map(operator.mul, column, target_values)) for column in weighted_columns]
+        rhs_source = [sum(map(operator.mul, column, source_values)) for column in weighted_columns]
+        systems[with_acid] = (columns, gram, rhs_target, rhs_source)
+
+    options: list[WaterBlendOption] = []
+    for grid_index in range(round(max_ro_fraction / step) + 1):
+        ro_fraction = round(grid_index * step, 3)
+        kept = 1.0 - ro_fraction
+        diluted = [kept * value for value in source_values]
+        with_acid = allow_acid and diluted[-1] > target_values[-1]
+        columns, gram, rhs_target, rhs_source = systems[with_acid]
+        upper_bounds = [cap for _, _, cap, _ in _OPTIMIZER_SALTS]
+        if with_acid:
+            upper_bounds[_BAKING_SODA_POSITION] = 0.0
+            upper_bounds.append(diluted[-1] / _LACTIC_ACID_HCO3_PPM_PER_ML_L)
+        solution = _solve_bounded_least_squares(
+            gram, [target - kept * from_source for target, from_source in zip(rhs_target, rhs_source)], upper_bounds
+        )
+
+        projected = list(diluted)
+        for value, column in zip(solution, columns):
+            for position, ppm_per_unit in enumerate(column):
+                projected[position] += value * ppm_per_unit
+        projected[-1] = max(projected[-1], 0.0)
+        options.append(
+            WaterBlendOption(
+                ro_dilution_fraction=ro_fraction,
+                projected_profile=WaterSnapshot(*(round(value, 2) for value in projected)),
+                additions=tuple(
+                    _optimized_addition_rows(
+                        solution,
+                        acid_position=len(_OPTIMIZER_SALTS) if with_acid else None,
+                        style=style,
+                        batch_volume_liters=batch_volume_liters,
+                    )
+                ),
+                distance_to_range=round(distance_to_style_range(style, projected), 3),
+                salt_grams_per_liter=round(sum(solution[: len(_OPTIMIZER_SALTS)]), 3),
+            )
+        )
+
+    def objectives(option: WaterBlendOption) -> tuple[float, float, float]:
+        return option.distance_to_range, option.ro_dilution_fraction, option.salt_grams_per_liter
+
+    return tuple(
+        option
+        for option in options
+        if not any(
+            other is not option
+            and all(mine >= theirs for mine, theirs in zip(objectives(option), objectives(other)))
+            and objectives(option) != objectives(other)
+            for other in options
+        )
+    )
+
+
+def ion_range_half_width(ion_range: IonRange) -> float:
+    """Half the width of a style's ion range: the unit in which misses against that range are measured."""
+    return max((ion_range.max_ppm - ion_range.min_ppm) / 2.0, _MIN_ION_TOLERANCE_PPM)
+
+
+def distance_to_style_range(style: BJCPStyleProfile, ion_values: Sequence[float]) -> float:
+    """Euclidean norm of how far each ion sits outside the style's range, in range half-widths."""
+    squared = 0.0
+    for ion, value in zip(WATER_IONS, ion_values):
+        ion_range = getattr(style, ion)
+        miss = max(ion_range.min_ppm - value, value - ion_range.max_ppm, 0.0)
+        squared += (miss / ion_range_half_width(ion_range)) ** 2
+    return math.sqrt(squared)
+
 
+def _apply_greedy_additions(
+    *,
+    additions: list[MineralAddition],
+    projected: dict[str, float],
+    style: BJCPStyleProfile,
+    target: WaterSnapshot,
+    batch_volume_liters: float,
+) -> None:
     sulfate_gap = target.sulfate_ppm - projected["sulfate_ppm"]
     if sulfate_gap > 5:
         grams_per_l = min(sulfate_gap / _GYPSUM["sulfate_ppm"], 1.5)
@@ -119,33 +397,150 @@ def build_water_recommendation(
             reason="Raise alkalinity for mash pH support in darker beers.",
         )
 
-    if projected["calcium_ppm"] > style.calcium_ppm.max_ppm + 40:
-        notes.append(t("high_calcium", language))
-    if projected["sulfate_ppm"] > style.sulfate_ppm.max_ppm + 50:
-        notes.append(t("high_sulfate", language))
-    if projected["chloride_ppm"] > style.chloride_ppm.max_ppm + 40:
-        notes.append(t("high_chloride", language))
-    if source.bicarbonate_ppm > style.bicarbonate_ppm.max_ppm + 50:
-        notes.append(t("high_bicarbonate_start", language))
-    if not additions:
-        notes.append(t("water_close", language))
 
-    projected_snapshot = WaterSnapshot(
-        calcium_ppm=round(projected["calcium_ppm"], 2),
-        magnesium_ppm=round(projected["magnesium_ppm"], 2),
-        sodium_ppm=round(projected["sodium_ppm"], 2),
-        chloride_ppm=round(projected["chloride_ppm"], 2),
-        sulfate_ppm=round(projected["sulfate_ppm"], 2),
-        bicarbonate_ppm=round(projected["bicarbonate_ppm"], 2),
-    )
+def _apply_optimized_additions(
+    *,
+    additions: list[MineralAddition],
+    projected: dict[str, float],
+    style: BJCPStyleProfile,
+    target: WaterSnapshot,
+    batch_volume_liters: float,
+    allow_acid: bool,
+    allow_dilution: bool,
+) -> float:
+    """Pick every addition in one bounded least-squares solve; returns the RO fraction.
 
-    return WaterRecommendation(
-        source_profile=source,
-        target_profile=_rounded_snapshot(target),
-        projected_profile=projected_snapshot,
-        additions=tuple(additions),
-        notes=tuple(notes),
+    The projected profile is linear in g/L of each salt, mL/L of 88% lactic acid and the
+    share of RO water, so all of them are solved together. Each ion's miss is scaled by
+    the half-width of the style range: 20 ppm off on sodium (0-30) costs more than 20 ppm
+    off on sulfate (120-240).
+    """
+    source = [projected[ion] for ion in WATER_IONS]
+    columns = [[contribution.get(ion, 0.0) for ion in WATER_IONS] for _, contribution, _, _ in _OPTIMIZER_SALTS]
+    upper_bounds = [cap for _, _, cap, _ in _OPTIMIZER_SALTS]
+    acid_position = dilution_position = None
+    # Acid and baking soda cancel out, so only the one matching the direction of the gap is offered.
+    if allow_acid and projected["bicarbonate_ppm"] > target.bicarbonate_ppm:
+        upper_bounds[_BAKING_SODA_POSITION] = 0.0
+        acid_position = len(columns)
+        columns.append([0.0] * (len(WATER_IONS) - 1) + [-_LACTIC_ACID_HCO3_PPM_PER_ML_L])
+        upper_bounds.append(projected["bicarbonate_ppm"] / _LACTIC_ACID_HCO3_PPM_PER_ML_L)
+    # Dilution only helps when the source already carries more of some ion than the style allows.
+    if allow_dilution and any(projected[ion] > getattr(style, ion).max_ppm for ion in WATER_IONS):
+        dilution_position = len(columns)
+        columns.append([-value for value in source])
+        upper_bounds.append(_MAX_RO_DILUTION_FRACTION)
+
+    weights = [ion_range_half_width(getattr(style, ion)) ** -2 for ion in WATER_IONS]
+    weighted_gaps = [weight * (getattr(target, ion) - value) for weight, ion, value in zip(weights, WATER_IONS, source)]
+    weighted_columns = [[weight * value for weight, value in zip(weights, column)] for column in columns]
+
+    gram = [[sum(map(operator.mul, left, right)) for right in columns] for left in weighted_columns]
+    for position in range(len(columns)):
+        gram[position][position] += _OPTIMIZER_RIDGE
+    if dilution_position is not None:
+        gram[dilution_position][dilution_position] += _RO_DILUTION_PENALTY
+    rhs = [sum(map(operator.mul, column, weighted_gaps)) for column in columns]
+    solution = _solve_bounded_least_squares(gram, rhs, upper_bounds)
+
+    for value, column in zip(solution, columns):
+        for ion, ppm_per_unit in zip(WATER_IONS, column):
+            projected[ion] += value * ppm_per_unit
+    projected["bicarbonate_ppm"] = max(projected["bicarbonate_ppm"], 0.0)
+
+    additions.extend(
+        _optimized_addition_rows(
+            solution, acid_position=acid_position, style=style, batch_volume_liters=batch_volume_liters
+        )
     )
+    return solution[dilution_position] if dilution_position is not None else 0.0
+
+
+def _optimized_addition_rows(
+    solution: list[float],
+    *,
+    acid_position: int | None,
+    style: BJCPStyleProfile,
+    batch_volume_liters: float,
+) -> list[MineralAddition]:
+    rows: list[MineralAddition] = []
+    for (mineral_name, _, _, reason), grams_per_liter in zip(_OPTIMIZER_SALTS, solution):
+        if grams_per_liter >= _MIN_OPTIMIZED_GRAMS_PER_LITER:
+            rows.append(
+                MineralAddition(
+                    mineral_name=mineral_name,
+                    grams_per_liter=round(grams_per_liter, 3),
+                    grams_total=round(grams_per_liter * batch_volume_liters, 2),
+                    reason=reason.format(style=style.name),
+                )
+            )
+    if acid_position is not None:
+        acid_ml_per_liter = solution[acid_position]
+        grams_per_liter = acid_ml_per_liter * _LACTIC_ACID_GRAMS_PER_ML
+        if grams_per_liter >= _MIN_OPTIMIZED_GRAMS_PER_LITER:
+            rows.append(
+                MineralAddition(
+                    mineral_name="Lactic Acid (88%)",
+                    grams_per_liter=round(grams_per_liter, 3),
+                    grams_total=round(grams_per_liter * batch_volume_liters, 2),
+                    reason=f"About {acid_ml_per_liter * batch_volume_liters:.1f} mL to neutralise excess bicarbonate.",
+                )
+            )
+    return rows
+
+
+def _solve_bounded_least_squares(gram: list[list[float]], rhs: list[float], upper_bounds: list[float]) -> list[float]:
+    """Minimise 0.5 x'Gx - b'x subject to 0 <= x <= upper, by a bounded-variable active set.
+
+    Starts with every variable at zero, frees the one whose gradient most wants to move
+    into the box, solves the free subsystem and steps back to the boundary when that
+    solution leaves the box. With six variables this is a handful of tiny solves.
+    """
+    size = len(rhs)
+    solution = [0.0] * size
+    free: list[int] = []
+    for _ in range(8 * size + 8):
+        if free:
+            fixed_rhs = [
+                rhs[row] - sum(gram[row][column] * solution[column] for column in range(size) if column not in free)
+                for row in free
+            ]
+            unconstrained = solve_linear_system([[gram[row][column] for column in free] for row in free], fixed_rhs)
+            if unconstrained is None:
+                break
+            step = 1.0
+            for position, variable in enumerate(free):
+                current, proposed = solution[variable], unconstrained[position]
+                if proposed < 0.0:
+                    step = min(step, current / (current - proposed))
+                elif proposed > upper_bounds[variable]:
+                    step = min(step, (upper_bounds[variable] - current) / (proposed - current))
+            for position, variable in enumerate(free):
+                solution[variable] += step * (unconstrained[position] - solution[variable])
+            if step < 1.0:
+                for variable in list(free):
+                    if solution[variable] <= 1e-12:
+                        solution[variable] = 0.0
+                        free.remove(variable)
+                    elif solution[variable] >= upper_bounds[variable] - 1e-12:
+                        solution[variable] = upper_bounds[variable]
+                        free.remove(variable)
+                continue
+
+        gradient = [sum(gram[row][column] * solution[column] for column in range(size)) - rhs[row] for row in range(size)]
+        violations = [
+            (abs(gradient[variable]), variable)
+            for variable in range(size)
+            if variable not in free
+            and (
+                (solution[variable] < upper_bounds[variable] and gradient[variable] < -1e-12)
+                or (solution[variable] > 0.0 and gradient[variable] > 1e-12)
+            )
+        ]
+        if not violations:
+            break
+        free.append(max(violations)[1])
+    return solution
 
 
 def _profile_snapshot(water_profile: WaterProfile) -> WaterSnapshot:
@@ -0,0 +1,176 @@
+"""Benchmark for the analytics overview on a user with a long brewing history.
+
+Compares the previous six-query `build_overview`, which loaded every gravity pair and
+averaged ABV and attenuation in Python, with the current per-recipe CTE plus recent-batches
+query, on an in-memory SQLite database seeded with 10k batches for one user (plus another
+user's noise). Both implementations run against the same schema, owner/brew-date index included.
+
+    cd backend && python -m benchmarks.bench_analytics
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, desc, func, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base
+from app.models.batch import Batch
+from app.models.recipe import Recipe
+from app.models.user import User
+from app.schemas.analytics import (
+    AnalyticsOverviewRead,
+    RecentBatchInsight,
+    StyleBatchCount,
+)
+from app.services.analytics import build_overview
+from app.services.recipe_calculator import attenuation_pct, estimate_abv
+
+_STYLES = ["IPA", "Stout", "Saison", "Pilsner", "Porter", "Hefeweizen", None]
+_STATUSES = ["planned", "fermenting", "conditioning", "completed", "packaged"]
+
+
+def _legacy_build_overview(db: Session, user_id: int) -> AnalyticsOverviewRead:
+    def _avg(values: list[float]) -> float | None:
+        return round(sum(values) / len(values), 2) if values else None
+
+    total_recipes = db.query(func.count(Recipe.id)).filter(Recipe.owner_user_id == user_id).scalar() or 0
+    total_batches = db.query(func.count(Batch.id)).filter(Batch.owner_user_id == user_id).scalar() or 0
+    completed_batches = (
+        db.query(func.count(Batch.id))
+        .filter(Batch.owner_user_id == user_id, Batch.status.in_(("completed", "packaged")))
+        .scalar()
+        or 0
+    )
+    gravity_rows = (
+        db.query(Batch.measured_og, Batch.measured_fg)
+        .filter(Batch.owner_user_id == user_id, Batch.measured_og.isnot(None), Batch.measured_fg.isnot(None))
+        .all()
+    )
+    abv_values: list[float] = []
+    attenuation_values: list[float] = []
+    for measured_og, measured_fg in gravity_rows:
+        if measured_og <= measured_fg or measured_og <= 1.0:
+            continue
+        abv_values.append(estimate_abv(measured_og, measured_fg))
+        attenuation_values.append(attenuation_pct(measured_og, measured_fg))
+
+    style_rows = (
+        db.query(Recipe.style, func.count(Batch.id).label("batch_count"))
+        .join(Batch, Batch.recipe_id == Recipe.id)
+        .filter(Batch.owner_user_id == user_id)
+        .group_by(Recipe.style)
+        .order_by(desc("batch_count"), Recipe.style.asc())
+        .all()
+    )
+    recent_batch_rows = (
+        db.query(Batch)
+        .filter(Batch.owner_user_id == user_id)
+        .order_by(Batch.brewed_on.desc(), Batch.id.desc())
+        .limit(5)
+        .all()
+    )
+    return AnalyticsOverviewRead(
+        total_recipes=total_recipes,
+        total_batches=total_batches,
+        completed_batches=completed_batches,
+        average_abv=_avg(abv_values),
+        average_attenuation_pct=_avg(attenuation_values),
+        style_breakdown=[StyleBatchCount(style=style or "Unknown", batch_count=count) for style, count in style_rows],
+        recent_batches=[
+            RecentBatchInsight(
+                id=batch.id,
+                name=batch.name,
+                status=batch.status,
+                brewed_on=batch.brewed_on,
+                abv=(
+                    estimate_abv(batch.measured_og, batch.measured_fg)
+                    if batch.measured_og is not None and batch.measured_fg is not None and batch.measured_og > batch.measured_fg
+                    else None
+                ),
+            )
+            for batch in recent_batch_rows
+        ],
+    )
+
+
+def _seed(db: Session, *, batches: int) -> int:
+    rng = random.Random(42)
+    user_ids = []
+    for name in ("bench-brewer", "bench-neighbour"):
+        user = User(username=name, email=f"{name}@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        user_ids.append(user.id)
+
+    for user_id, batch_count in zip(user_ids, (batches, batches // 4), strict=True):
+        recipe_ids = db.scalars(
+            insert(Recipe).returning(Recipe.id),
+            [
+                {
+                    "owner_user_id": user_id,
+                    "name": f"Recipe {index}",
+                    "style": _STYLES[index % len(_STYLES)],
+                    "target_og": 1.050,
+                    "target_fg": 1.010,
+                    "target_ibu": 30,
+                    "target_srm": 8,
+                    "efficiency_pct": 72,
+                    "notes": "",
+                }
+                for index in range(40)
+            ],
+        ).all()
+        rows = []
+        for index in range(batch_count):
+            measured_og = rng.choice([None, round(rng.uniform(0.995, 1.090), 3)])
+            measured_fg = None if measured_og is None else rng.choice([None, round(rng.uniform(1.000, 1.020), 3)])
+            rows.append(
+                {
+                    "owner_user_id": user_id,
+                    "recipe_id": rng.choice(recipe_ids),
+                    "name": f"Batch {index}",
+                    "brewed_on": date(2020, 1, 1) + timedelta(days=rng.randrange(2500)),
+                    "status": rng.choice(_STATUSES),
+                    "volume_liters": 20.0,
+                    "measured_og": measured_og,
+                    "measured_fg": measured_fg,
+                    "notes": "tasting notes " * 20,
+                    "recipe_ingredients_snapshot_json": "[]" * 200,
+                }
+            )
+        db.execute(insert(Batch), rows)
+    db.commit()
+    return user_ids[0]
+
+
+def main(batches: int = 10_000, repeat: int = 10) -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    with session_factory() as db:
+        user_id = _seed(db, batches=batches)
+
+    def run(build) -> AnalyticsOverviewRead:
+        with session_factory() as db:
+            return build(db, user_id)
+
+    assert run(_legacy_build_overview) == run(build_overview)
+
+    cases = {
+        "six queries + Python loop": lambda: run(_legacy_build_overview),
+        "CTE + recent batches": lambda: run(build_overview),
+    }
+    baseline = None
+    for label, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=repeat))
+        baseline = baseline or seconds
+        print(f"{label:<28} {seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Microbenchmark for the shared unit-conversion engine.
+
+Compares the per-call string handling the services used before `app.services.units`
+with the precompiled matrix and `convert_many`, on preview- and plan-sized workloads.
+
+    cd backend && python -m benchmarks.bench_units
+"""
+from __future__ import annotations
+
+import random
+import timeit
+
+from app.services.units import convert, convert_many
+
+_LEGACY_FACTORS: dict[str, tuple[str, float]] = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "oz": ("mass", 28.349523125),
+    "lb": ("mass", 453.59237),
+    "ml": ("volume", 1.0),
+    "l": ("volume", 1000.0),
+    "pack": ("count", 1.0),
+}
+_LEGACY_ALIASES: dict[str, str] = {"grams": "g", "kilograms": "kg", "pounds": "lb", "ounces": "oz", "liters": "l"}
+
+
+def _legacy_convert(amount: float, from_unit: str, to_unit: str) -> float | None:
+    from_canonical = _LEGACY_ALIASES.get(from_unit.strip().lower(), from_unit.strip().lower())
+    to_canonical = _LEGACY_ALIASES.get(to_unit.strip().lower(), to_unit.strip().lower())
+    if from_canonical == to_canonical:
+        return amount
+    from_meta = _LEGACY_FACTORS.get(from_canonical)
+    to_meta = _LEGACY_FACTORS.get(to_canonical)
+    if not from_meta or not to_meta or from_meta[0] != to_meta[0]:
+        return None
+    return amount * from_meta[1] / to_meta[1]
+
+
+def _workload(size: int) -> tuple[list[float], list[str]]:
+    rng = random.Random(42)
+    units = ["g", "kg", "Pounds", "oz", "grams", "KG", "lb", "pack"]
+    return [rng.uniform(0.1, 50.0) for _ in range(size)], [rng.choice(units) for _ in range(size)]
+
+
+def main(size: int = 100_000, repeat: int = 5) -> None:
+    amounts, units = _workload(size)
+    pairs = list(zip(amounts, units))
+
+    cases = {
+        "preview (per-row legacy)": lambda: [_legacy_convert(amount, unit, "kg") for amount, unit in pairs],
+        "preview (per-row convert)": lambda: [convert(amount, unit, "kg") for amount, unit in pairs],
+        "plan (convert_many)": lambda: convert_many(amounts, units, "kg"),
+    }
+    baseline = None
+    for label, case in cases.items():
+        seconds = min(timeit.repeat(case, number=1, repeat=repeat))
+        baseline = baseline or seconds
+        print(f"{label:<28} {seconds * 1000:8.1f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
+import json
 from collections.abc import Generator
 from datetime import datetime, timedelta
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -14,6 +15,7 @@ from app.api.auth import router as auth_router
 from app.api.batches import router as batch_router
 from app.api.equipment import router as equipment_router
 from app.api.health import router as health_router
+from app.api.hops import router as hops_router
 from app.api.imports import router as imports_router
 from app.api.ingredients import router as ingredients_router
 from app.api.inventory import router as inventory_router
@@ -25,9 +27,15 @@ from app.api.timeline import router as timeline_router
 from app.api.water_profiles import router as water_profiles_router
 from app.core.config import settings
 from app.core.database import Base, get_db
+from app.core.http_caching import CachedCatalogResponses
 from app.core.observability_middleware import ObservabilityMiddleware
-from app.services import ai_orchestrator
+from app.models.inventory_transaction import InventoryTransaction
+from app.models.user import User
+from app.schemas.imports import ExternalRecipeCatalogResponse
+from app.services import ai_orchestrator, recipe_import
+from app.services.external_catalog import ExternalRecipeTemplate, get_recipe_template
 from app.services.observability import observability_tracker
+from app.services.recipe_import import insert_recipe_templates
 
 
 @pytest.fixture
@@ -49,6 +57,7 @@ def client() -> Generator[TestClient, None, None]:
     app.include_router(auth_router, prefix=settings.api_prefix)
     app.include_router(recipe_router, prefix=settings.api_prefix)
     app.include_router(styles_router, prefix=settings.api_prefix)
+    app.include_router(hops_router, prefix=settings.api_prefix)
     app.include_router(batch_router, prefix=settings.api_prefix)
     app.include_router(analytics_router, prefix=settings.api_prefix)
     app.include_router(ai_router, prefix=settings.api_prefix)
@@ -267,6 +276,8 @@ def test_protected_endpoints_require_auth(client: TestClient) -> None:
     assert client.patch("/api/v1/auth/me/preferences").status_code == 401
     assert client.get("/api/v1/imports/recipes/catalog").status_code == 401
     assert client.post("/api/v1/imports/recipes/import").status_code == 401
+    assert client.post("/api/v1/imports/recipes/bulk").status_code == 401
+    assert client.post("/api/v1/imports/recipes/file").status_code == 401
     assert client.get("/api/v1/styles/bjcp").status_code == 401
     assert client.get("/api/v1/styles/bjcp/21A").status_code == 401
     assert client.get("/api/v1/imports/ingredients/catalog").status_code == 401
@@ -452,6 +463,10 @@ def test_inventory_crud_and_low_stock_alerts(client: TestClient) -> None:
     assert alerts_response.json()["count"] == 1
     assert alerts_response.json()["items"][0]["name"] == "US-05"
 
+    count_response = client.get("/api/v1/inventory/alerts/low-stock/count", headers=headers)
+    assert count_response.status_code == 200
+    assert count_response.json() == {"count": 1}
+
     get_item = client.get(f"/api/v1/inventory/{low_item_id}", headers=headers)
     assert get_item.status_code == 200
     assert get_item.json()["is_low_stock"] is True
@@ -473,12 +488,220 @@ def test_inventory_crud_and_low_stock_alerts(client: TestClient) -> None:
     alerts_after_update = client.get("/api/v1/inventory/alerts/low-stock", headers=headers)
     assert alerts_after_update.status_code == 200
     assert alerts_after_update.json()["count"] == 0
+    assert client.get("/api/v1/inventory/alerts/low-stock/count", headers=headers).json() == {"count": 0}
+
+    drawdown = client.post(
+        f"/api/v1/inventory/{healthy_item_id}/adjust",
+        json={"quantity_delta": -160},
+        headers=headers,
+    )
+    assert drawdown.status_code == 201
+    assert client.get("/api/v1/inventory/alerts/low-stock/count", headers=headers).json() == {"count": 1}
+    low_stock_after_drawdown = client.get("/api/v1/inventory?low_stock_only=true", headers=headers).json()
+    assert [item["name"] for item in low_stock_after_drawdown] == ["Citra"]
+    assert low_stock_after_drawdown[0]["is_low_stock"] is True
 
     delete_item = client.delete(f"/api/v1/inventory/{healthy_item_id}", headers=headers)
     assert delete_item.status_code == 204
     assert client.get(f"/api/v1/inventory/{healthy_item_id}", headers=headers).status_code == 404
 
 
+def test_deleting_inventory_item_closes_and_keeps_its_ledger(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="ledger-delete", email="ledger-delete@example.com")
+    item_id = _create_inventory_item(
+        client, headers, name="Retired Malt", ingredient_type="grain", quantity=3, unit="kg", low_stock_threshold=1
+    )
+    assert client.post(f"/api/v1/inventory/{item_id}/restock", json={"quantity": 2}, headers=headers).status_code == 201
+
+    assert client.delete(f"/api/v1/inventory/{item_id}", headers=headers).status_code == 204
+
+    db = next(client.app.dependency_overrides[get_db]())
+    kept = db.execute(
+        select(InventoryTransaction.inventory_item_id, InventoryTransaction.quantity_delta, InventoryTransaction.balance_after)
+        .where(InventoryTransaction.inventory_item_id.is_(None))
+        .order_by(InventoryTransaction.id)
+    ).all()
+    db.close()
+    assert [(row[1], row[2]) for row in kept] == [(3.0, 3.0), (2.0, 5.0), (-5.0, 0.0)]
+
+    replacement_id = _create_inventory_item(
+        client, headers, name="Retired Malt", ingredient_type="grain", quantity=1, unit="kg", low_stock_threshold=0
+    )
+    replacement_ledger = client.get(f"/api/v1/inventory/{replacement_id}/transactions", headers=headers).json()
+    assert [entry["quantity_delta"] for entry in replacement_ledger] == [1.0]
+
+
+def test_inventory_ledger_records_transactions_and_balance_history(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="ledger-user", email="ledger-user@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+    batch_id = _create_batch(client, headers, recipe_id, "Ledger Batch", status="brewing")
+
+    malt_id = _create_inventory_item(
+        client,
+        headers,
+        name="Pale Malt",
+        ingredient_type="grain",
+        quantity=3,
+        unit="kg",
+        low_stock_threshold=1,
+    )
+    _create_inventory_item(client, headers, name="Citra", ingredient_type="hop", quantity=50, unit="g", low_stock_threshold=0)
+    _create_inventory_item(client, headers, name="US-05", ingredient_type="yeast", quantity=1, unit="pack", low_stock_threshold=0)
+    before_restock = datetime.utcnow()
+
+    restock_response = client.post(
+        f"/api/v1/inventory/{malt_id}/restock",
+        json={"quantity": 2.5, "note": "Sack delivery"},
+        headers=headers,
+    )
+    assert restock_response.status_code == 201
+    assert restock_response.json()["kind"] == "restock"
+    assert restock_response.json()["balance_after"] == 5.5
+
+    overdraw_response = client.post(
+        f"/api/v1/inventory/{malt_id}/adjust",
+        json={"quantity_delta": -10},
+        headers=headers,
+    )
+    assert overdraw_response.status_code == 409
+
+    consume_response = client.post(f"/api/v1/batches/{batch_id}/inventory/consume", headers=headers)
+    assert consume_response.status_code == 200
+
+    adjust_response = client.post(
+        f"/api/v1/inventory/{malt_id}/adjust",
+        json={"quantity_delta": -0.2, "note": "Spilled"},
+        headers=headers,
+    )
+    assert adjust_response.status_code == 201
+    assert adjust_response.json()["balance_after"] == 1.0
+
+    update_response = client.put(
+        f"/api/v1/inventory/{malt_id}",
+        json={"name": "Pale Malt", "ingredient_type": "grain", "quantity": 4, "unit": "kg", "low_stock_threshold": 1},
+        headers=headers,
+    )
+    assert update_response.status_code == 200
+
+    transactions_response = client.get(f"/api/v1/inventory/{malt_id}/transactions", headers=headers)
+    assert transactions_response.status_code == 200
+    transactions = transactions_response.json()
+    assert [row["kind"] for row in transactions] == ["adjust", "adjust", "consume", "restock", "restock"]
+    assert [row["balance_after"] for row in transactions] == [4.0, 1.0, 1.2, 5.5, 3.0]
+    assert transactions[2]["batch_id"] == batch_id
+    assert transactions[2]["quantity_delta"] == -4.3
+    assert sum(row["quantity_delta"] for row in transactions) == pytest.approx(4.0)
+
+    page_response = client.get(
+        f"/api/v1/inventory/{malt_id}/transactions?limit=2&before_id={transactions[1]['id']}",
+        headers=headers,
+    )
+    assert [row["kind"] for row in page_response.json()] == ["consume", "restock"]
+
+    historic_balance = client.get(
+        f"/api/v1/inventory/{malt_id}/balance",
+        params={"at": before_restock.isoformat()},
+        headers=headers,
+    )
+    assert historic_balance.status_code == 200
+    assert historic_balance.json()["quantity"] == 3.0
+    assert historic_balance.json()["transaction_id"] == transactions[-1]["id"]
+
+    current_balance = client.get(f"/api/v1/inventory/{malt_id}/balance", headers=headers)
+    assert current_balance.json()["quantity"] == 4.0
+    assert client.get(f"/api/v1/inventory/{malt_id}", headers=headers).json()["quantity"] == 4.0
+
+    before_history = client.get(
+        f"/api/v1/inventory/{malt_id}/balance",
+        params={"at": "2000-01-01T00:00:00Z"},
+        headers=headers,
+    )
+    assert before_history.json()["quantity"] == 0.0
+    assert before_history.json()["transaction_id"] is None
+
+
+def test_inventory_bulk_upsert_accepts_json_and_csv(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="bulk-inventory", email="bulk-inventory@example.com")
+    citra_id = _create_inventory_item(
+        client,
+        headers,
+        name="Citra",
+        ingredient_type="hop",
+        quantity=100,
+        unit="g",
+        low_stock_threshold=10,
+    )
+
+    json_response = client.post(
+        "/api/v1/inventory/bulk",
+        json={
+            "items": [
+                {"name": "Citra", "ingredient_type": "hop", "quantity": 250, "unit": "g", "low_stock_threshold": 20},
+                {"name": "Mosaic", "ingredient_type": "hop", "quantity": 80, "unit": "g"},
+                {"name": "Broken", "ingredient_type": "hop", "quantity": -1, "unit": "g"},
+                {"name": "Mosaic", "ingredient_type": "hop", "quantity": 90, "unit": "g"},
+            ]
+        },
+        headers=headers,
+    )
+    assert json_response.status_code == 200
+    summary = json_response.json()
+    assert summary["received"] == 4
+    assert summary["created"] == 1
+    assert summary["updated"] == 1
+    assert summary["error_count"] == 2
+    assert [error["row"] for error in summary["errors"]] == [2, 3]
+    assert summary["errors"][0]["errors"] == ["Superseded by row 4 with the same name"]
+    assert summary["errors"][1]["errors"][0].startswith("quantity:")
+
+    items = {item["name"]: item for item in client.get("/api/v1/inventory", headers=headers).json()}
+    assert items["Citra"]["id"] == citra_id
+    assert items["Citra"]["quantity"] == 250.0
+    assert items["Citra"]["low_stock_threshold"] == 20.0
+    assert items["Mosaic"]["quantity"] == 90.0
+    assert "Broken" not in items
+
+    citra_ledger = client.get(f"/api/v1/inventory/{citra_id}/transactions", headers=headers).json()
+    assert [(row["kind"], row["quantity_delta"]) for row in citra_ledger] == [("adjust", 150.0), ("restock", 100.0)]
+
+    csv_lines = ["name,ingredient_type,quantity,unit,low_stock_threshold"]
+    csv_lines.extend(f"Malt {index},grain,{index},kg," for index in range(1, 1201))
+    csv_lines.append("Mosaic,hop,not-a-number,g,5")
+    csv_response = client.post(
+        "/api/v1/inventory/bulk",
+        content="\n".join(csv_lines).encode("utf-8"),
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert csv_response.status_code == 200
+    csv_summary = csv_response.json()
+    assert csv_summary["received"] == 1201
+    assert csv_summary["created"] == 1200
+    assert csv_summary["updated"] == 0
+    assert csv_summary["errors"][0]["row"] == 1201
+    assert csv_summary["errors"][0]["name"] == "Mosaic"
+
+    inventory = client.get("/api/v1/inventory", headers=headers).json()
+    assert len(inventory) == 1202
+    malt = next(item for item in inventory if item["name"] == "Malt 1200")
+    assert malt["quantity"] == 1200.0
+    assert malt["low_stock_threshold"] == 0.0
+
+    bad_header = client.post(
+        "/api/v1/inventory/bulk",
+        content=b"name,quantity\nCitra,5\n",
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert bad_header.status_code == 422
+    assert bad_header.json()["detail"] == "CSV header is missing columns: ingredient_type, unit"
+
+    unsupported = client.post(
+        "/api/v1/inventory/bulk",
+        content=b"<items/>",
+        headers={**headers, "Content-Type": "application/xml"},
+    )
+    assert unsupported.status_code == 415
+
+
 def test_timeline_and_upcoming_notifications(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="timeline-user", email="timeline-user@example.com")
     recipe_id = _create_recipe(client, headers=headers)
@@ -996,6 +1219,179 @@ def test_batch_inventory_consume_returns_shortages(client: TestClient) -> None:
     assert len(detail["shortages"]) == 3
 
 
+def test_bulk_batch_inventory_consume_is_all_or_nothing(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="bulk-consume", email="bulk-consume@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+    first_batch_id = _create_batch(client, headers, recipe_id, "Bulk Batch One", status="brewing")
+    second_batch_id = _create_batch(client, headers, recipe_id, "Bulk Batch Two", status="brewing")
+
+    _create_inventory_item(
+        client,
+        headers,
+        name="Pale Malt",
+        ingredient_type="grain",
+        quantity=6,
+        unit="kg",
+        low_stock_threshold=1,
+    )
+    _create_inventory_item(
+        client,
+        headers,
+        name="Citra",
+        ingredient_type="hop",
+        quantity=100,
+        unit="g",
+        low_stock_threshold=10,
+    )
+    _create_inventory_item(
+        client,
+        headers,
+        name="US-05",
+        ingredient_type="yeast",
+        quantity=2,
+        unit="pack",
+        low_stock_threshold=1,
+    )
+
+    # Each batch is covered on its own, but together they need 8.6 kg of malt.
+    oversell_response = client.post(
+        "/api/v1/batches/inventory/consume",
+        json={"batch_ids": [first_batch_id, second_batch_id]},
+        headers=headers,
+    )
+    assert oversell_response.status_code == 409
+    oversell = oversell_response.json()["detail"]
+    assert oversell["consumed"] is False
+    assert oversell["failed_batch_id"] == second_batch_id
+    assert oversell["detail"] == "Insufficient inventory to consume this batch."
+    shortage = oversell["results"][0]["shortages"][0]
+    assert shortage["name"] == "Pale Malt"
+    assert shortage["available_amount"] == 1.7
+
+    inventory_unchanged = {item["name"]: item for item in client.get("/api/v1/inventory", headers=headers).json()}
+    assert inventory_unchanged["Pale Malt"]["quantity"] == 6.0
+    assert inventory_unchanged["Citra"]["quantity"] == 100.0
+    assert client.get(f"/api/v1/batches/{first_batch_id}/inventory/preview", headers=headers).json()["can_consume"]
+
+    missing_response = client.post(
+        "/api/v1/batches/inventory/consume",
+        json={"batch_ids": [first_batch_id, 999999]},
+        headers=headers,
+    )
+    assert missing_response.status_code == 404
+
+    single_response = client.post(
+        "/api/v1/batches/inventory/consume",
+        json={"batch_ids": [first_batch_id, first_batch_id]},
+        headers=headers,
+    )
+    assert single_response.status_code == 200
+    single = single_response.json()
+    assert single["consumed"] is True
+    assert single["batch_count"] == 1
+    consumed_by_name = {row["name"]: row for row in single["results"][0]["items"]}
+    assert set(consumed_by_name) == {"Pale Malt", "Citra", "US-05"}
+    malt_row = consumed_by_name["Pale Malt"]
+    assert malt_row["quantity_before"] == 6.0
+    assert malt_row["quantity_after"] == 1.7
+
+    second_response = client.post(f"/api/v1/batches/{second_batch_id}/inventory/consume", headers=headers)
+    assert second_response.status_code == 409
+    assert second_response.json()["detail"]["detail"] == "Insufficient inventory to consume this batch."
+
+    repeat_response = client.post(
+        "/api/v1/batches/inventory/consume",
+        json={"batch_ids": [first_batch_id]},
+        headers=headers,
+    )
+    assert repeat_response.status_code == 409
+    assert repeat_response.json()["detail"]["detail"] == "Inventory already consumed for this batch."
+
+
+def test_planned_batches_reserve_inventory_and_project_shortages(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="reserve-user", email="reserve-user@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+
+    batch_ids: dict[str, int] = {}
+    for name, brewed_on in (("Later Batch", "2026-11-20"), ("Sooner Batch", "2026-11-06")):
+        response = client.post(
+            "/api/v1/batches",
+            json={
+                "recipe_id": recipe_id,
+                "name": name,
+                "brewed_on": brewed_on,
+                "status": "planned",
+                "volume_liters": 20.0,
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        batch_ids[name] = response.json()["id"]
+
+    _create_inventory_item(client, headers, name="Pale Malt", ingredient_type="grain", quantity=6, unit="kg", low_stock_threshold=0)
+    _create_inventory_item(client, headers, name="Citra", ingredient_type="hop", quantity=100, unit="g", low_stock_threshold=0)
+    _create_inventory_item(client, headers, name="US-05", ingredient_type="yeast", quantity=2, unit="pack", low_stock_threshold=0)
+
+    sooner_preview = client.get(f"/api/v1/batches/{batch_ids['Sooner Batch']}/inventory/preview", headers=headers).json()
+    assert sooner_preview["can_consume"] is True
+    assert all(row["reserved_amount"] == 0.0 for row in sooner_preview["requirements"])
+
+    later_preview = client.get(f"/api/v1/batches/{batch_ids['Later Batch']}/inventory/preview", headers=headers).json()
+    later_malt = next(row for row in later_preview["requirements"] if row["name"] == "Pale Malt")
+    assert later_preview["can_consume"] is False
+    assert later_malt["reserved_amount"] == 4.3
+    assert later_malt["available_amount"] == 1.7
+    assert later_malt["shortage_amount"] == 2.6
+
+    projection_response = client.get("/api/v1/batches/inventory/projection", headers=headers)
+    assert projection_response.status_code == 200
+    projection = projection_response.json()
+    assert projection["batch_count"] == 2
+    assert projection["short_batch_count"] == 1
+    assert [batch["batch_name"] for batch in projection["batches"]] == ["Sooner Batch", "Later Batch"]
+    assert projection["batches"][0]["can_brew"] is True
+    assert projection["batches"][1]["shortages"] == [
+        {
+            "name": "Pale Malt",
+            "ingredient_type": "grain",
+            "unit": "kg",
+            "required_amount": 4.3,
+            "available_amount": 1.7,
+            "shortage_amount": 2.6,
+        }
+    ]
+    assert projection["ingredients"] == [
+        {
+            "name": "Pale Malt",
+            "unit": "kg",
+            "first_short_on": "2026-11-20",
+            "first_short_batch_id": batch_ids["Later Batch"],
+            "total_shortage_amount": 2.6,
+        }
+    ]
+
+    # The later batch can still be brewed first from physical stock; that releases its reservation.
+    consume_response = client.post(f"/api/v1/batches/{batch_ids['Later Batch']}/inventory/consume", headers=headers)
+    assert consume_response.status_code == 200
+    projection_after_consume = client.get("/api/v1/batches/inventory/projection", headers=headers).json()
+    assert [batch["batch_name"] for batch in projection_after_consume["batches"]] == ["Sooner Batch"]
+    assert projection_after_consume["short_batch_count"] == 1
+
+    cancel_response = client.post(f"/api/v1/batches/{batch_ids['Sooner Batch']}/cancel", headers=headers)
+    assert cancel_response.status_code == 200
+    assert cancel_response.json()["status"] == "cancelled"
+    assert client.post(f"/api/v1/batches/{batch_ids['Sooner Batch']}/cancel", headers=headers).status_code == 409
+    assert client.post(f"/api/v1/batches/{batch_ids['Later Batch']}/cancel", headers=headers).status_code == 409
+
+    projection_after_cancel = client.get("/api/v1/batches/inventory/projection", headers=headers).json()
+    assert projection_after_cancel["batch_count"] == 0
+    assert projection_after_cancel["ingredients"] == []
+
+    cancelled_consume = client.post(f"/api/v1/batches/{batch_ids['Sooner Batch']}/inventory/consume", headers=headers)
+    assert cancelled_consume.status_code == 409
+    assert cancelled_consume.json()["detail"]["detail"] == "Cancelled batches cannot consume inventory."
+
+
 def test_batch_inventory_preview_and_consume_with_imperial_units(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="consume-imperial", email="consume-imperial@example.com")
     recipe_id = _create_recipe(client, headers=headers)
@@ -1047,6 +1443,77 @@ def test_batch_inventory_preview_and_consume_with_imperial_units(client: TestCli
     assert items_after["US-05"]["quantity"] == 1.0
 
 
+def test_batch_inventory_preview_matches_normalized_names_and_units(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="preview-match", email="preview-match@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+    batch_id = _create_batch(client, headers, recipe_id, "Preview Match Batch", status="brewing")
+
+    malt_id = _create_inventory_item(
+        client,
+        headers,
+        name="  pale malt",
+        ingredient_type="grain",
+        quantity=9.5,
+        unit="Pounds",
+        low_stock_threshold=1.0,
+    )
+    citra_id = _create_inventory_item(
+        client,
+        headers,
+        name="Citra",
+        ingredient_type="hop",
+        quantity=3,
+        unit="pack",
+        low_stock_threshold=1.0,
+    )
+
+    other_headers = _register_and_get_headers(client, username="preview-other", email="preview-other@example.com")
+    _create_inventory_item(
+        client,
+        other_headers,
+        name="US-05",
+        ingredient_type="yeast",
+        quantity=10,
+        unit="pack",
+        low_stock_threshold=1.0,
+    )
+
+    preview_response = client.get(f"/api/v1/batches/{batch_id}/inventory/preview", headers=headers)
+    assert preview_response.status_code == 200
+    rows = {row["name"]: row for row in preview_response.json()["requirements"]}
+
+    assert rows["Pale Malt"]["inventory_item_id"] == malt_id
+    assert rows["Pale Malt"]["inventory_unit"] == "Pounds"
+    assert rows["Pale Malt"]["available_amount"] == pytest.approx(4.309124, abs=1e-4)
+    assert rows["Pale Malt"]["enough_stock"] is True
+
+    assert rows["Citra"]["inventory_item_id"] == citra_id
+    assert rows["Citra"]["available_amount"] == 0.0
+    assert rows["Citra"]["enough_stock"] is False
+
+    assert rows["US-05"]["inventory_item_id"] is None
+    assert rows["US-05"]["shortage_amount"] == 1.0
+
+    rename_response = client.put(
+        f"/api/v1/inventory/{citra_id}",
+        json={
+            "name": "CITRA ",
+            "ingredient_type": "hop",
+            "quantity": 0.05,
+            "unit": "kg",
+            "low_stock_threshold": 0.01,
+        },
+        headers=headers,
+    )
+    assert rename_response.status_code == 200
+
+    renamed_preview = client.get(f"/api/v1/batches/{batch_id}/inventory/preview", headers=headers)
+    renamed_rows = {row["name"]: row for row in renamed_preview.json()["requirements"]}
+    assert renamed_rows["Citra"]["inventory_item_id"] == citra_id
+    assert renamed_rows["Citra"]["available_amount"] == 50.0
+    assert renamed_rows["Citra"]["enough_stock"] is True
+
+
 def test_external_recipe_catalog_and_import_flow(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="import-recipe-user", email="import-recipe-user@example.com")
 
@@ -1055,6 +1522,16 @@ def test_external_recipe_catalog_and_import_flow(client: TestClient) -> None:
     catalog = catalog_response.json()
     assert catalog["count"] >= 1
     assert len(catalog["items"]) >= 1
+    assert catalog["total"] == catalog["count"]
+
+    page = client.get("/api/v1/imports/recipes/catalog?limit=1&offset=1", headers=headers).json()
+    assert page["count"] == 1
+    assert page["total"] == catalog["total"]
+    assert page["items"][0] == catalog["items"][1]
+
+    search = client.get("/api/v1/imports/recipes/catalog?search=ipa", headers=headers).json()
+    assert search["total"] >= 1
+    assert all("ipa" in f"{row['name']} {row['style']}".lower() for row in search["items"])
 
     item = catalog["items"][0]
 
@@ -1079,6 +1556,182 @@ def test_external_recipe_catalog_and_import_flow(client: TestClient) -> None:
 
 
 
+def test_bulk_recipe_import_skips_already_imported_templates(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="bulk-import-user", email="bulk-import-user@example.com")
+    catalog = client.get("/api/v1/imports/recipes/catalog", headers=headers).json()["items"]
+    first, second = catalog[0], catalog[1]
+
+    single = client.post(
+        "/api/v1/imports/recipes/import",
+        json={"provider": first["provider"], "external_id": first["external_id"]},
+        headers=headers,
+    ).json()
+
+    response = client.post(
+        "/api/v1/imports/recipes/bulk",
+        json={
+            "items": [
+                {"provider": first["provider"], "external_id": first["external_id"]},
+                {"provider": second["provider"], "external_id": second["external_id"]},
+                {"provider": second["provider"], "external_id": second["external_id"]},
+                {"provider": "nowhere", "external_id": "missing"},
+            ]
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    body = response.json()
+    first_key = f"{first['provider']}:{first['external_id']}"
+    second_key = f"{second['provider']}:{second['external_id']}"
+    assert body["requested"] == 3
+    assert body["skipped"] == {first_key: single["recipe_id"]}
+    assert list(body["imported"]) == [second_key]
+    assert body["not_found"] == ["nowhere:missing"]
+
+    recipe = client.get(f"/api/v1/recipes/{body['imported'][second_key]}", headers=headers).json()
+    assert recipe["name"] == second["name"]
+    assert recipe["source_provider"] == second["provider"]
+    assert len(recipe["ingredients"]) == len(second["ingredients"])
+
+    repeat = client.post(
+        "/api/v1/imports/recipes/bulk",
+        json={"items": [{"provider": second["provider"], "external_id": second["external_id"]}]},
+        headers=headers,
+    ).json()
+    assert repeat["imported_count"] == 0
+    assert repeat["skipped"] == body["imported"]
+
+    duplicate_single = client.post(
+        "/api/v1/imports/recipes/import",
+        json={"provider": second["provider"], "external_id": second["external_id"]},
+        headers=headers,
+    )
+    assert duplicate_single.status_code == 409
+
+
+def test_bulk_recipe_import_skips_templates_imported_concurrently(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    headers = _register_and_get_headers(client, username="race-import-user", email="race-import-user@example.com")
+    first, second = client.get("/api/v1/imports/recipes/catalog", headers=headers).json()["items"][:2]
+    raced_ids: list[int | None] = []
+
+    def get_template_after_another_import(*, provider: str, external_id: str) -> ExternalRecipeTemplate | None:
+        # Another request imports the first template after this one found it missing.
+        template = get_recipe_template(provider=provider, external_id=external_id)
+        if external_id == first["external_id"] and not raced_ids:
+            db = next(client.app.dependency_overrides[get_db]())
+            user_id = db.scalar(select(User.id).where(User.username == "race-import-user"))
+            raced_ids.extend(insert_recipe_templates(db, user_id=user_id, templates=[template]))
+            db.commit()
+            db.close()
+        return template
+
+    monkeypatch.setattr(recipe_import, "get_recipe_template", get_template_after_another_import)
+    response = client.post(
+        "/api/v1/imports/recipes/bulk",
+        json={"items": [{"provider": item["provider"], "external_id": item["external_id"]} for item in (first, second)]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["skipped"] == {f"{first['provider']}:{first['external_id']}": raced_ids[0]}
+    assert list(body["imported"]) == [f"{second['provider']}:{second['external_id']}"]
+
+    recipes = client.get("/api/v1/recipes", headers=headers).json()
+    assert sorted(recipe["source_external_id"] for recipe in recipes) == sorted(
+        [first["external_id"], second["external_id"]]
+    )
+
+    other_headers = _register_and_get_headers(client, username="bulk-import-b", email="bulk-import-b@example.com")
+    other = client.post(
+        "/api/v1/imports/recipes/bulk",
+        json={"items": [{"provider": first["provider"], "external_id": first["external_id"]}]},
+        headers=other_headers,
+    ).json()
+    assert other["imported_count"] == 1
+    assert client.post("/api/v1/imports/recipes/bulk", json={"items": []}, headers=headers).status_code == 422
+
+
+def test_recipe_file_import_streams_beerxml_and_beerjson(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="file-import-user", email="file-import-user@example.com")
+    beerxml = """<?xml version="1.0" encoding="UTF-8"?>
+<RECIPES>
+  <RECIPE>
+    <NAME>Garden Saison</NAME>
+    <STYLE><NAME>Saison</NAME></STYLE>
+    <OG>1.050</OG><FG>1.004</FG><IBU>28</IBU>
+    <FERMENTABLES><FERMENTABLE><NAME>Pilsner Malt</NAME><TYPE>Grain</TYPE><AMOUNT>4.2</AMOUNT></FERMENTABLE></FERMENTABLES>
+    <HOPS><HOP><NAME>Saaz</NAME><AMOUNT>0.03</AMOUNT><USE>Boil</USE><TIME>60</TIME></HOP></HOPS>
+    <YEASTS><YEAST><NAME>Belle Saison</NAME></YEAST></YEASTS>
+  </RECIPE>
+  <RECIPE><NAME>Unfinished</NAME><FG>1.010</FG></RECIPE>
+</RECIPES>"""
+
+    response = client.post(
+        "/api/v1/imports/recipes/file",
+        content=beerxml.encode(),
+        headers={**headers, "Content-Type": "application/xml"},
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert body["format"] == "beerxml"
+    assert body["records_parsed"] == 2
+    assert body["imported_count"] == 1
+    assert body["batches_committed"] == 1
+    assert body["errors"] == [{"record": 2, "name": "Unfinished", "error": "Recipe has no original or final gravity"}]
+
+    recipe = client.get(f"/api/v1/recipes/{body['recipe_ids'][0]}", headers=headers).json()
+    assert recipe["name"] == "Garden Saison"
+    assert recipe["source_provider"] is None
+    assert {(item["name"], item["amount"], item["unit"]) for item in recipe["ingredients"]} == {
+        ("Pilsner Malt", 4.2, "kg"),
+        ("Saaz", 30.0, "g"),
+        ("Belle Saison", 1.0, "pack"),
+    }
+
+    beerjson = {
+        "beerjson": {
+            "version": 1.0,
+            "recipes": [
+                {
+                    "name": f"Session IPA {index}",
+                    "original_gravity": {"unit": "sg", "value": 1.040},
+                    "final_gravity": {"unit": "sg", "value": 1.008},
+                    "ingredients": {"hop_additions": [{"name": "Mosaic", "amount": {"unit": "g", "value": 40}}]},
+                }
+                for index in range(3)
+            ],
+        }
+    }
+    json_response = client.post(
+        "/api/v1/imports/recipes/file",
+        content=json.dumps(beerjson).encode(),
+        headers={**headers, "Content-Type": "application/json"},
+    )
+    assert json_response.status_code == 201
+    assert json_response.json()["imported_count"] == 3
+    names = {recipe["name"] for recipe in client.get("/api/v1/recipes", headers=headers).json()}
+    assert {"Garden Saison", "Session IPA 0", "Session IPA 2"} <= names
+
+    unsupported = client.post(
+        "/api/v1/imports/recipes/file", content=b"name,og", headers={**headers, "Content-Type": "text/csv"}
+    )
+    assert unsupported.status_code == 415
+    malformed = client.post(
+        "/api/v1/imports/recipes/file",
+        content=b"<RECIPES><RECIPE><NAME>Broken</RECIPES>",
+        headers={**headers, "Content-Type": "application/xml"},
+    )
+    assert malformed.status_code == 422
+    empty = client.post(
+        "/api/v1/imports/recipes/file",
+        content=b'{"beerjson": {"recipes": []}}',
+        headers={**headers, "Content-Type": "application/json"},
+    )
+    assert empty.status_code == 422
+
+
 def test_external_equipment_catalog_import_and_scope(client: TestClient) -> None:
     headers_a = _register_and_get_headers(client, username="import-equip-a", email="import-equip-a@example.com")
     headers_b = _register_and_get_headers(client, username="import-equip-b", email="import-equip-b@example.com")
@@ -1214,6 +1867,51 @@ def test_ingredients_crud_flow(client: TestClient) -> None:
 
 
 
+def test_fuzzy_inventory_suggestions_never_cover_or_consume_stock(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="fuzzy-suggest", email="fuzzy-suggest@example.com")
+    recipe_response = client.post(
+        "/api/v1/recipes",
+        json={
+            "name": "Brown Ale",
+            "style": "Brown Ale",
+            "target_og": 1.050,
+            "target_fg": 1.012,
+            "target_ibu": 25,
+            "target_srm": 20,
+            "efficiency_pct": 72,
+            "notes": "",
+            "ingredients": [
+                {"name": "Chocolate Malt", "ingredient_type": "grain", "amount": 1, "unit": "kg", "stage": "mash", "minute_added": 0},
+                {"name": "Munich Malt I", "ingredient_type": "grain", "amount": 1, "unit": "kg", "stage": "mash", "minute_added": 0},
+            ],
+        },
+        headers=headers,
+    )
+    assert recipe_response.status_code == 201
+    batch_id = _create_batch(client, headers, recipe_response.json()["id"], "Suggestion Batch", status="brewing")
+    chocolate_id = _create_inventory_item(
+        client, headers, name="Pale Chocolate Malt", ingredient_type="grain", quantity=5, unit="kg", low_stock_threshold=1
+    )
+    munich_id = _create_inventory_item(
+        client, headers, name="Munich Malt II", ingredient_type="grain", quantity=5, unit="kg", low_stock_threshold=1
+    )
+
+    preview = client.get(f"/api/v1/batches/{batch_id}/inventory/preview", headers=headers).json()
+    assert preview["can_consume"] is False
+    rows = {row["name"]: row for row in preview["requirements"]}
+    assert rows["Chocolate Malt"]["matched_name"] == "Pale Chocolate Malt"
+    assert 0.75 <= rows["Chocolate Malt"]["match_score"] < 1.0
+    for row in rows.values():
+        assert row["inventory_item_id"] is None
+        assert row["available_amount"] == 0.0
+        assert row["enough_stock"] is False
+
+    consume_response = client.post(f"/api/v1/batches/{batch_id}/inventory/consume", headers=headers)
+    assert consume_response.status_code == 409
+    for item_id in (chocolate_id, munich_id):
+        assert client.get(f"/api/v1/inventory/{item_id}", headers=headers).json()["quantity"] == 5
+
+
 def test_ingredients_user_scope_isolation(client: TestClient) -> None:
     headers_a = _register_and_get_headers(client, username="ingredient-owner-a", email="ingredient-owner-a@example.com")
     headers_b = _register_and_get_headers(client, username="ingredient-owner-b", email="ingredient-owner-b@example.com")
@@ -1245,6 +1943,103 @@ def test_ingredients_user_scope_isolation(client: TestClient) -> None:
     assert client.delete(f"/api/v1/ingredients/{ingredient_id}", headers=headers_b).status_code == 404
 
 
+def test_ingredient_name_matching_links_inventory_to_recipe_names(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="fuzzy-match", email="fuzzy-match@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+    batch_id = _create_batch(client, headers, recipe_id, "Fuzzy Match Batch", status="brewing")
+
+    malt_id = _create_inventory_item(
+        client,
+        headers,
+        name="Pale-Malt",
+        ingredient_type="grain",
+        quantity=5,
+        unit="kg",
+        low_stock_threshold=1.0,
+    )
+    citra_id = _create_inventory_item(
+        client,
+        headers,
+        name="Citra Pellets",
+        ingredient_type="hop",
+        quantity=100,
+        unit="g",
+        low_stock_threshold=10,
+    )
+    _create_inventory_item(
+        client,
+        headers,
+        name="Munich Malt",
+        ingredient_type="grain",
+        quantity=2,
+        unit="kg",
+        low_stock_threshold=1.0,
+    )
+    profile_response = client.post(
+        "/api/v1/ingredients",
+        json={"name": "Pale Malt (2-Row)", "ingredient_type": "grain", "default_unit": "kg"},
+        headers=headers,
+    )
+    assert profile_response.status_code == 201
+
+    preview_response = client.get(f"/api/v1/batches/{batch_id}/inventory/preview", headers=headers)
+    assert preview_response.status_code == 200
+    rows = {row["name"]: row for row in preview_response.json()["requirements"]}
+
+    assert rows["Pale Malt"]["inventory_item_id"] == malt_id
+    assert rows["Pale Malt"]["matched_name"] == "Pale-Malt"
+    assert rows["Pale Malt"]["match_score"] == 1.0
+    assert rows["Pale Malt"]["enough_stock"] is True
+
+    assert rows["Citra"]["inventory_item_id"] is None
+    assert rows["Citra"]["match_score"] is None
+
+    match_response = client.get(
+        "/api/v1/ingredients/match",
+        params={"name": "pale malt 2 row", "ingredient_type": "grain"},
+        headers=headers,
+    )
+    assert match_response.status_code == 200
+    matches = match_response.json()["matches"]
+    assert matches[0]["source"] == "profile"
+    assert matches[0]["name"] == "Pale Malt (2-Row)"
+    assert matches[0]["score"] == 1.0
+    assert "Munich Malt" not in {match["name"] for match in matches}
+
+    loose_response = client.get(
+        "/api/v1/ingredients/match",
+        params={"name": "Citra", "source": "inventory", "min_score": 0.3},
+        headers=headers,
+    )
+    assert loose_response.status_code == 200
+    assert [match["id"] for match in loose_response.json()["matches"]] == [citra_id]
+
+    rename_response = client.put(
+        f"/api/v1/inventory/{citra_id}",
+        json={
+            "name": "Citra Hops",
+            "ingredient_type": "hop",
+            "quantity": 100,
+            "unit": "g",
+            "low_stock_threshold": 10,
+        },
+        headers=headers,
+    )
+    assert rename_response.status_code == 200
+
+    renamed_response = client.get(
+        "/api/v1/ingredients/match",
+        params={"name": "citra hops"},
+        headers=headers,
+    )
+    assert renamed_response.status_code == 200
+    assert renamed_response.json()["matches"][0]["name"] == "Citra Hops"
+
+    other_headers = _register_and_get_headers(client, username="fuzzy-other", email="fuzzy-other@example.com")
+    other_response = client.get("/api/v1/ingredients/match", params={"name": "Pale Malt"}, headers=other_headers)
+    assert other_response.status_code == 200
+    assert other_response.json()["count"] == 0
+
 
 def test_external_ingredient_catalog_and_import_flow(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="ingredient-import-user", email="ingredient-import-user@example.com")
@@ -1534,6 +2329,35 @@ def test_recipe_hop_substitutions_with_provided_candidates(client: TestClient) -
     assert "citrus" in top["shared_descriptors"]
 
 
+def test_similar_hops_searches_whole_catalog(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="hop-similar", email="hop-similar@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+
+    similar_response = client.get("/api/v1/hops/citra pellets/similar?k=3", headers=headers)
+    assert similar_response.status_code == 200
+    body = similar_response.json()
+    assert body["hop"]["name"] == "Citra"
+    assert body["catalog_size"] >= 16
+    assert len(body["similar"]) == 3
+    assert body["similar"][0]["name"] == "Mosaic"
+    scores = [row["similarity_score"] for row in body["similar"]]
+    assert scores == sorted(scores, reverse=True)
+
+    assert client.get("/api/v1/hops/Unknown Experimental Hop/similar", headers=headers).status_code == 404
+    assert client.get("/api/v1/hops/Citra/similar").status_code == 401
+
+    scope_response = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions",
+        json={"target_hop_name": "Citra", "candidate_scope": "any", "top_k": 3},
+        headers=headers,
+    )
+    assert scope_response.status_code == 200
+    scope_body = scope_response.json()
+    assert scope_body["candidate_source"] == "catalog"
+    assert scope_body["recognized_candidate_count"] == body["catalog_size"] - 1
+    assert [row["name"] for row in scope_body["substitutions"]] == [row["name"] for row in body["similar"]]
+
+
 def test_recipe_hop_substitutions_uses_inventory_candidates(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="hop-sub-inv", email="hop-sub-inv@example.com")
     recipe_id = _create_recipe(client, headers=headers)
@@ -1586,6 +2410,165 @@ def test_recipe_hop_substitutions_uses_inventory_candidates(client: TestClient)
     assert "Magnum" in names
 
 
+def test_recipe_hop_substitutions_resolve_misspelt_names(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="hop-sub-typo", email="hop-sub-typo@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+
+    _create_inventory_item(
+        client,
+        headers,
+        name="Mosaic T-90 pelets",
+        ingredient_type="hop",
+        quantity=100,
+        unit="g",
+        low_stock_threshold=20,
+    )
+
+    payload = {
+        "target_hop_name": "Ctira",
+        "available_hop_names": ["Amarilo", "Unknown Experimental Hop"],
+        "include_inventory_hops": True,
+        "top_k": 3,
+    }
+    response = client.post(f"/api/v1/recipes/{recipe_id}/hop-substitutions", json=payload, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["target_hop_profile"]["name"] == "Citra"
+    assert 0.75 <= body["target_match_confidence"] < 1.0
+    assert body["candidate_source"] == "provided+inventory"
+    assert body["unresolved_hop_names"] == ["Unknown Experimental Hop"]
+    resolved = {row["input_name"]: row for row in body["resolved_hop_names"]}
+    assert resolved["Amarilo"]["resolved_name"] == "Amarillo"
+    assert resolved["Mosaic T-90 pelets"]["resolved_name"] == "Mosaic"
+    assert resolved["Mosaic T-90 pelets"]["confidence"] == 0.95
+    assert body["substitutions"][0]["name"] == "Mosaic"
+
+    _create_inventory_item(
+        client,
+        headers,
+        name="Simcoe",
+        ingredient_type="hop",
+        quantity=50,
+        unit="g",
+        low_stock_threshold=10,
+    )
+    refreshed = client.post(f"/api/v1/recipes/{recipe_id}/hop-substitutions", json=payload, headers=headers)
+    assert refreshed.status_code == 200
+    assert refreshed.json()["recognized_candidate_count"] == 3
+
+
+def test_recipe_hop_substitutions_batch_scores_all_recipe_hops(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="hop-sub-batch", email="hop-sub-batch@example.com")
+    recipe_response = client.post(
+        "/api/v1/recipes",
+        json={
+            "name": "Two Hop IPA",
+            "style": "American IPA",
+            "target_og": 1.062,
+            "target_fg": 1.012,
+            "target_ibu": 55,
+            "target_srm": 6,
+            "efficiency_pct": 72,
+            "ingredients": [
+                {"name": "Pale Malt", "ingredient_type": "grain", "amount": 5.0, "unit": "kg"},
+                {"name": "Citra", "ingredient_type": "hop", "amount": 40, "unit": "g"},
+                {"name": "Chinook", "ingredient_type": "hop", "amount": 20, "unit": "g"},
+                {"name": "House Experimental", "ingredient_type": "hop", "amount": 10, "unit": "g"},
+            ],
+        },
+        headers=headers,
+    )
+    assert recipe_response.status_code == 201
+    recipe_id = recipe_response.json()["id"]
+
+    _create_inventory_item(
+        client,
+        headers,
+        name="Simcoe",
+        ingredient_type="hop",
+        quantity=100,
+        unit="g",
+        low_stock_threshold=20,
+    )
+
+    response = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions/batch",
+        json={"available_hop_names": ["Mosaic", "Columbus"], "top_k": 2},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["candidate_source"] == "provided+inventory"
+    assert body["recognized_candidate_count"] == 3
+    assert body["unresolved_target_names"] == ["House Experimental"]
+    targets = {row["target_hop_name"]: row for row in body["targets"]}
+    assert set(targets) == {"Citra", "Chinook"}
+    assert targets["Citra"]["substitutions"][0]["name"] == "Mosaic"
+    assert all(len(row["substitutions"]) == 2 for row in body["targets"])
+
+    single = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions",
+        json={"target_hop_name": "Chinook", "available_hop_names": ["Mosaic", "Columbus"], "top_k": 2},
+        headers=headers,
+    )
+    assert single.status_code == 200
+    assert targets["Chinook"]["substitutions"] == single.json()["substitutions"]
+
+    missing = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions/batch",
+        json={"target_hop_names": ["Citra", "Saaz"], "available_hop_names": ["Mosaic"]},
+        headers=headers,
+    )
+    assert missing.status_code == 422
+    assert "Saaz" in missing.json()["detail"]
+
+
+def test_recipe_hop_substitutions_suggest_blends(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="hop-sub-blend", email="hop-sub-blend@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+
+    payload = {
+        "target_hop_name": "Citra",
+        "available_hop_names": ["Cascade", "Simcoe", "Saaz"],
+        "include_inventory_hops": False,
+        "top_k": 3,
+    }
+    single_only = client.post(f"/api/v1/recipes/{recipe_id}/hop-substitutions", json=payload, headers=headers)
+    assert single_only.status_code == 200
+    assert single_only.json()["blends"] == []
+
+    response = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions",
+        json={**payload, "blend_max_hops": 3},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    best_single = body["substitutions"][0]
+    best_blend = body["blends"][0]
+    assert best_blend["similarity_score"] > best_single["similarity_score"]
+    assert {component["name"] for component in best_blend["components"]} == {"Cascade", "Simcoe"}
+    assert sum(component["proportion"] for component in best_blend["components"]) == pytest.approx(1.0, abs=0.002)
+    assert best_blend["recommended_bittering_ratio"] > 0
+
+    too_many = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions",
+        json={**payload, "blend_max_hops": 4},
+        headers=headers,
+    )
+    assert too_many.status_code == 422
+
+    catalog_scope = client.post(
+        f"/api/v1/recipes/{recipe_id}/hop-substitutions/batch",
+        json={"target_hop_names": ["citra pellets"], "candidate_scope": "any", "top_k": 3},
+        headers=headers,
+    )
+    assert catalog_scope.status_code == 200
+    assert catalog_scope.json()["candidate_source"] == "catalog"
+    assert len(catalog_scope.json()["targets"][0]["substitutions"]) == 3
+
+
 def test_recipe_hop_substitutions_requires_hop_from_recipe(client: TestClient) -> None:
     headers = _register_and_get_headers(client, username="hop-sub-validate", email="hop-sub-validate@example.com")
     recipe_id = _create_recipe(client, headers=headers)
@@ -1646,6 +2629,72 @@ def test_bjcp_style_catalog_and_detail(client: TestClient) -> None:
     detail = detail_response.json()
     assert detail["name"] == "American IPA"
     assert detail["sulfate_ppm"]["target_ppm"] > detail["chloride_ppm"]["target_ppm"]
+    assert client.get("/api/v1/styles/bjcp/american-ipa", headers=headers).json()["code"] == "21A"
+
+    suggest_response = client.get("/api/v1/styles/bjcp/suggest?q=amer", headers=headers)
+    assert suggest_response.status_code == 200
+    suggestions = suggest_response.json()
+    assert suggestions["count"] >= 2
+    scores = [item["score"] for item in suggestions["items"]]
+    assert scores == sorted(scores, reverse=True)
+
+    typo_response = client.get("/api/v1/styles/bjcp/suggest?q=americn%20ip", headers=headers)
+    assert [item["code"] for item in typo_response.json()["items"]] == ["21A"]
+    assert client.get("/api/v1/styles/bjcp/suggest?q=zzzz", headers=headers).json()["count"] == 0
+    assert client.get("/api/v1/styles/bjcp/suggest", headers=headers).status_code == 422
+
+
+def test_static_catalogs_send_etags_and_honour_if_none_match(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="etag-user", email="etag-user@example.com")
+
+    for url in (
+        "/api/v1/styles/bjcp",
+        "/api/v1/styles/bjcp/american-ipa",
+        "/api/v1/imports/recipes/catalog",
+        "/api/v1/imports/equipment/catalog?search=kettle",
+        "/api/v1/imports/ingredients/catalog?ingredient_type=hop",
+    ):
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('"')
+        assert first.headers["cache-control"].startswith("private, max-age=")
+        assert first.headers["vary"] == "Authorization"
+        assert client.get(url, headers=headers).headers["etag"] == etag
+
+        not_modified = client.get(url, headers={**headers, "If-None-Match": f'"stale", W/{etag}'})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+    assert client.get("/api/v1/styles/bjcp/21A", headers=headers).headers["etag"] == client.get(
+        "/api/v1/styles/bjcp/american-ipa", headers=headers
+    ).headers["etag"]
+    assert (
+        client.get("/api/v1/styles/bjcp?search=ipa", headers=headers).headers["etag"]
+        != client.get("/api/v1/styles/bjcp", headers=headers).headers["etag"]
+    )
+    assert client.get("/api/v1/styles/bjcp/unknown", headers={**headers, "If-None-Match": "*"}).status_code == 404
+
+
+def test_catalog_first_pages_are_listed_and_encoded_on_first_request() -> None:
+    listed: list[str] = []
+
+    def first_pages() -> list[dict[str, str | int | None]]:
+        listed.append("first pages")
+        return [{"limit": 2}]
+
+    def build(**params: int) -> ExternalRecipeCatalogResponse:
+        return ExternalRecipeCatalogResponse(count=0, total=0, offset=0, items=[], **params)
+
+    responses = CachedCatalogResponses("http_lazy_catalog_test", build, prebuilt=first_pages)
+    assert listed == []
+
+    first = responses.get(limit=2)
+    assert listed == ["first pages"]
+    assert responses.get(limit=2) is first
+    assert responses.get(limit=3) is not first
+    assert listed == ["first pages"]
 
 
 def test_water_profile_crud_and_recommendation_by_style_code(client: TestClient) -> None:
@@ -1782,6 +2831,125 @@ def test_water_recommendation_from_recipe_style(client: TestClient) -> None:
     assert body["style_code"] == "21A"
     assert body["batch_volume_liters"] == 23.0
     assert len(body["additions"]) >= 1
+    assert body["mode"] == "greedy"
+
+    optimized_response = client.post(
+        f"/api/v1/water-profiles/{water_profile_id}/recommendations",
+        json={"recipe_id": recipe_id, "batch_volume_liters": 23, "mode": "optimize", "allow_dilution": True},
+        headers=headers,
+    )
+    assert optimized_response.status_code == 200
+    optimized = optimized_response.json()
+    assert optimized["mode"] == "optimize"
+    assert optimized["ro_dilution_fraction"] == 0.0
+    assert {item["mineral_name"] for item in optimized["additions"]} >= {"Gypsum (CaSO4)"}
+    assert optimized["projected_profile"]["sulfate_ppm"] >= 120
+    assert optimized["ro_blend_options"] == []
+
+    blends_response = client.post(
+        f"/api/v1/water-profiles/{water_profile_id}/recommendations",
+        json={"recipe_id": recipe_id, "batch_volume_liters": 23, "include_ro_blends": True},
+        headers=headers,
+    )
+    assert blends_response.status_code == 200
+    blends = blends_response.json()["ro_blend_options"]
+    assert blends[0]["ro_dilution_fraction"] == 0.0
+    assert all(option["distance_to_range"] >= 0 for option in blends)
+
+
+def test_water_recommendations_are_cached_until_profile_changes(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="water-cache", email="water-cache@example.com")
+    water_profile = {
+        "name": "Cached Tap",
+        "calcium_ppm": 40,
+        "magnesium_ppm": 6,
+        "sodium_ppm": 12,
+        "chloride_ppm": 30,
+        "sulfate_ppm": 40,
+        "bicarbonate_ppm": 90,
+        "notes": "",
+    }
+    water_profile_id = client.post("/api/v1/water-profiles", json=water_profile, headers=headers).json()["id"]
+    url = f"/api/v1/water-profiles/{water_profile_id}/recommendations"
+
+    def water_cache_metrics() -> dict:
+        caches = client.get("/api/v1/observability/metrics", headers=headers).json()["caches"]
+        return next(item for item in caches if item["name"] == "water_recommendations")
+
+    before = water_cache_metrics()
+    first = client.post(url, json={"style_code": "21A"}, headers=headers)
+    second = client.post(url, json={"style_code": "21A"}, headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    after = water_cache_metrics()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert 0 < after["hit_rate"] <= 1
+
+    client.put(
+        f"/api/v1/water-profiles/{water_profile_id}",
+        json={**water_profile, "sulfate_ppm": 250},
+        headers=headers,
+    )
+    updated = client.post(url, json={"style_code": "21A"}, headers=headers).json()
+    assert updated["source_profile"]["sulfate_ppm"] == 250
+    assert water_cache_metrics()["misses"] == after["misses"] + 1
+
+    assert client.delete(f"/api/v1/water-profiles/{water_profile_id}", headers=headers).status_code == 204
+    assert client.post(url, json={"style_code": "21A"}, headers=headers).status_code == 404
+
+
+def test_water_style_compatibility_ranks_every_style(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="water-compat", email="water-compat@example.com")
+    water_profile = {
+        "name": "Hard Tap",
+        "calcium_ppm": 110,
+        "magnesium_ppm": 18,
+        "sodium_ppm": 30,
+        "chloride_ppm": 60,
+        "sulfate_ppm": 90,
+        "bicarbonate_ppm": 220,
+        "notes": "",
+    }
+    water_response = client.post("/api/v1/water-profiles", json=water_profile, headers=headers)
+    assert water_response.status_code == 201
+    water_profile_id = water_response.json()["id"]
+
+    styles_count = client.get("/api/v1/styles/bjcp", headers=headers).json()["count"]
+    response = client.get(f"/api/v1/water-profiles/{water_profile_id}/style-compatibility", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == styles_count
+    distances = [row["projected_distance_to_range"] for row in body["items"]]
+    assert distances == sorted(distances)
+    by_code = {row["style_code"]: row for row in body["items"]}
+    assert "bicarbonate_ppm" in by_code["8A"]["ions_out_of_range"]
+    assert by_code["8A"]["distance_to_range"] > 0
+
+    cached = client.get(f"/api/v1/water-profiles/{water_profile_id}/style-compatibility", headers=headers)
+    assert cached.json() == body
+
+    limited = client.get(
+        f"/api/v1/water-profiles/{water_profile_id}/style-compatibility?limit=3&batch_volume_liters=10",
+        headers=headers,
+    )
+    assert limited.status_code == 200
+    assert limited.json()["count"] == 3
+
+    update_response = client.put(
+        f"/api/v1/water-profiles/{water_profile_id}",
+        json={**water_profile, "bicarbonate_ppm": 20},
+        headers=headers,
+    )
+    assert update_response.status_code == 200
+    refreshed = client.get(f"/api/v1/water-profiles/{water_profile_id}/style-compatibility", headers=headers).json()
+    assert "bicarbonate_ppm" not in {row["style_code"]: row for row in refreshed["items"]}["8A"]["ions_out_of_range"]
+
+    other_headers = _register_and_get_headers(client, username="water-compat-b", email="water-compat-b@example.com")
+    assert (
+        client.get(f"/api/v1/water-profiles/{water_profile_id}/style-compatibility", headers=other_headers).status_code
+        == 404
+    )
 
 
 def test_water_profiles_user_scope_and_unknown_style(client: TestClient) -> None:
@@ -1922,6 +3090,7 @@ def test_brew_plan_combines_inventory_water_and_substitutions(client: TestClient
             "water_profile_id": water_profile_id,
             "available_hop_names": ["Simcoe"],
             "brew_start_at": "2026-03-01T08:00:00",
+            "water_include_ro_blends": True,
         },
         headers=headers,
     )
@@ -1929,6 +3098,7 @@ def test_brew_plan_combines_inventory_water_and_substitutions(client: TestClient
     body = brew_plan_response.json()
 
     assert body["batch_id"] == batch_id
+    assert len(body["water_recommendation"]["ro_blend_options"]) >= 1
     assert body["equipment"]["equipment_profile_id"] == equipment_id
     assert body["water_recommendation"] is not None
     assert body["water_recommendation"]["style_code"] == "21B"
@@ -1948,6 +3118,114 @@ def test_brew_plan_combines_inventory_water_and_substitutions(client: TestClient
     assert first_step["planned_start_at"].startswith("2026-03-01T08:00:00")
 
 
+def test_brew_plan_sweep_matches_single_plan_and_bounds_grid(client: TestClient) -> None:
+    headers = _register_and_get_headers(client, username="brew-sweep-user", email="brew-sweep-user@example.com")
+    recipe_id = _create_recipe(client, headers=headers)
+    batch_id = _create_batch(client, headers, recipe_id, "Sweep Batch", status="planned")
+
+    equipment_ids: list[int] = []
+    for name, mash_tun, kettle, efficiency in (("BIAB 35L", 35, 35, 68), ("Cooler 20L", 20, 28, 75)):
+        response = client.post(
+            "/api/v1/equipment",
+            json={
+                "name": name,
+                "batch_volume_liters": 20,
+                "mash_tun_volume_liters": mash_tun,
+                "boil_kettle_volume_liters": kettle,
+                "brewhouse_efficiency_pct": efficiency,
+                "boil_off_rate_l_per_hour": 3.0,
+                "trub_loss_liters": 1.0,
+                "notes": "",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 201
+        equipment_ids.append(response.json()["id"])
+
+    _create_inventory_item(
+        client,
+        headers,
+        name="Pale Malt",
+        ingredient_type="grain",
+        quantity=4.3,
+        unit="kg",
+        low_stock_threshold=0.5,
+    )
+
+    sweep_response = client.post(
+        f"/api/v1/batches/{batch_id}/brew-plan/sweep",
+        json={
+            "equipment_profile_ids": equipment_ids,
+            "efficiency_pct": [68, 75],
+            "batch_volume_liters": {"start": 19, "stop": 23, "step": 4},
+        },
+        headers=headers,
+    )
+    assert sweep_response.status_code == 200
+    sweep = sweep_response.json()
+    assert sweep["row_count"] == 8
+    assert {row["batch_volume_liters"] for row in sweep["rows"]} == {19.0, 23.0}
+
+    larger = [row for row in sweep["rows"] if row["batch_volume_liters"] == 23.0]
+    assert all(row["fermentable_inventory_coverage_pct"] < 100 for row in larger)
+    assert all(row["total_brew_minutes"] > 0 for row in sweep["rows"])
+
+    single_sweep = client.post(
+        f"/api/v1/batches/{batch_id}/brew-plan/sweep",
+        json={"equipment_profile_ids": [equipment_ids[1]]},
+        headers=headers,
+    )
+    assert single_sweep.status_code == 200
+    assert single_sweep.json()["row_count"] == 1
+    sweep_row = single_sweep.json()["rows"][0]
+
+    plan_response = client.post(
+        f"/api/v1/batches/{batch_id}/brew-plan",
+        json={"equipment_profile_id": equipment_ids[1]},
+        headers=headers,
+    )
+    assert plan_response.status_code == 200
+    plan = plan_response.json()
+    assert sweep_row["target_efficiency_pct"] == 75.0
+    assert sweep_row["estimated_og"] == plan["gravity"]["estimated_og"]
+    assert sweep_row["estimated_abv"] == plan["gravity"]["estimated_abv"]
+    assert sweep_row["mash_water_liters"] == plan["volumes"]["mash_water_liters"]
+    assert sweep_row["total_water_liters"] == plan["volumes"]["total_water_liters"]
+    assert sweep_row["total_brew_minutes"] == sum(step["duration_minutes"] for step in plan["timer_plan"])
+
+    too_large = client.post(
+        f"/api/v1/batches/{batch_id}/brew-plan/sweep",
+        json={
+            "efficiency_pct": {"start": 50, "stop": 95, "step": 1},
+            "batch_volume_liters": {"start": 10, "stop": 40, "step": 1},
+        },
+        headers=headers,
+    )
+    assert too_large.status_code == 422
+
+    for axis in (
+        {"start": 1, "stop": 1e6, "step": 0.1},
+        {"start": 80, "stop": 60, "step": 5},
+        {"start": 1, "stop": 1e308, "step": 1e-308},
+        {"start": 1, "stop": 1.7e308, "step": 0.0001},
+        {"start": 70, "stop": 70.001, "step": 0.00001},
+    ):
+        rejected = client.post(
+            f"/api/v1/batches/{batch_id}/brew-plan/sweep",
+            json={"efficiency_pct": axis},
+            headers=headers,
+        )
+        assert rejected.status_code == 422
+
+    other_headers = _register_and_get_headers(client, username="brew-sweep-other", email="brew-sweep-other@example.com")
+    foreign_equipment = client.post(
+        f"/api/v1/batches/{batch_id}/brew-plan/sweep",
+        json={"equipment_profile_ids": equipment_ids},
+        headers=other_headers,
+    )
+    assert foreign_equipment.status_code == 404
+
+
 def test_brew_plan_scopes_profiles_to_owner(client: TestClient) -> None:
     headers_a = _register_and_get_headers(client, username="brew-plan-owner-a", email="brew-plan-owner-a@example.com")
     headers_b = _register_and_get_headers(client, username="brew-plan-owner-b", email="brew-plan-owner-b@example.com")
@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from app.services.external_catalog import (
+    BuiltinCatalogLoader,
+    ExternalCatalogStore,
+    JsonDumpCatalogLoader,
+)
+
+
+def _recipe(external_id: str, name: str, style: str) -> dict[str, object]:
+    return {
+        "external_id": external_id,
+        "name": name,
+        "style": style,
+        "target_og": 1.050,
+        "target_fg": 1.010,
+        "target_ibu": 35,
+        "target_srm": 8,
+        "efficiency_pct": 72,
+        "notes": "",
+        "ingredients": [
+            {"name": "Pale Malt", "ingredient_type": "grain", "amount": 4.0, "unit": "kg", "stage": "mash", "minute_added": 0}
+        ],
+    }
+
+
+def _write_dump(path: Path, recipe_count: int) -> None:
+    recipes = [_recipe(f"r-{index}", f"Session Lager {index}", "4A") for index in range(recipe_count)]
+    recipes.append(_recipe("hazy", "Hazy Double IPA", "21C"))
+    recipes.append(_recipe("west", "West Coast Pale", "Hazy-adjacent IPA"))
+    path.write_text(json.dumps({"provider": "mirror", "recipes": recipes}), encoding="utf-8")
+
+
+def test_store_ingests_dumps_with_keyed_lookup_and_paginated_listing(tmp_path: Path) -> None:
+    dump_path = tmp_path / "mirror.json"
+    _write_dump(dump_path, recipe_count=2500)
+    store = ExternalCatalogStore.build(tmp_path / "catalog.sqlite3", [BuiltinCatalogLoader(), JsonDumpCatalogLoader(dump_path)])
+
+    recipe = store.get_recipe("mirror", "r-1234")
+    assert recipe is not None
+    assert recipe.name == "Session Lager 1234"
+    assert recipe.ingredients[0].amount == 4.0
+    assert store.get_recipe("mirror", "missing") is None
+    assert store.get_recipe("brewbench", "snpa-clone-v1") is not None
+
+    first = store.search_recipes(provider="mirror", search=None, limit=100, offset=0)
+    second = store.search_recipes(provider="mirror", search=None, limit=100, offset=100)
+    assert first.total == second.total == 2502
+    assert len(first.items) == len(second.items) == 100
+    names = [item.name for item in first.items + second.items]
+    assert names == sorted(names)
+    assert "mirror" in store.recipe_providers()
+
+
+def test_store_search_is_ranked_prefix_full_text(tmp_path: Path) -> None:
+    dump_path = tmp_path / "mirror.json"
+    _write_dump(dump_path, recipe_count=10)
+    store = ExternalCatalogStore.build(tmp_path / "catalog.sqlite3", [JsonDumpCatalogLoader(dump_path)])
+
+    page = store.search_recipes(provider=None, search="haz ipa", limit=10, offset=0)
+    # A name hit outweighs a style hit.
+    assert [item.external_id for item in page.items] == ["hazy", "west"]
+    assert page.total == 2
+    assert store.search_recipes(provider=None, search='"; DROP', limit=10, offset=0).total == 0
+    assert store.search_recipes(provider=None, search="!!", limit=10, offset=0).total == 12
+
+
+def test_store_is_reused_until_a_dump_changes(tmp_path: Path) -> None:
+    dump_path = tmp_path / "mirror.json"
+    store_path = tmp_path / "catalog.sqlite3"
+    _write_dump(dump_path, recipe_count=3)
+    ExternalCatalogStore.build(store_path, [JsonDumpCatalogLoader(dump_path)])
+    built_at = store_path.stat().st_mtime_ns
+
+    reopened = ExternalCatalogStore.build(store_path, [JsonDumpCatalogLoader(dump_path)])
+    assert store_path.stat().st_mtime_ns == built_at
+    assert reopened.search_recipes(provider=None, search=None, limit=None, offset=0).total == 5
+
+    _write_dump(dump_path, recipe_count=7)
+    rebuilt = ExternalCatalogStore.build(store_path, [JsonDumpCatalogLoader(dump_path)])
+    assert rebuilt.search_recipes(provider=None, search=None, limit=None, offset=0).total == 9
@@ -0,0 +1,74 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services.hop_index import HopFlavorIndex
+from app.services.hop_substitution import (
+    ANY_HOP_CANDIDATES,
+    get_hop_catalog,
+    recommend_hop_substitutions,
+)
+
+
+def _random_vectors(count: int, *, seed: int = 7) -> list[list[float]]:
+    rng = random.Random(seed)
+    return [[max(0.0, rng.gauss(1.5, 1.2)) for _ in range(11)] for _ in range(count)]
+
+
+def test_ann_recall_against_exact_scan() -> None:
+    vectors = _random_vectors(1000)
+    index = HopFlavorIndex(vectors)
+
+    total_recall = 0.0
+    queries = 50
+    for query in range(queries):
+        exclude = frozenset({query})
+        approximate = {position for position, _ in index.query(vectors[query], k=10, exclude=exclude)}
+        exact = {position for position, _ in index.exact(vectors[query], k=10, exclude=exclude)}
+        total_recall += len(approximate & exact) / 10
+
+    assert total_recall / queries >= 0.9
+
+
+def test_small_catalog_search_is_exact() -> None:
+    catalog = get_hop_catalog()
+    names = [hop.name for hop in catalog.hops]
+    for hop in catalog.hops:
+        searched = recommend_hop_substitutions(target_hop_name=hop.name, available_hop_names=ANY_HOP_CANDIDATES, top_k=5)
+        scanned = recommend_hop_substitutions(target_hop_name=hop.name, available_hop_names=names, top_k=5)
+        assert searched.substitutions == scanned.substitutions
+        assert searched.recognized_candidate_count == len(catalog) - 1
+
+
+def test_any_candidate_recall_on_large_catalog(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = random.Random(11)
+    # One descriptor per flavor dimension; each hop is tagged with its three strongest dimensions.
+    descriptors = [f"note-{dimension}" for dimension in range(11)]
+    hops = [
+        {
+            "name": f"Variety {position}",
+            "alpha_acid_min_pct": (low := round(rng.uniform(2.0, 16.0), 1)),
+            "alpha_acid_max_pct": round(low + rng.uniform(0.5, 3.0), 1),
+            "flavor_descriptors": [descriptors[dimension] for dimension in sorted(range(11), key=lambda d: -vector[d])[:3]],
+            "flavor_vector": vector,
+            "use": rng.choice(["aroma", "bittering", "dual-purpose"]),
+        }
+        for position, vector in enumerate(_random_vectors(400, seed=3))
+    ]
+    catalog_path = tmp_path / "hops.json"
+    catalog_path.write_text(json.dumps({"version": 1, "hops": hops}), encoding="utf-8")
+    monkeypatch.setattr(settings, "hop_catalog_path", str(catalog_path))
+    monkeypatch.setattr(settings, "hop_catalog_index_path", str(tmp_path / "hops.idx"))
+
+    names = [hop["name"] for hop in hops]
+    total_recall = 0.0
+    targets = names[:30]
+    for target in targets:
+        searched = recommend_hop_substitutions(target_hop_name=target, available_hop_names=ANY_HOP_CANDIDATES, top_k=10)
+        scanned = recommend_hop_substitutions(target_hop_name=target, available_hop_names=names, top_k=10)
+        total_recall += len({row.name for row in searched.substitutions} & {row.name for row in scanned.substitutions}) / 10
+
+    assert total_recall / len(targets) >= 0.9
@@ -0,0 +1,188 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.services import hop_substitution
+from app.services.hop_substitution import (
+    build_hop_candidate_pool,
+    get_hop_catalog,
+    load_hop_catalog,
+    merge_hop_candidate_pools,
+    recommend_hop_substitutions,
+    resolve_hop_profile,
+)
+
+
+def _write_catalog(path: Path, hops: list[dict[str, object]]) -> None:
+    path.write_text(json.dumps({"version": 1, "hops": hops}), encoding="utf-8")
+
+
+def _hop(name: str, vector: list[float], *, aliases: list[str] | None = None) -> dict[str, object]:
+    return {
+        "name": name,
+        "aliases": aliases or [],
+        "alpha_acid_min_pct": 10.0,
+        "alpha_acid_max_pct": 12.0,
+        "flavor_descriptors": ["citrus"],
+        "flavor_vector": vector,
+        "use": "aroma",
+    }
+
+
+def test_similarity_matrix_is_symmetric_with_unit_diagonal() -> None:
+    catalog = get_hop_catalog()
+    size = len(catalog)
+    for left in range(size):
+        assert catalog.flavor_similarity[left * size + left] == pytest.approx(1.0)
+        for right in range(left + 1, size):
+            assert catalog.flavor_similarity[left * size + right] == catalog.flavor_similarity[right * size + left]
+
+
+def test_top_k_matches_full_ranking() -> None:
+    names = [hop.name for hop in get_hop_catalog().hops]
+    full = recommend_hop_substitutions(target_hop_name="Citra", available_hop_names=names, top_k=len(names))
+    top = recommend_hop_substitutions(target_hop_name="citra pellets", available_hop_names=[*names, "Mystery"], top_k=3)
+
+    ranked = sorted(full.substitutions, key=lambda row: (-row.similarity_score, row.name))
+    assert list(full.substitutions) == ranked
+    assert top.substitutions == full.substitutions[:3]
+    assert top.substitutions[0].name == "Mosaic"
+    assert top.unresolved_hop_names == ("Mystery",)
+    assert top.recognized_candidate_count == len(names) - 1
+
+
+def test_compiled_index_is_reused_until_the_catalog_changes(tmp_path: Path) -> None:
+    catalog_path = tmp_path / "hops.json"
+    index_path = tmp_path / "hops.idx"
+    _write_catalog(catalog_path, [_hop("Alpha", [1.0, 0.0]), _hop("Beta", [1.0, 1.0])])
+
+    compiled = load_hop_catalog(catalog_path, index_path=index_path)
+    assert index_path.exists()
+    cached = load_hop_catalog(catalog_path, index_path=index_path)
+    assert cached.flavor_similarity == compiled.flavor_similarity
+    assert compiled.flavor_similarity[1] == pytest.approx(2**-0.5)
+
+    _write_catalog(catalog_path, [_hop("Alpha", [1.0, 0.0]), _hop("Beta", [0.0, 1.0])])
+    recompiled = load_hop_catalog(catalog_path, index_path=index_path)
+    assert recompiled.flavor_similarity[1] == 0.0
+
+
+def test_catalog_hot_reloads_from_configured_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog_path = tmp_path / "hops.json"
+    _write_catalog(catalog_path, [_hop("Alpha", [1.0, 0.0]), _hop("Beta", [1.0, 1.0])])
+    monkeypatch.setattr(settings, "hop_catalog_path", str(catalog_path))
+    monkeypatch.setattr(settings, "hop_catalog_index_path", str(tmp_path / "hops.idx"))
+
+    assert resolve_hop_profile("Alpha") is not None
+    assert resolve_hop_profile("Experimental 42") is None
+
+    _write_catalog(
+        catalog_path,
+        [_hop("Alpha", [1.0, 0.0]), _hop("Beta", [1.0, 1.0]), _hop("Experimental 42", [0.9, 0.1], aliases=["x42"])],
+    )
+    assert resolve_hop_profile("X42 pellets").name == "Experimental 42"
+
+    catalog_path.write_text("{not json", encoding="utf-8")
+    assert resolve_hop_profile("Experimental 42") is not None
+
+    with pytest.raises(ValueError):
+        load_hop_catalog(catalog_path)
+
+
+@pytest.mark.parametrize(
+    ("name", "expected", "min_confidence"),
+    [
+        ("Citra", "Citra", 1.0),
+        ("Citra T-90 pelets", "Citra", 0.95),
+        ("Amarilo", "Amarillo", 0.85),
+        ("Ctira", "Citra", 0.8),
+        ("East Kent Golding", "East Kent Goldings", 0.9),
+    ],
+)
+def test_resolver_tolerates_typos(name: str, expected: str, min_confidence: float) -> None:
+    catalog = get_hop_catalog()
+    resolved = catalog.resolve(name)
+    assert resolved is not None
+    assert catalog.hops[resolved[0]].name == expected
+    assert resolved[1] >= min_confidence
+
+
+def test_resolver_rejects_distant_names() -> None:
+    catalog = get_hop_catalog()
+    assert catalog.resolve("Munich Malt") is None
+    assert catalog.resolve("pellets") is None
+    assert catalog.resolve("Zzz") is None
+
+
+def test_candidate_pool_dedupes_and_reports_confidence() -> None:
+    first = build_hop_candidate_pool(["Amarilo", "Mystery", "amarilo pellets"])
+    second = build_hop_candidate_pool(["Mosaic", "AMARILO", "mystery"])
+    merged = merge_hop_candidate_pools(first, second)
+
+    assert [resolution.hop_name for resolution in merged.resolved] == ["Amarillo", "Mosaic"]
+    assert merged.resolved[0].confidence < 1.0
+    assert merged.unresolved_hop_names == ("Mystery",)
+
+    result = recommend_hop_substitutions(target_hop_name="Ctira", available_hop_names=merged, top_k=2)
+    assert result.target_hop.name == "Citra"
+    assert result.target_confidence < 1.0
+    assert [row.name for row in result.substitutions] == ["Mosaic", "Amarillo"]
+
+
+def test_blend_mode_recovers_mixture_proportions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog_path = tmp_path / "hops.json"
+    _write_catalog(
+        catalog_path,
+        [
+            _hop("Target", [0.6, 0.4, 0.0]),
+            _hop("Alpha", [1.0, 0.0, 0.0]),
+            _hop("Beta", [0.0, 1.0, 0.0]),
+            _hop("Gamma", [0.0, 0.0, 1.0]),
+        ],
+    )
+    monkeypatch.setattr(settings, "hop_catalog_path", str(catalog_path))
+    monkeypatch.setattr(settings, "hop_catalog_index_path", str(tmp_path / "hops.idx"))
+
+    single = recommend_hop_substitutions(target_hop_name="Target", available_hop_names=["Alpha", "Beta", "Gamma"])
+    assert single.blends == ()
+
+    result = recommend_hop_substitutions(
+        target_hop_name="Target", available_hop_names=["Alpha", "Beta", "Gamma"], blend_max_hops=3
+    )
+    best = result.blends[0]
+    assert [(component.name, component.proportion) for component in best.components] == [("Alpha", 0.6), ("Beta", 0.4)]
+    assert best.flavor_similarity_score == pytest.approx(1.0)
+    assert best.similarity_score > result.substitutions[0].similarity_score
+    assert all(blend.similarity_score > result.substitutions[0].similarity_score for blend in result.blends)
+
+    with pytest.raises(ValueError):
+        recommend_hop_substitutions(target_hop_name="Target", available_hop_names=["Alpha"], blend_max_hops=4)
+
+
+def test_blend_search_is_pruned_for_large_pools(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog_path = tmp_path / "hops.json"
+    hops = [_hop("Target", [1.0, 1.0, 1.0, 1.0])]
+    for position in range(60):
+        hops.append(_hop(f"Variety {position}", [1.0 + position % 4, 1.0 + position % 5, 1.0 + position % 7, 0.5]))
+    _write_catalog(catalog_path, hops)
+    monkeypatch.setattr(settings, "hop_catalog_path", str(catalog_path))
+    monkeypatch.setattr(settings, "hop_catalog_index_path", str(tmp_path / "hops.idx"))
+
+    solved: list[tuple[int, ...]] = []
+    score_blend = hop_substitution._score_blend
+
+    def counting_score_blend(catalog, *, target_index, members):
+        solved.append(members)
+        return score_blend(catalog, target_index=target_index, members=members)
+
+    monkeypatch.setattr(hop_substitution, "_score_blend", counting_score_blend)
+    recommend_hop_substitutions(
+        target_hop_name="Target",
+        available_hop_names=[str(hop["name"]) for hop in hops[1:]],
+        blend_max_hops=3,
+    )
+
+    assert 0 < len(solved) <= 45 + 60
+    assert len({member for members in solved for member in members}) <= 10
@@ -0,0 +1,15 @@
+import pytest
+
+from app.services.numeric import solve_linear_system
+
+
+def test_solve_linear_system_pivots_past_a_zero_leading_entry() -> None:
+    solution = solve_linear_system([[0.0, 2.0], [3.0, 1.0]], [4.0, 5.0])
+
+    assert solution == pytest.approx([1.0, 2.0])
+
+
+def test_solve_linear_system_detects_singularity_relative_to_scale() -> None:
+    assert solve_linear_system([[1e6, 2e6], [2e6, 4e6]], [1.0, 2.0]) is None
+    assert solve_linear_system([[0.0]], [1.0]) is None
+    assert solve_linear_system([[1e-8, 0.0], [0.0, 1e-8]], [1e-8, 2e-8]) == pytest.approx([1.0, 2.0])
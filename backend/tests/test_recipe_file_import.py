@@ -0,0 +1,131 @@
+import json
+import re
+
+import pytest
+
+from app.services.recipe_file_import import BeerJSONRecipeParser, BeerXMLRecipeParser, RecipeFileError
+
+_BEERXML_RECIPE = """
+  <RECIPE>
+    <NAME>Pale {index}</NAME>
+    <STYLE><NAME>American Pale Ale</NAME><CATEGORY_NUMBER>18</CATEGORY_NUMBER><STYLE_LETTER>B</STYLE_LETTER></STYLE>
+    <OG>1.052</OG><FG>1.011</FG><IBU>38</IBU><EST_COLOR>8.5 SRM</EST_COLOR><EFFICIENCY>74</EFFICIENCY>
+    <FERMENTABLES><FERMENTABLE><NAME>Pale Malt</NAME><TYPE>Grain</TYPE><AMOUNT>4.5</AMOUNT></FERMENTABLE></FERMENTABLES>
+    <HOPS>
+      <HOP><NAME>Cascade</NAME><AMOUNT>0.025</AMOUNT><USE>Boil</USE><TIME>10</TIME></HOP>
+      <HOP><NAME>Citra</NAME><AMOUNT>0.05</AMOUNT><USE>Dry Hop</USE><TIME>4320</TIME></HOP>
+    </HOPS>
+    <YEASTS><YEAST><NAME>US-05</NAME><AMOUNT>0.011</AMOUNT></YEAST></YEASTS>
+  </RECIPE>"""
+
+
+def _feed_in_chunks(parser, payload: bytes, size: int) -> list:
+    records = []
+    for start in range(0, len(payload), size):
+        records.extend(parser.feed(payload[start : start + size]))
+    return records + parser.close()
+
+
+def _lowercase_tags(document: str) -> str:
+    return re.sub(r"</?[A-Z_]+", lambda match: match.group(0).lower(), document)
+
+
+def test_beerxml_parser_maps_recipes_fed_in_small_chunks() -> None:
+    recipes = "".join(_BEERXML_RECIPE.format(index=index) for index in range(3))
+    document = f'<?xml version="1.0"?><RECIPES>{recipes}<RECIPE><NAME>No gravity</NAME></RECIPE></RECIPES>'.encode()
+
+    parser = BeerXMLRecipeParser()
+    records = _feed_in_chunks(parser, document, size=7)
+
+    assert [index for index, _, _ in records] == [1, 2, 3, 4]
+    template = records[0][2]
+    assert template.name == "Pale 0"
+    assert template.style == "American Pale Ale"
+    assert template.target_srm == 8.5
+    cascade, citra = template.ingredients[1], template.ingredients[2]
+    assert (cascade.amount, cascade.unit, cascade.stage, cascade.minute_added) == (25.0, "g", "boil", 10)
+    assert (citra.stage, citra.minute_added) == ("fermentation", 0)
+    assert records[3][2] == "Recipe has no original or final gravity"
+    # Finished recipes are detached, so the open root holds none of them.
+    assert parser._open == []
+
+
+def test_beerxml_parser_accepts_lowercase_tags() -> None:
+    document = _BEERXML_RECIPE.format(index=0)
+    lowered = f"<recipes>{_lowercase_tags(document)}</recipes>".encode()
+
+    records = _feed_in_chunks(BeerXMLRecipeParser(), lowered, size=11)
+
+    assert len(records) == 1
+    template = records[0][2]
+    assert template.name == "Pale 0"
+    assert template.target_og == 1.052
+    assert [ingredient.name for ingredient in template.ingredients] == ["Pale Malt", "Cascade", "Citra", "US-05"]
+
+
+def test_beerxml_parser_rejects_malformed_documents() -> None:
+    parser = BeerXMLRecipeParser()
+    with pytest.raises(RecipeFileError):
+        _feed_in_chunks(parser, b"<RECIPES><RECIPE><NAME>x</RECIPES>", size=4)
+
+
+def test_beerjson_parser_streams_array_items_and_converts_units() -> None:
+    recipe = {
+        "name": "Stout",
+        "style": {"name": "Irish Stout"},
+        "original_gravity": {"unit": "sg", "value": 1.044},
+        "final_gravity": {"unit": "sg", "value": 1.010},
+        "ibu_estimate": {"method": "Tinseth", "value": 35},
+        "color_estimate": {"unit": "SRM", "value": 38},
+        "efficiency": {"brewhouse": {"unit": "%", "value": 72}},
+        "ingredients": {
+            "fermentable_additions": [{"name": "Maris Otter", "type": "grain", "amount": {"unit": "lb", "value": 8}}],
+            "hop_additions": [
+                {"name": "EKG", "amount": {"unit": "oz", "value": 1}, "timing": {"use": "add_to_boil", "time": {"unit": "min", "value": 60}}}
+            ],
+            "culture_additions": [{"name": "S-04", "amount": {"unit": "pkg", "value": 1}}],
+        },
+    }
+    document = json.dumps(
+        {"beerjson": {"version": 1.0, "recipes": [recipe, {"name": "Broken"}, "not a recipe", {**recipe, "name": "Stout ☘"}]}}
+    ).encode()
+
+    records = _feed_in_chunks(BeerJSONRecipeParser(), document, size=5)
+
+    assert [index for index, _, _ in records] == [1, 2, 3, 4]
+    stout = records[0][2]
+    assert (stout.target_og, stout.target_ibu, stout.efficiency_pct) == (1.044, 35, 72)
+    malt, hop, yeast = stout.ingredients
+    assert (malt.amount, malt.unit) == (pytest.approx(3.6287), "kg")
+    assert (hop.amount, hop.unit, hop.minute_added) == (pytest.approx(28.3495), "g", 60)
+    assert (yeast.amount, yeast.unit) == (1, "pack")
+    assert isinstance(records[1][2], str)
+    assert records[2][2] == "Recipe is not an object"
+    assert records[3][2].name == "Stout ☘"
+
+
+def test_beerjson_parser_requires_a_terminated_recipes_array() -> None:
+    with pytest.raises(RecipeFileError):
+        _feed_in_chunks(BeerJSONRecipeParser(), b'{"beerjson": {"version": 1}}', size=8)
+    with pytest.raises(RecipeFileError):
+        _feed_in_chunks(BeerJSONRecipeParser(), b'{"beerjson": {"recipes": [{"name": "x"}', size=8)
+
+
+def test_parsers_report_out_of_range_numbers_per_record() -> None:
+    huge_time = _BEERXML_RECIPE.format(index=1).replace("<TIME>10</TIME>", "<TIME>99999999999999999999</TIME>")
+    xml_records = _feed_in_chunks(
+        BeerXMLRecipeParser(), f"<RECIPES>{huge_time}{_BEERXML_RECIPE.format(index=2)}</RECIPES>".encode(), size=64
+    )
+    assert "Cascade time" in xml_records[0][2]
+    assert xml_records[1][2].name == "Pale 2"
+
+    recipe = {
+        "name": "Overflow",
+        "original_gravity": {"unit": "sg", "value": 1.05},
+        "final_gravity": {"unit": "sg", "value": 1.01},
+        "ingredients": {"hop_additions": [{"name": "EKG", "amount": {"unit": "g", "value": 10}, "timing": {"time": {"value": 1}}}]},
+    }
+    document = json.dumps({"recipes": [recipe, {**recipe, "name": "Fine"}]}).replace('"time": {"value": 1}', '"time": {"value": 1e400}', 1)
+    json_records = _feed_in_chunks(BeerJSONRecipeParser(), document.encode(), size=64)
+    assert json_records[0][2] == "Unreadable recipe: EKG time inf is out of range"
+    assert json_records[1][2].name == "Fine"
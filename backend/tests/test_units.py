@@ -0,0 +1,27 @@
+import pytest
+
+from app.services.units import canonical_unit, conversion_rows, convert, convert_many
+
+
+def test_convert_handles_aliases_and_dimensions() -> None:
+    assert canonical_unit(" Kilograms ") == "kg"
+    assert convert(2, "kg", "g") == 2000.0
+    assert convert(1, "Pounds", "kg") == pytest.approx(0.45359237)
+    assert convert(5, "gallons", "L") == pytest.approx(18.92705892)
+    assert convert(1, "kg", "l") is None
+    assert convert(3, "Bottle", "bottle") == 3
+    assert convert(3, "bottle", "can") is None
+
+
+def test_convert_many_matches_scalar_convert() -> None:
+    amounts = [1.0, 250.0, 2.0, 4.0, 1.0]
+    units = ["kg", "g", "lb", "oz", "pack"]
+    assert convert_many(amounts, units, "kg") == [convert(amount, unit, "kg") for amount, unit in zip(amounts, units)]
+    assert convert_many(amounts, units, "kg")[-1] is None
+
+
+def test_conversion_rows_cover_every_alias() -> None:
+    rows = {row["alias"]: row for row in conversion_rows()}
+    assert len(rows) == 37
+    assert rows["fl oz"]["canonical_unit"] == "floz"
+    assert rows["lb"]["factor_to_base"] == 453.59237
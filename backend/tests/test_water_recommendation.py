@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.bjcp_styles import resolve_bjcp_style
+from app.services.water_recommendation import (
+    _solve_bounded_least_squares,
+    build_ro_blend_options,
+    build_water_recommendation,
+)
+
+_ION_NAMES = ("calcium_ppm", "magnesium_ppm", "sodium_ppm", "chloride_ppm", "sulfate_ppm", "bicarbonate_ppm")
+
+
+def _water(**ions: float) -> SimpleNamespace:
+    return SimpleNamespace(**{name: ions.get(name, 0.0) for name in _ION_NAMES})
+
+
+def _weighted_error(recommendation, style) -> float:
+    total = 0.0
+    for name in _ION_NAMES:
+        ion_range = getattr(style, name)
+        half_width = max((ion_range.max_ppm - ion_range.min_ppm) / 2.0, 5.0)
+        miss = getattr(recommendation.projected_profile, name) - ion_range.target_ppm
+        total += (miss / half_width) ** 2
+    return total
+
+
+def test_bounded_least_squares_respects_bounds() -> None:
+    # Unconstrained optimum is (3, -1); the box pins x0 at 2 and x1 at 0.
+    gram = [[1.0, 0.0], [0.0, 1.0]]
+    assert _solve_bounded_least_squares(gram, [3.0, -1.0], [2.0, 5.0]) == pytest.approx([2.0, 0.0])
+
+    # Coupled variables: minimise (x0 + x1 - 1)^2 + (x0 - x1)^2 -> x0 = x1 = 0.5.
+    gram = [[2.0, 0.0], [0.0, 2.0]]
+    assert _solve_bounded_least_squares(gram, [1.0, 1.0], [1.0, 1.0]) == pytest.approx([0.5, 0.5])
+
+
+def test_optimizer_beats_greedy_on_weighted_error() -> None:
+    style = resolve_bjcp_style("18B")
+    water = _water(calcium_ppm=35, magnesium_ppm=8, sodium_ppm=12, chloride_ppm=30, sulfate_ppm=45, bicarbonate_ppm=60)
+
+    greedy = build_water_recommendation(water_profile=water, style=style, batch_volume_liters=20)
+    optimized = build_water_recommendation(water_profile=water, style=style, batch_volume_liters=20, mode="optimize")
+
+    assert optimized.mode == "optimize"
+    assert _weighted_error(optimized, style) < _weighted_error(greedy, style)
+    for addition in optimized.additions:
+        assert addition.grams_total == pytest.approx(addition.grams_per_liter * 20, abs=0.02)
+
+
+def test_optimizer_uses_acid_and_dilution_only_when_allowed() -> None:
+    style = resolve_bjcp_style("8A")
+    water = _water(calcium_ppm=90, magnesium_ppm=20, sodium_ppm=40, chloride_ppm=60, sulfate_ppm=80, bicarbonate_ppm=250)
+
+    salts_only = build_water_recommendation(water_profile=water, style=style, batch_volume_liters=20, mode="optimize")
+    assert salts_only.ro_dilution_fraction == 0.0
+    assert salts_only.projected_profile.bicarbonate_ppm == 250
+
+    full = build_water_recommendation(
+        water_profile=water, style=style, batch_volume_liters=20, mode="optimize", allow_acid=True, allow_dilution=True
+    )
+    names = {addition.mineral_name for addition in full.additions}
+    assert 0.0 < full.ro_dilution_fraction <= 0.8
+    assert "Lactic Acid (88%)" in names
+    assert "Baking Soda (NaHCO3)" not in names
+    assert full.projected_profile.bicarbonate_ppm <= style.bicarbonate_ppm.max_ppm
+    assert _weighted_error(full, style) < _weighted_error(salts_only, style)
+
+
+def test_ro_blend_options_form_a_pareto_front_for_high_bicarbonate_water() -> None:
+    style = resolve_bjcp_style("8A")
+    water = _water(calcium_ppm=90, magnesium_ppm=20, sodium_ppm=40, chloride_ppm=60, sulfate_ppm=80, bicarbonate_ppm=250)
+
+    recommendation = build_water_recommendation(water_profile=water, style=style, batch_volume_liters=20)
+    options = recommendation.ro_blend_options
+    assert options, "high-bicarbonate source should always get blend options"
+
+    fractions = [option.ro_dilution_fraction for option in options]
+    assert fractions == sorted(fractions)
+    assert 0.0 < fractions[-1] <= 0.8
+    # More RO only earns its place on the front by getting closer to the style.
+    distances = [option.distance_to_range for option in options]
+    assert distances == sorted(distances, reverse=True)
+    assert distances[-1] == pytest.approx(0.0, abs=1e-3)
+    assert options[-1].projected_profile.bicarbonate_ppm <= style.bicarbonate_ppm.max_ppm
+
+    with_acid = build_ro_blend_options(source=water, style=style, batch_volume_liters=20, allow_acid=True)
+    assert with_acid[-1].ro_dilution_fraction < fractions[-1]
+
+    skipped = build_water_recommendation(water_profile=water, style=style, batch_volume_liters=20, skip_ro_blends=True)
+    assert skipped.ro_blend_options == ()
+    assert skipped.additions == recommendation.additions
+    assert skipped.projected_profile == recommendation.projected_profile